@@ -17,13 +17,21 @@ Provides event-driven communication between subsystems.
 """
 
 import asyncio
+import inspect
+import itertools
+import threading
+import time
 import uuid
+from collections import deque
 from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from typing import Any
 
+from muto_composer.utils.metrics import EventBusMetrics
+
 
 class EventType(Enum):
     """Enumeration of all event types in the composer system."""
@@ -77,8 +85,42 @@ class EventType(Enum):
     PROCESS_CRASHED = "process.crashed"
 
 
+# Event ids are a per-process random prefix plus a monotonic counter: unique
+# across processes, ordered within one, and far cheaper than uuid4 per event.
+_EVENT_ID_PREFIX = uuid.uuid4().hex[:12]
+_event_counter = itertools.count(1)
+
+
 class BaseComposeEvent:
-    """Base class for all composer events."""
+    """Base class for all composer events.
+
+    Events are slot-based to keep them small. ``event_id`` and ``timestamp``
+    are derived on first access from a counter and the creation time. Events
+    that start an orchestration derive its ``orchestration_id`` the same way
+    when none is given.
+    """
+
+    __slots__ = (
+        "event_type",
+        "source_component",
+        "_event_id",
+        "_sequence",
+        "_created",
+        "_timestamp",
+        "correlation_id",
+        "metadata",
+        "stack_payload",
+        "stack_name",
+        "action",
+        "pipeline_name",
+        "execution_context",
+        "_orchestration_id",
+    )
+
+    # Whether a missing orchestration_id is derived from the event, see orchestration_id
+    _starts_orchestration = False
+
+    _field_cache: dict[type, tuple[str, ...]] = {}
 
     def __init__(
         self,
@@ -98,8 +140,10 @@ class BaseComposeEvent:
     ):
         self.event_type = event_type
         self.source_component = source_component
-        self.event_id = event_id or str(uuid.uuid4())
-        self.timestamp = timestamp or datetime.now()
+        self._event_id = event_id
+        self._sequence = next(_event_counter)
+        self._created = time.time()
+        self._timestamp = timestamp
         self.correlation_id = correlation_id
         self.metadata = metadata or {}
 
@@ -109,12 +153,74 @@ class BaseComposeEvent:
         self.action = action
         self.pipeline_name = pipeline_name
         self.execution_context = execution_context or {}
-        self.orchestration_id = orchestration_id
+        self._orchestration_id = orchestration_id
+
+    @property
+    def event_id(self) -> str:
+        """Unique id of the event."""
+        if self._event_id is None:
+            self._event_id = f"{_EVENT_ID_PREFIX}-{self._sequence:08x}"
+        return self._event_id
+
+    @event_id.setter
+    def event_id(self, value: str):
+        self._event_id = value
+
+    @property
+    def orchestration_id(self) -> str | None:
+        """Id of the orchestration the event belongs to."""
+        if self._orchestration_id is None and self._starts_orchestration:
+            self._orchestration_id = f"{_EVENT_ID_PREFIX}-{self._sequence:08x}"
+        return self._orchestration_id
+
+    @orchestration_id.setter
+    def orchestration_id(self, value: str | None):
+        self._orchestration_id = value
+
+    @property
+    def timestamp(self) -> datetime:
+        """Wall-clock time at which the event was created."""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._created)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, value: datetime):
+        self._timestamp = value
+
+    @classmethod
+    def _fields(cls) -> tuple[str, ...]:
+        """Public slot names of the class and its bases."""
+        fields = BaseComposeEvent._field_cache.get(cls)
+        if fields is None:
+            fields = tuple(
+                name
+                for klass in reversed(cls.__mro__)
+                for name in getattr(klass, "__slots__", ())
+                if not name.startswith("_")
+            )
+            BaseComposeEvent._field_cache[cls] = fields
+        return fields
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the event attributes as a JSON-friendly dictionary.
+
+        Backward-compatible aliases of ``stack_payload`` are properties and are
+        not included.
+        """
+        data = {name: getattr(self, name) for name in self._fields()}
+        data["event_type"] = self.event_type.value
+        data["event_id"] = self.event_id
+        data["orchestration_id"] = self.orchestration_id
+        data["timestamp"] = self.timestamp.isoformat()
+        return data
 
 
 class StackRequestEvent(BaseComposeEvent):
     """Event triggered when a stack operation is requested."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         event_type: EventType,
@@ -137,6 +243,8 @@ class StackRequestEvent(BaseComposeEvent):
 class StackAnalyzedEvent(BaseComposeEvent):
     """Event triggered when stack analysis is complete."""
 
+    __slots__ = ("analysis_result", "processing_requirements")
+
     def __init__(
         self,
         event_type: EventType,
@@ -158,13 +266,18 @@ class StackAnalyzedEvent(BaseComposeEvent):
         )
         self.analysis_result = analysis_result or {}
         self.processing_requirements = processing_requirements or {}
-        # Keep manifest_data for backwards compatibility, but map to stack_payload
-        self.manifest_data = {"stack_payload": self.stack_payload}
+
+    @property
+    def manifest_data(self) -> dict[str, Any]:
+        """Backward-compatible view of ``stack_payload``."""
+        return {"stack_payload": self.stack_payload}
 
 
 class StackMergedEvent(BaseComposeEvent):
     """Event triggered when stacks are merged."""
 
+    __slots__ = ("current_stack", "next_stack", "merge_strategy", "conflicts_resolved")
+
     def __init__(
         self,
         event_type: EventType,
@@ -184,15 +297,24 @@ class StackMergedEvent(BaseComposeEvent):
         )
         self.current_stack = current_stack or {}
         self.next_stack = next_stack or {}
-        # Keep merged_stack for backwards compatibility, but map to stack_payload
-        self.merged_stack = self.stack_payload
         self.merge_strategy = merge_strategy
         self.conflicts_resolved = conflicts_resolved
 
+    @property
+    def merged_stack(self) -> dict[str, Any]:
+        """Backward-compatible alias of ``stack_payload``."""
+        return self.stack_payload
+
+    @merged_stack.setter
+    def merged_stack(self, value: dict[str, Any]):
+        self.stack_payload = value
+
 
 class StackTransformedEvent(BaseComposeEvent):
     """Event triggered when stack transformation is complete."""
 
+    __slots__ = ("original_stack", "expressions_resolved", "transformation_type")
+
     def __init__(
         self,
         event_type: EventType,
@@ -210,15 +332,26 @@ class StackTransformedEvent(BaseComposeEvent):
             **kwargs,
         )
         self.original_stack = original_stack or {}
-        # Keep transformed_stack for backwards compatibility, but map to stack_payload
-        self.transformed_stack = self.stack_payload
         self.expressions_resolved = expressions_resolved or {}
         self.transformation_type = transformation_type
 
+    @property
+    def transformed_stack(self) -> dict[str, Any]:
+        """Backward-compatible alias of ``stack_payload``."""
+        return self.stack_payload
+
+    @transformed_stack.setter
+    def transformed_stack(self, value: dict[str, Any]):
+        self.stack_payload = value
+
 
 class OrchestrationStartedEvent(BaseComposeEvent):
     """Event triggered when orchestration process begins."""
 
+    __slots__ = ("execution_plan", "context_variables")
+
+    _starts_orchestration = True
+
     def __init__(
         self,
         event_type: EventType,
@@ -235,7 +368,7 @@ class OrchestrationStartedEvent(BaseComposeEvent):
             source_component=source_component,
             action=action,
             stack_payload=stack_payload,
-            orchestration_id=orchestration_id or str(uuid.uuid4()),
+            orchestration_id=orchestration_id,
             **kwargs,
         )
         self.execution_plan = execution_plan or {}
@@ -245,6 +378,8 @@ class OrchestrationStartedEvent(BaseComposeEvent):
 class OrchestrationCompletedEvent(BaseComposeEvent):
     """Event triggered when orchestration completes successfully."""
 
+    __slots__ = ("final_stack_state", "execution_summary", "duration")
+
     def __init__(
         self,
         event_type: EventType,
@@ -269,6 +404,8 @@ class OrchestrationCompletedEvent(BaseComposeEvent):
 class OrchestrationFailedEvent(BaseComposeEvent):
     """Event triggered when orchestration fails."""
 
+    __slots__ = ("error_details", "failed_step", "can_rollback")
+
     def __init__(
         self,
         event_type: EventType,
@@ -295,6 +432,10 @@ class OrchestrationFailedEvent(BaseComposeEvent):
 class RollbackStartedEvent(BaseComposeEvent):
     """Event triggered when rollback to previous stack version begins."""
 
+    __slots__ = ("previous_stack", "failed_stack", "failure_reason")
+
+    _starts_orchestration = True
+
     def __init__(
         self,
         event_type: EventType,
@@ -308,7 +449,7 @@ class RollbackStartedEvent(BaseComposeEvent):
         super().__init__(
             event_type=event_type,
             source_component=source_component,
-            orchestration_id=orchestration_id or str(uuid.uuid4()),
+            orchestration_id=orchestration_id,
             **kwargs,
         )
         self.previous_stack = previous_stack or {}
@@ -319,6 +460,8 @@ class RollbackStartedEvent(BaseComposeEvent):
 class RollbackCompletedEvent(BaseComposeEvent):
     """Event triggered when rollback completes successfully."""
 
+    __slots__ = ("restored_stack", "rollback_duration")
+
     def __init__(
         self,
         event_type: EventType,
@@ -341,6 +484,8 @@ class RollbackCompletedEvent(BaseComposeEvent):
 class RollbackFailedEvent(BaseComposeEvent):
     """Event triggered when rollback fails."""
 
+    __slots__ = ("error_details", "original_failure")
+
     def __init__(
         self,
         event_type: EventType,
@@ -363,6 +508,8 @@ class RollbackFailedEvent(BaseComposeEvent):
 class PipelineRequestedEvent(BaseComposeEvent):
     """Event triggered when a pipeline execution is requested."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         event_type: EventType,
@@ -370,6 +517,7 @@ class PipelineRequestedEvent(BaseComposeEvent):
         pipeline_name: str,
         execution_context: dict[str, Any] | None = None,
         stack_payload: dict[str, Any] | None = None,
+        stack_manifest: dict[str, Any] | None = None,
         **kwargs,
     ):
         super().__init__(
@@ -377,16 +525,25 @@ class PipelineRequestedEvent(BaseComposeEvent):
             source_component=source_component,
             pipeline_name=pipeline_name,
             execution_context=execution_context,
-            stack_payload=stack_payload,
+            stack_payload=stack_payload if stack_payload is not None else stack_manifest,
             **kwargs,
         )
-        # Keep stack_manifest for backwards compatibility, but map to stack_payload
-        self.stack_manifest = self.stack_payload
+
+    @property
+    def stack_manifest(self) -> dict[str, Any]:
+        """Backward-compatible alias of ``stack_payload``."""
+        return self.stack_payload
+
+    @stack_manifest.setter
+    def stack_manifest(self, value: dict[str, Any]):
+        self.stack_payload = value
 
 
 class PipelineStartedEvent(BaseComposeEvent):
     """Event triggered when a pipeline starts execution."""
 
+    __slots__ = ("execution_id", "steps_planned")
+
     def __init__(
         self,
         event_type: EventType,
@@ -409,6 +566,8 @@ class PipelineStartedEvent(BaseComposeEvent):
 class PipelineCompletedEvent(BaseComposeEvent):
     """Event triggered when a pipeline completes successfully."""
 
+    __slots__ = ("execution_id", "final_result", "steps_executed", "total_duration")
+
     def __init__(
         self,
         event_type: EventType,
@@ -435,6 +594,8 @@ class PipelineCompletedEvent(BaseComposeEvent):
 class PipelineFailedEvent(BaseComposeEvent):
     """Event triggered when a pipeline fails."""
 
+    __slots__ = ("execution_id", "failure_step", "error_details", "compensation_executed")
+
     def __init__(
         self,
         event_type: EventType,
@@ -461,6 +622,8 @@ class PipelineFailedEvent(BaseComposeEvent):
 class StackProcessedEvent(BaseComposeEvent):
     """Event triggered when stack processing is complete."""
 
+    __slots__ = ("execution_requirements", "original_payload", "processing_applied")
+
     def __init__(
         self,
         event_type: EventType = None,
@@ -481,16 +644,25 @@ class StackProcessedEvent(BaseComposeEvent):
             stack_payload=stack_payload,
             **kwargs,
         )
-        # Keep merged_stack for backwards compatibility, but map to stack_payload
-        self.merged_stack = self.stack_payload
         self.execution_requirements = execution_requirements or {}
         self.original_payload = original_payload or {}
         self.processing_applied = processing_applied or []
 
+    @property
+    def merged_stack(self) -> dict[str, Any]:
+        """Backward-compatible alias of ``stack_payload``."""
+        return self.stack_payload
+
+    @merged_stack.setter
+    def merged_stack(self, value: dict[str, Any]):
+        self.stack_payload = value
+
 
 class TwinUpdateEvent(BaseComposeEvent):
     """Event triggered when a digital twin update is requested."""
 
+    __slots__ = ("twin_id", "update_type", "data")
+
     def __init__(
         self,
         event_type: EventType = None,
@@ -513,6 +685,8 @@ class TwinUpdateEvent(BaseComposeEvent):
 class ProcessCrashedEvent(BaseComposeEvent):
     """Event triggered when a launched process crashes unexpectedly."""
 
+    __slots__ = ("process_name", "exit_code", "error_message", "process_output")
+
     def __init__(
         self,
         event_type: EventType = None,
@@ -574,15 +748,125 @@ class PipelineEvents:
         )
 
 
+def _event_classes() -> dict[str, type]:
+    """Map class names to every BaseComposeEvent subclass."""
+    classes = {BaseComposeEvent.__name__: BaseComposeEvent}
+    pending = [BaseComposeEvent]
+    while pending:
+        for subclass in pending.pop().__subclasses__():
+            classes[subclass.__name__] = subclass
+            pending.append(subclass)
+    return classes
+
+
+def event_from_dict(event_class: str, data: dict[str, Any]) -> BaseComposeEvent:
+    """Rebuild an event from its class name and ``BaseComposeEvent.to_dict`` output.
+
+    Args:
+        event_class: Name of the event class, e.g. ``"StackRequestEvent"``.
+        data: Dictionary produced by ``to_dict``.
+
+    Raises:
+        ValueError: If the event class is unknown.
+    """
+    cls = _event_classes().get(event_class)
+    if cls is None:
+        raise ValueError(f"Unknown event class: {event_class}")
+    kwargs = dict(data)
+    kwargs["event_type"] = EventType(kwargs["event_type"])
+    if kwargs.get("timestamp"):
+        kwargs["timestamp"] = datetime.fromisoformat(kwargs["timestamp"])
+    return cls(**kwargs)
+
+
+class OverflowPolicy(Enum):
+    """What an asynchronous dispatch queue does when it is full."""
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+
+
+def default_coalesce_key(event: BaseComposeEvent) -> Any:
+    """Default coalescing key: events for the same stack replace each other."""
+    return event.stack_name or event.correlation_id
+
+
+@dataclass
+class QueuePolicy:
+    """Bound and overflow behaviour of the dispatch queue of one event type."""
+
+    maxsize: int = 256
+    overflow: OverflowPolicy = OverflowPolicy.BLOCK
+    block_timeout: float | None = 10.0
+    coalesce_key: Callable[[BaseComposeEvent], Any] = default_coalesce_key
+
+
+class _DispatchLane:
+    """One dispatcher thread with its own bounded queue per event type.
+
+    Events are assigned to lanes by stack name, or by correlation id when they
+    name no stack, and a lane always delivers the oldest pending event first,
+    so events of the same stack or request are handled one at a time and in
+    publish order.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.condition = threading.Condition()
+        self.queues: dict[EventType, deque] = {}
+        self.size = 0
+        self.thread: threading.Thread | None = None
+
+    def pop_next(self) -> BaseComposeEvent:
+        """Remove and return the pending event with the lowest sequence number."""
+        oldest = None
+        for queue in self.queues.values():
+            if queue and (oldest is None or queue[0][0] < oldest[0][0]):
+                oldest = queue
+        self.size -= 1
+        return oldest.popleft()[1]
+
+
+_dispatch_context = threading.local()
+
+
 class EventBus:
-    """Central event bus for composer event handling."""
+    """Central event bus for composer event handling.
+
+    ``publish_sync`` delivers an event to its handlers on the calling thread.
+    Once ``start`` has been called, ``publish_async`` hands events to
+    dispatcher threads through bounded per-event-type queues instead; before
+    that it falls back to synchronous delivery.
+    """
 
     def __init__(self, max_workers: int = 4):
         self._handlers: dict[EventType, list[Callable]] = {}
         self._middleware: list[Callable] = []
+        # Coroutine middleware already reported as skipped outside the asyncio path
+        self._skipped_middleware: list[Callable] = []
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
         self._logger = None
 
+        # Asynchronous dispatch state
+        self._dispatch_workers = max_workers
+        self._default_policy = QueuePolicy()
+        self._queue_policies: dict[EventType, QueuePolicy] = {}
+        self._lanes: list[_DispatchLane] = []
+        self._running = False
+        # Guards _lanes and _running, which start and stop change together
+        self._lanes_lock = threading.Lock()
+        self._sequence = 0
+        self._sequence_lock = threading.Lock()
+        self._unfinished = 0
+        self._idle_condition = threading.Condition()
+        self._dropped: dict[EventType, int] = {}
+        self._coalesced: dict[EventType, int] = {}
+
+        # Instrumentation
+        self._metrics = EventBusMetrics()
+        self._sinks: list[Callable[[BaseComposeEvent], None]] = []
+
     def set_logger(self, logger):
         """Set logger for event bus operations."""
         self._logger = logger
@@ -605,15 +889,147 @@ class EventBus:
                 self._logger.debug(f"Unsubscribed {handler.__name__} from {event_type.value}")
 
     def add_middleware(self, middleware: Callable):
-        """Add middleware for event processing."""
+        """Add middleware for event processing.
+
+        Coroutine middleware only runs on the asyncio ``publish`` path and is
+        skipped, with a warning, by ``publish_sync`` and ``publish_async``.
+        """
         self._middleware.append(middleware)
 
+    def add_sink(self, sink: Callable[[BaseComposeEvent], None]):
+        """Add a sink that observes every published event, e.g. an event journal."""
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink: Callable[[BaseComposeEvent], None]):
+        """Remove a previously added sink."""
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+
+    def configure_queue(
+        self,
+        event_type: EventType,
+        maxsize: int | None = None,
+        overflow: OverflowPolicy | None = None,
+        block_timeout: float | None = None,
+        coalesce_key: Callable[[BaseComposeEvent], Any] | None = None,
+    ):
+        """Configure the dispatch queue bound and overflow policy for an event type.
+
+        Args:
+            event_type: Event type whose queue is configured.
+            maxsize: Maximum number of pending events per dispatcher lane.
+            overflow: Behaviour when the queue is full.
+            block_timeout: Seconds a BLOCK publisher waits before the event is rejected.
+            coalesce_key: Key function used by the COALESCE policy.
+        """
+        current = self._queue_policies.get(event_type, self._default_policy)
+        self._queue_policies[event_type] = QueuePolicy(
+            maxsize=maxsize if maxsize is not None else current.maxsize,
+            overflow=overflow or current.overflow,
+            block_timeout=block_timeout if block_timeout is not None else current.block_timeout,
+            coalesce_key=coalesce_key or current.coalesce_key,
+        )
+
+    @property
+    def is_running(self) -> bool:
+        """Whether asynchronous dispatch threads are running."""
+        return self._running
+
+    def start(self, workers: int | None = None):
+        """Start the dispatcher threads used by ``publish_async``."""
+        with self._lanes_lock:
+            if self._running:
+                return
+            self._lanes = [_DispatchLane(i) for i in range(max(1, workers or self._dispatch_workers))]
+            self._running = True
+        for lane in self._lanes:
+            lane.thread = threading.Thread(
+                target=self._dispatch_loop, args=(lane,), name=f"event_dispatch_{lane.index}", daemon=True
+            )
+            lane.thread.start()
+
+        if self._logger:
+            self._logger.info(f"Event dispatch started with {len(self._lanes)} worker(s)")
+
+    def stop(self, timeout: float | None = 5.0, drain: bool = True):
+        """Stop the dispatcher threads.
+
+        Args:
+            timeout: Seconds to wait for each dispatcher thread to exit.
+            drain: Deliver events that are still queued before stopping.
+        """
+        with self._lanes_lock:
+            if not self._running:
+                return
+            self._running = False
+            lanes = self._lanes
+            self._lanes = []
+        for lane in lanes:
+            with lane.condition:
+                if not drain:
+                    with self._idle_condition:
+                        self._unfinished -= lane.size
+                        self._idle_condition.notify_all()
+                    lane.queues.clear()
+                    lane.size = 0
+                lane.condition.notify_all()
+        for lane in lanes:
+            if lane.thread is not None and lane.thread is not threading.current_thread():
+                lane.thread.join(timeout)
+
+    def wait_until_idle(self, timeout: float | None = None) -> bool:
+        """Block until every queued event has been delivered.
+
+        Returns:
+            True if the bus became idle, False on timeout.
+        """
+        with self._idle_condition:
+            return self._idle_condition.wait_for(lambda: self._unfinished == 0, timeout)
+
+    def queue_depths(self) -> dict[EventType, int]:
+        """Return the number of pending events per event type."""
+        depths: dict[EventType, int] = {}
+        for lane in self._lanes:
+            with lane.condition:
+                for event_type, queue in lane.queues.items():
+                    if queue:
+                        depths[event_type] = depths.get(event_type, 0) + len(queue)
+        return depths
+
+    def metrics_snapshot(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot of the event bus metrics.
+
+        Includes per-event-type publish counts, per-handler latency percentiles,
+        handler exception counts and, while dispatch is running, queue depths
+        and dropped/coalesced event counts.
+        """
+        snapshot = self._metrics.to_dict()
+        snapshot["dispatch"] = {
+            "running": self._running,
+            "workers": len(self._lanes),
+            "queue_depth": {event_type.value: depth for event_type, depth in self.queue_depths().items()},
+            "dropped": {event_type.value: count for event_type, count in self._dropped.items()},
+            "coalesced": {event_type.value: count for event_type, count in self._coalesced.items()},
+        }
+        snapshot["timestamp"] = time.time()
+        return snapshot
+
+    def reset_metrics(self):
+        """Clear all collected metrics."""
+        self._metrics.reset()
+        self._dropped.clear()
+        self._coalesced.clear()
+
     async def publish(self, event: BaseComposeEvent):
         """Publish an event to all subscribers asynchronously."""
         try:
             # Apply middleware
             for middleware in self._middleware:
-                event = await middleware(event)
+                event = middleware(event)
+                if inspect.isawaitable(event):
+                    event = await event
+                if event is None:
+                    return
 
             # Get handlers for this event type
             handlers = self._handlers.get(event.event_type, [])
@@ -629,22 +1045,183 @@ class EventBus:
             if self._logger:
                 self._logger.error(f"Error publishing event {event.event_type.value}: {e}")
 
-    def publish_sync(self, event: BaseComposeEvent):
-        """Synchronous event publishing for ROS callbacks."""
-        try:
-            handlers = self._handlers.get(event.event_type, [])
+    def publish_async(self, event: BaseComposeEvent) -> bool:
+        """Queue an event for delivery on a dispatcher thread.
 
-            if self._logger:
-                self._logger.debug(f"Publishing {event.event_type.value} to {len(handlers)} handlers")
+        Falls back to synchronous delivery when dispatch has not been started.
+
+        Returns:
+            True if the event was queued or delivered, False if it was rejected.
+        """
+        with self._lanes_lock:
+            running = self._running
+            lanes = self._lanes
+        if not running:
+            self.publish_sync(event)
+            return True
+        if not lanes:
+            return False
 
-            for handler in handlers:
-                try:
-                    handler(event)
-                except Exception as e:
+        try:
+            event = self._apply_middleware(event)
+            if event is None:
+                return True
+            self._metrics.record_publish(event.event_type.value)
+            self._notify_sinks(event)
+        except Exception as e:
+            if self._logger:
+                self._logger.error(f"Error in asynchronous event publishing: {e}")
+            return False
+
+        policy = self._queue_policies.get(event.event_type, self._default_policy)
+        lane = lanes[hash(event.stack_name or event.correlation_id or event.event_type.value) % len(lanes)]
+        on_dispatcher = getattr(_dispatch_context, "lane", None) is not None
+
+        with lane.condition:
+            queue = lane.queues.setdefault(event.event_type, deque())
+
+            if policy.overflow is OverflowPolicy.COALESCE:
+                key = policy.coalesce_key(event)
+                for pending in queue:
+                    if policy.coalesce_key(pending[1]) == key:
+                        queue.remove(pending)
+                        lane.size -= 1
+                        self._count(self._coalesced, event.event_type)
+                        self._task_done()
+                        break
+
+            if len(queue) >= policy.maxsize:
+                if policy.overflow is OverflowPolicy.BLOCK:
+                    if on_dispatcher:
+                        # A dispatcher waiting on a full queue could wait on itself
+                        if self._logger:
+                            self._logger.warning(
+                                f"Queue for {event.event_type.value} is full; "
+                                "enqueuing over capacity from a dispatcher thread"
+                            )
+                    elif not lane.condition.wait_for(
+                        lambda: len(queue) < policy.maxsize or not self._running, policy.block_timeout
+                    ):
+                        self._count(self._dropped, event.event_type)
+                        if self._logger:
+                            self._logger.error(f"Timed out waiting for space in {event.event_type.value} queue")
+                        return False
+                else:
+                    queue.popleft()
+                    lane.size -= 1
+                    self._count(self._dropped, event.event_type)
+                    self._task_done()
                     if self._logger:
-                        self._logger.error(f"Error in event handler {handler.__name__}: {e}")
-                    # Continue with other handlers
+                        self._logger.warning(f"Queue for {event.event_type.value} is full; dropped oldest event")
+
+            stopped = not self._running
+            if not stopped:
+                with self._sequence_lock:
+                    self._sequence += 1
+                    sequence = self._sequence
+                with self._idle_condition:
+                    self._unfinished += 1
+                queue.append((sequence, event))
+                lane.size += 1
+                lane.condition.notify_all()
+
+        if stopped:
+            # Dispatch was stopped while this publisher was waiting for space
+            self._deliver(event)
+        return True
+
+    def publish_sync(self, event: BaseComposeEvent):
+        """Synchronous event publishing for ROS callbacks."""
+        try:
+            event = self._apply_middleware(event)
+            if event is None:
+                return
+            self._metrics.record_publish(event.event_type.value)
+            self._notify_sinks(event)
+            self._deliver(event)
 
         except Exception as e:
             if self._logger:
                 self._logger.error(f"Error in synchronous event publishing: {e}")
+
+    def _apply_middleware(self, event: BaseComposeEvent) -> BaseComposeEvent | None:
+        """Run synchronous middleware over an event; a middleware returning None drops it."""
+        for middleware in self._middleware:
+            result = middleware(event)
+            if inspect.isawaitable(result):
+                # Coroutine middleware only applies to the asyncio publish path
+                if inspect.iscoroutine(result):
+                    result.close()
+                self._warn_skipped_middleware(middleware)
+                continue
+            if result is None:
+                return None
+            event = result
+        return event
+
+    def _warn_skipped_middleware(self, middleware: Callable):
+        if middleware in self._skipped_middleware:
+            return
+        self._skipped_middleware.append(middleware)
+        if self._logger:
+            self._logger.warning(
+                f"Middleware {getattr(middleware, '__name__', middleware)} is a coroutine and only runs on the "
+                "asyncio publish path; it is skipped by synchronous and threaded publishing"
+            )
+
+    def _notify_sinks(self, event: BaseComposeEvent):
+        for sink in self._sinks:
+            try:
+                sink(event)
+            except Exception as e:
+                if self._logger:
+                    self._logger.error(f"Error in event sink {getattr(sink, '__name__', sink)}: {e}")
+
+    def _deliver(self, event: BaseComposeEvent):
+        """Invoke every handler of an event, timing each one."""
+        handlers = self._handlers.get(event.event_type, [])
+
+        if self._logger:
+            self._logger.debug(f"Publishing {event.event_type.value} to {len(handlers)} handlers")
+
+        for handler in handlers:
+            key = self._metrics.handler_key(event.event_type.value, handler)
+            started = time.perf_counter()
+            try:
+                handler(event)
+            except Exception as e:
+                self._metrics.record_handler(key, time.perf_counter() - started, failed=True)
+                if self._logger:
+                    self._logger.error(f"Error in event handler {getattr(handler, '__name__', handler)}: {e}")
+                # Continue with other handlers
+            else:
+                self._metrics.record_handler(key, time.perf_counter() - started)
+
+    def _dispatch_loop(self, lane: _DispatchLane):
+        """Deliver queued events of one lane until dispatch is stopped."""
+        _dispatch_context.lane = lane
+        while True:
+            with lane.condition:
+                lane.condition.wait_for(lambda: lane.size > 0 or not self._running)
+                if lane.size == 0:
+                    return
+                event = lane.pop_next()
+                lane.condition.notify_all()
+
+            try:
+                self._deliver(event)
+            except Exception as e:
+                if self._logger:
+                    self._logger.error(f"Error dispatching {event.event_type.value}: {e}")
+            finally:
+                self._task_done()
+
+    def _task_done(self):
+        with self._idle_condition:
+            self._unfinished -= 1
+            if self._unfinished <= 0:
+                self._idle_condition.notify_all()
+
+    @staticmethod
+    def _count(counter: dict[EventType, int], event_type: EventType):
+        counter[event_type] = counter.get(event_type, 0) + 1
@@ -35,6 +35,21 @@ STOPACTION = "stop"
 LOADACTION = "load"
 
 
+def entity_key(entity) -> str:
+    """Return the fully qualified name of a node or container, e.g. ``/ns/talker``."""
+    namespace = entity.namespace.strip("/")
+    return f"/{namespace}/{entity.name}" if namespace else f"/{entity.name}"
+
+
+def process_label(key: str) -> str:
+    """Return the launch process label of a node or container key.
+
+    Processes are named ``<label>-<n>`` by launch, so a running node can be
+    found by its key after the stack was launched.
+    """
+    return key.strip("/").replace("/", "__")
+
+
 class Stack:
     """The class that contains all stack related operations (apply, kill, stack, merge etc.)"""
 
@@ -457,32 +472,56 @@ class Stack:
             launch_description (object): The launch description object.
         """
         for c in composable_containers:
-            node_desc = [
-                ComposableNode(
-                    package=cn.pkg,
-                    plugin=cn.plugin,
-                    name=cn.name,
-                    namespace=cn.namespace,
-                    parameters=cn.ros_params,
-                    remappings=self.process_remaps(cn.remap),
-                )
-                for cn in c.nodes
-                if cn.action == STARTACTION or (cn.action == NOACTION and self.should_node_run(cn, launcher))
-            ]
+            node_desc = self._composable_descriptions(
+                [
+                    cn
+                    for cn in c.nodes
+                    if cn.action == STARTACTION or (cn.action == NOACTION and self.should_node_run(cn, launcher))
+                ]
+            )
 
             if node_desc:  # If node_desc is not empty
-                container = ComposableNodeContainer(
-                    name=c.name,
-                    namespace=c.namespace,
-                    package=c.package,
-                    executable=c.executable,
-                    output=c.output,
-                    composable_node_descriptions=node_desc,
-                )
-                launch_description.add_action(container)
+                launch_description.add_action(self._container_action(c, node_desc))
 
             # self.load_common_composables(c, launch_description)
 
+    def _composable_descriptions(self, nodes):
+        return [
+            ComposableNode(
+                package=cn.pkg,
+                plugin=cn.plugin,
+                name=cn.name,
+                namespace=cn.namespace,
+                parameters=cn.ros_params,
+                remappings=self.process_remaps(cn.remap),
+            )
+            for cn in nodes
+        ]
+
+    def _container_action(self, container, node_desc):
+        return ComposableNodeContainer(
+            name=container.name,
+            namespace=container.namespace,
+            package=container.package,
+            executable=container.executable,
+            output=container.output,
+            composable_node_descriptions=node_desc,
+            exec_name=process_label(entity_key(container)),
+        )
+
+    def _node_action(self, n):
+        return Node(
+            package=n.pkg,
+            executable=n.exec,
+            name=n.name,
+            namespace=n.namespace,
+            output=n.output,
+            parameters=n.ros_params,
+            arguments=n.args.split(),
+            remappings=self.process_remaps(n.remap),
+            exec_name=process_label(entity_key(n)),
+        )
+
     def handle_regular_nodes(self, nodes, launch_description, launcher):
         """Handle regular nodes during stack launching.
 
@@ -495,18 +534,7 @@ class Stack:
             if action == "":
                 action = NOACTION
             if action == STARTACTION or (action == NOACTION and self.should_node_run(n, launcher)):
-                launch_description.add_action(
-                    Node(
-                        package=n.pkg,
-                        executable=n.exec,
-                        name=n.name,
-                        namespace=n.namespace,
-                        output=n.output,
-                        parameters=n.ros_params,
-                        arguments=n.args.split(),
-                        remappings=self.process_remaps(n.remap),
-                    )
-                )
+                launch_description.add_action(self._node_action(n))
 
     def handle_managed_nodes(self, nodes, verb):
         """Handle regular nodes during stack launching.
@@ -541,6 +569,29 @@ class Stack:
         # After nodes are launched, take care of managed node actions
         self.handle_managed_nodes(all_nodes, verb="start")
 
+    def launch_selected(self, launcher, keys):
+        """Launch only the nodes and containers of the stack with the given keys.
+
+        A container is launched with all of its composable nodes.
+
+        Args:
+            launcher (object): The launcher object.
+            keys (set): Keys of the nodes and containers, see ``entity_key``.
+        """
+        launch_description = LaunchDescription()
+        launched = []
+        for c in self.composable:
+            if entity_key(c) in keys:
+                launch_description.add_action(self._container_action(c, self._composable_descriptions(c.nodes)))
+                launched.extend(c.nodes)
+        for n in self.node:
+            if entity_key(n) in keys:
+                launch_description.add_action(self._node_action(n))
+                launched.append(n)
+
+        launcher.start(launch_description)
+        self.handle_managed_nodes(launched, verb="start")
+
     def apply(self, launcher):
         """Apply the stack.
 
@@ -17,22 +17,38 @@ Coordinates subsystems to handle stack deployment orchestration.
 """
 
 import json
+import uuid
 from typing import Any
 
 import rclpy
 from muto_msgs.msg import MutoAction
+from rclpy.callback_groups import MutuallyExclusiveCallbackGroup, ReentrantCallbackGroup
+from rclpy.executors import MultiThreadedExecutor
 from rclpy.node import Node
 from std_msgs.msg import String
-
-from muto_composer.events import EventBus, EventType, ProcessCrashedEvent, StackRequestEvent
+from std_srvs.srv import Trigger
+
+from muto_composer.events import EventBus, EventType, OverflowPolicy, ProcessCrashedEvent, StackRequestEvent
+from muto_composer.plugins.in_process import InProcessPlugins
+from muto_composer.state.blob_store import BlobStore
+from muto_composer.state.journal import EventJournal
+from muto_composer.state.manifest_store import ManifestStore
+from muto_composer.state.step_cache import StepCache
+from muto_composer.state.twin_cache import TwinDefinitionCache
 from muto_composer.subsystems.digital_twin_integration import DigitalTwinIntegration
-from muto_composer.subsystems.message_handler import MessageHandler
-from muto_composer.subsystems.orchestration_manager import OrchestrationManager
+from muto_composer.subsystems.message_handler import (
+    MessageHandler,
+    MessageRouter,
+    StackAdmissionQueue,
+    stack_request_coalesce_key,
+)
+from muto_composer.subsystems.orchestration_manager import OrchestrationManager, StackScheduler
 from muto_composer.subsystems.pipeline_engine import PipelineEngine
 from muto_composer.subsystems.stack_manager import StackManager
 
 # Legacy imports for test compatibility
 from muto_composer.utils.stack_parser import create_stack_parser
+from muto_composer.workflow.service_pool import ServiceClientPool
 
 
 class MutoComposer(Node):
@@ -49,17 +65,114 @@ class MutoComposer(Node):
         self.declare_parameter("twin_url", "sandbox.composiv.ai")
         self.declare_parameter("namespace", "org.eclipse.muto.sandbox")
         self.declare_parameter("name", "example-01")
+        self.declare_parameter("event_dispatch_workers", 4)
+        self.declare_parameter("metrics_publish_period", 10.0)
+        self.declare_parameter("event_journal", False)
+        self.declare_parameter("event_journal_path", "")
+        self.declare_parameter("admission_debounce_sec", 0.0)
+        self.declare_parameter("deployment_workers", 4)
+        self.declare_parameter("manifest_store", True)
+        self.declare_parameter("blob_store", True)
+        self.declare_parameter("twin_cache_ttl", 30.0)
+        self.declare_parameter("twin_sync_interval", 1.0)
+        self.declare_parameter("twin_state_service", "")
+        self.declare_parameter("pipeline_client_pool", True)
+        self.declare_parameter("pipeline_step_timeout", 600.0)
+        self.declare_parameter("pipeline_timeout", 1800.0)
+        self.declare_parameter("step_cache", True)
+        self.declare_parameter("pipeline_reload_interval", 2.0)
+        self.declare_parameter("in_process_plugins", True)
+        self.declare_parameter("executor_threads", 0)
 
         # Extract parameter values
         self.twin_url = self.get_parameter("twin_url").get_parameter_value().string_value
         self.twin_namespace = self.get_parameter("namespace").get_parameter_value().string_value
         self.name = self.get_parameter("name").get_parameter_value().string_value
         self.next_stack_topic = self.get_parameter("stack_topic").get_parameter_value().string_value
+        dispatch_workers = self.get_parameter("event_dispatch_workers").get_parameter_value().integer_value
+        self.metrics_publish_period = self.get_parameter("metrics_publish_period").get_parameter_value().double_value
+
+        # Callbacks of different groups run concurrently on the multi-threaded executor: a crash
+        # notification or twin response is handled while a request or control call is in progress
+        self.intake_callback_group = MutuallyExclusiveCallbackGroup()
+        self.crash_callback_group = MutuallyExclusiveCallbackGroup()
+        self.client_callback_group = ReentrantCallbackGroup()
+        self.control_callback_group = MutuallyExclusiveCallbackGroup()
 
         # Initialize event bus for subsystem communication
-        self.event_bus = EventBus()
+        self.event_bus = EventBus(max_workers=dispatch_workers or 4)
         self.event_bus.set_logger(self.get_logger())
 
+        # Optionally record every published event for incident analysis and replay
+        self.event_journal = None
+        if self.get_parameter("event_journal").get_parameter_value().bool_value:
+            journal_path = self.get_parameter("event_journal_path").get_parameter_value().string_value
+            self.event_journal = EventJournal(directory=journal_path or None, logger=self.get_logger())
+            self.event_bus.add_sink(self.event_journal.append)
+            self.get_logger().info(f"Recording events to {self.event_journal.directory}")
+
+        # Hold bursts of requests for the same stack so only the newest is deployed
+        admission_debounce = self.get_parameter("admission_debounce_sec").get_parameter_value().double_value
+        self.stack_admission = StackAdmissionQueue(
+            self.event_bus, debounce_sec=admission_debounce, logger=self.get_logger()
+        )
+        # Requests already admitted but not yet analyzed supersede each other too
+        self.event_bus.configure_queue(
+            EventType.STACK_REQUEST, overflow=OverflowPolicy.COALESCE, coalesce_key=stack_request_coalesce_key
+        )
+
+        # Deploy different stacks concurrently while keeping each stack strictly ordered
+        deployment_workers = self.get_parameter("deployment_workers").get_parameter_value().integer_value
+        self.stack_scheduler = (
+            StackScheduler(max_workers=deployment_workers, logger=self.get_logger()) if deployment_workers > 0 else None
+        )
+
+        # Pass manifests to the plugins by digest instead of serializing them into every request
+        self.manifest_store = None
+        if self.get_parameter("manifest_store").get_parameter_value().bool_value:
+            try:
+                self.manifest_store = ManifestStore(logger=self.get_logger())
+            except OSError as e:
+                self.get_logger().warning(f"Manifest store unavailable, passing manifests inline: {e}")
+
+        # Decode inline archive data once at intake instead of carrying it in every event and state file
+        self.blob_store = None
+        if self.get_parameter("blob_store").get_parameter_value().bool_value:
+            try:
+                self.blob_store = BlobStore(logger=self.get_logger())
+            except OSError as e:
+                self.get_logger().warning(f"Blob store unavailable, keeping artifact data inline: {e}")
+
+        # Share twin stack definitions with the plugins so one deployment costs one twin round-trip
+        self.twin_cache = None
+        twin_cache_ttl = self.get_parameter("twin_cache_ttl").get_parameter_value().double_value
+        if twin_cache_ttl > 0:
+            try:
+                self.twin_cache = TwinDefinitionCache(ttl=twin_cache_ttl, logger=self.get_logger())
+            except OSError as e:
+                self.get_logger().warning(f"Twin definition cache unavailable: {e}")
+
+        # Keep one pipeline executor node with pre-created plugin clients instead of one per deployment
+        self.client_pool = None
+        if self.get_parameter("pipeline_client_pool").get_parameter_value().bool_value:
+            try:
+                self.client_pool = ServiceClientPool(logger=self.get_logger())
+            except Exception as e:
+                self.get_logger().warning(f"Pipeline client pool unavailable, creating a node per execution: {e}")
+
+        # Memoize the results of pipeline steps marked cacheable
+        self.step_cache = None
+        if self.get_parameter("step_cache").get_parameter_value().bool_value:
+            try:
+                self.step_cache = StepCache(logger=self.get_logger())
+            except OSError as e:
+                self.get_logger().warning(f"Step cache unavailable, cacheable steps always run: {e}")
+
+        # Host the plugins of steps marked in_process in this process, created on their first call
+        self.in_process_plugins = None
+        if self.get_parameter("in_process_plugins").get_parameter_value().bool_value:
+            self.in_process_plugins = InProcessPlugins(logger=self.get_logger())
+
         # Initialize all subsystems with dependency injection
         self._initialize_subsystems()
 
@@ -69,6 +182,9 @@ class MutoComposer(Node):
         # Subscribe to relevant events for coordination
         self._subscribe_to_events()
 
+        # Hand queued events to dispatcher threads so intake never waits on a pipeline
+        self.event_bus.start()
+
         # Legacy attributes for test compatibility
         self.pipelines = {}  # Deprecated - now handled by PipelineEngine
         self.current_stack = None  # Deprecated - now handled by StackManager
@@ -82,15 +198,44 @@ class MutoComposer(Node):
         """Initialize all subsystems in correct dependency order."""
         try:
             # Initialize core subsystems
-            self.message_handler = MessageHandler(node=self, event_bus=self.event_bus)
+            self.message_handler = MessageHandler(
+                node=self,
+                event_bus=self.event_bus,
+                admission=self.stack_admission,
+                blob_store=self.blob_store,
+                callback_group=self.intake_callback_group,
+                client_callback_group=self.client_callback_group,
+            )
 
-            self.digital_twin = DigitalTwinIntegration(node=self, event_bus=self.event_bus, logger=self.get_logger())
+            self.digital_twin = DigitalTwinIntegration(
+                node=self,
+                event_bus=self.event_bus,
+                logger=self.get_logger(),
+                twin_cache=self.twin_cache,
+                sync_interval=self.get_parameter("twin_sync_interval").get_parameter_value().double_value,
+                state_service=self.get_parameter("twin_state_service").get_parameter_value().string_value,
+            )
 
             self.stack_manager = StackManager(event_bus=self.event_bus, logger=self.get_logger())
 
-            self.orchestration_manager = OrchestrationManager(event_bus=self.event_bus, logger=self.get_logger())
+            self.pipeline_engine = PipelineEngine(
+                event_bus=self.event_bus,
+                logger=self.get_logger(),
+                manifest_store=self.manifest_store,
+                client_pool=self.client_pool,
+                step_timeout=self.get_parameter("pipeline_step_timeout").get_parameter_value().double_value or None,
+                pipeline_timeout=self.get_parameter("pipeline_timeout").get_parameter_value().double_value or None,
+                step_cache=self.step_cache,
+                in_process_plugins=self.in_process_plugins,
+            )
 
-            self.pipeline_engine = PipelineEngine(event_bus=self.event_bus, logger=self.get_logger())
+            # A newer request for a stack cancels the running pipeline of that stack
+            self.orchestration_manager = OrchestrationManager(
+                event_bus=self.event_bus,
+                logger=self.get_logger(),
+                scheduler=self.stack_scheduler,
+                pipeline_executor=self.pipeline_engine.get_executor(),
+            )
 
             self.get_logger().info("All subsystems initialized successfully")
 
@@ -106,7 +251,44 @@ class MutoComposer(Node):
 
             # Subscribe to process crash notifications from launch_plugin
             self._crash_subscription = self.create_subscription(
-                String, "launch_plugin/process_crashed", self._handle_process_crash_notification, 10
+                String,
+                "launch_plugin/process_crashed",
+                self._handle_process_crash_notification,
+                10,
+                callback_group=self.crash_callback_group,
+            )
+
+            # Event bus instrumentation: on-demand snapshot and periodic topic
+            self._metrics_service = self.create_service(
+                Trigger,
+                "muto_composer/event_bus_metrics",
+                self._handle_metrics_request,
+                callback_group=self.control_callback_group,
+            )
+            self._metrics_pub = self.create_publisher(String, "muto_composer/event_bus_metrics", 10)
+            if self.metrics_publish_period > 0.0:
+                self._metrics_timer = self.create_timer(
+                    self.metrics_publish_period, self._publish_metrics, callback_group=self.control_callback_group
+                )
+
+            # Pipeline configuration reload on request, and when the file changes
+            self._reload_service = self.create_service(
+                Trigger,
+                "muto_composer/reload_pipelines",
+                self._handle_reload_request,
+                callback_group=self.control_callback_group,
+            )
+
+            # Rolling pipeline, step and orchestration durations
+            self._timings_service = self.create_service(
+                Trigger,
+                "muto_composer/timings",
+                self._handle_timings_request,
+                callback_group=self.control_callback_group,
+            )
+
+            self.pipeline_engine.get_manager().start_watching(
+                self.get_parameter("pipeline_reload_interval").get_parameter_value().double_value
             )
 
             self.get_logger().info("ROS 2 interfaces set up successfully")
@@ -147,13 +329,15 @@ class MutoComposer(Node):
             stack_request = StackRequestEvent(
                 event_type=EventType.STACK_REQUEST,
                 source_component="muto_composer",
+                correlation_id=str(uuid.uuid4()),
                 stack_name=stack_name,
                 action=stack_msg.method,
                 stack_payload=payload,
+                metadata=MessageRouter.intake_metadata(payload, self.blob_store),
             )
 
-            # Publish to event bus for subsystem processing
-            self.event_bus.publish_sync(stack_request)
+            # Admit for subsystem processing without blocking the subscription callback
+            self.stack_admission.submit(stack_request)
 
             self.get_logger().info(f"Stack request published for processing: {stack_name}")
 
@@ -226,6 +410,7 @@ class MutoComposer(Node):
             crash_event = ProcessCrashedEvent(
                 event_type=EventType.PROCESS_CRASHED,
                 source_component="muto_composer",
+                correlation_id=str(uuid.uuid4()),
                 process_name=crash_data.get("process_name", ""),
                 exit_code=crash_data.get("exit_code", -1),
                 stack_name=crash_data.get("stack_name", ""),
@@ -243,6 +428,88 @@ class MutoComposer(Node):
         except Exception as e:
             self.get_logger().error(f"Error handling process crash notification: {e}")
 
+    def _handle_metrics_request(self, request, response):
+        """Return the current event bus metrics snapshot as JSON."""
+        try:
+            response.success = True
+            response.message = json.dumps(self._metrics_snapshot())
+        except Exception as e:
+            response.success = False
+            response.message = f"Failed to collect event bus metrics: {e}"
+        return response
+
+    def _handle_timings_request(self, request, response):
+        """Return the rolling duration statistics of pipelines, their steps and orchestrations as JSON."""
+        try:
+            response.success = True
+            response.message = json.dumps(
+                {
+                    "pipelines": self.pipeline_engine.get_executor().timings.to_dict(),
+                    "orchestrations": self.orchestration_manager.get_orchestrator().timings.to_dict(),
+                }
+            )
+        except Exception as e:
+            response.success = False
+            response.message = f"Failed to collect timings: {e}"
+        return response
+
+    def _handle_reload_request(self, request, response):
+        """Reload the pipeline configuration, keeping the loaded pipelines if it is invalid."""
+        manager = self.pipeline_engine.get_manager()
+        try:
+            manager.reload_configuration()
+            response.success = True
+            response.message = f"Loaded {len(manager.pipelines)} pipelines from {manager.config_path}"
+        except Exception as e:
+            response.success = False
+            response.message = f"Failed to reload pipeline configuration: {e}"
+        return response
+
+    def _publish_metrics(self):
+        """Publish the event bus metrics snapshot periodically."""
+        try:
+            msg = String()
+            msg.data = json.dumps(self._metrics_snapshot())
+            self._metrics_pub.publish(msg)
+        except Exception as e:
+            self.get_logger().warning(f"Failed to publish event bus metrics: {e}")
+
+    def _metrics_snapshot(self) -> dict[str, Any]:
+        """Event bus metrics extended with the admission, scheduler, twin, client pool, step cache and plugin counts."""
+        snapshot = self.event_bus.metrics_snapshot()
+        snapshot["admission"] = self.stack_admission.metrics_snapshot()
+        if self.stack_scheduler is not None:
+            snapshot["scheduler"] = {
+                "workers": self.stack_scheduler.max_workers,
+                "pending": self.stack_scheduler.pending(),
+            }
+        if self.twin_cache is not None:
+            snapshot["twin_cache"] = self.twin_cache.metrics_snapshot()
+        snapshot["twin_sync"] = self.digital_twin.sync_queue.metrics_snapshot()
+        if self.client_pool is not None:
+            snapshot["client_pool"] = self.client_pool.metrics_snapshot()
+        if self.step_cache is not None:
+            snapshot["step_cache"] = self.step_cache.metrics_snapshot()
+        if self.in_process_plugins is not None:
+            snapshot["in_process_plugins"] = self.in_process_plugins.metrics_snapshot()
+        return snapshot
+
+    def destroy_node(self):
+        """Stop admission, dispatch, deployments, twin sync, config watching, the plugins, client pool and journal."""
+        self.stack_admission.close()
+        self.event_bus.stop()
+        if self.stack_scheduler is not None:
+            self.stack_scheduler.shutdown()
+        self.digital_twin.close()
+        self.pipeline_engine.get_manager().stop_watching()
+        if self.in_process_plugins is not None:
+            self.in_process_plugins.shutdown()
+        if self.client_pool is not None:
+            self.client_pool.shutdown()
+        if self.event_journal is not None:
+            self.event_journal.close()
+        return super().destroy_node()
+
     # Legacy interface methods for backward compatibility
     def pipeline_execute(
         self,
@@ -329,7 +596,14 @@ def main(args=None):
     try:
         rclpy.init(args=args)
         composer = MutoComposer()
-        rclpy.spin(composer)
+        # Intake, crash notifications, twin responses and control services are served concurrently
+        threads = composer.get_parameter("executor_threads").get_parameter_value().integer_value
+        executor = MultiThreadedExecutor(num_threads=threads or None)
+        executor.add_node(composer)
+        try:
+            executor.spin()
+        finally:
+            executor.shutdown()
     except KeyboardInterrupt:
         pass
     except Exception as e:
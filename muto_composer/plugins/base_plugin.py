@@ -22,8 +22,12 @@ from typing import Any
 
 import rclpy
 from muto_msgs.srv import CoreTwin
+from rclpy.callback_groups import MutuallyExclusiveCallbackGroup, ReentrantCallbackGroup
 from rclpy.node import Node
 
+from muto_composer.state.manifest_store import ManifestStore, parse_reference
+from muto_composer.state.twin_cache import TwinDefinitionCache
+from muto_composer.utils.hashing import manifest_digest
 from muto_composer.utils.paths import WORKSPACES_PATH
 from muto_composer.utils.stack_parser import StackParser
 
@@ -56,14 +60,33 @@ class StackContext:
 class BasePlugin(Node):
     """Base class for stack plugins implementing the Plugin interface."""
 
-    def __init__(self, node_name: str):
+    def __init__(self, node_name: str, service_callback_group=None, **kwargs):
         from muto_composer.stack_handlers.registry import StackTypeRegistry
 
-        Node.__init__(self, node_name)
-        self._stack_definition_client = self.create_client(CoreTwin, "/muto/core_twin/get_stack_definition")
+        # Keyword arguments are passed to the node, e.g. the cli_args of an in-process plugin
+        Node.__init__(self, node_name, **kwargs)
+        # The plugin's services share one group, so it handles one request at a time
+        self.service_callback_group = service_callback_group or MutuallyExclusiveCallbackGroup()
+        # Client responses must be handled while a service handler waits for them on a multi-threaded executor
+        self.client_callback_group = ReentrantCallbackGroup()
+        self._stack_definition_client = self.create_client(
+            CoreTwin, "/muto/core_twin/get_stack_definition", callback_group=self.client_callback_group
+        )
         self.stack_registry = StackTypeRegistry(self, self.get_logger())
         self.stack_registry.discover_and_register_handlers()
         self.stack_parser = StackParser(self.get_logger())
+        # Manifests passed by digest are read from the shared store and cached parsed
+        try:
+            self.manifest_store = ManifestStore(logger=self.get_logger())
+        except OSError as e:
+            self.get_logger().warning(f"Manifest store unavailable: {e}")
+            self.manifest_store = None
+        # Stack definitions are shared with the other plugins and the composer
+        try:
+            self.twin_cache = TwinDefinitionCache(logger=self.get_logger())
+        except OSError as e:
+            self.get_logger().warning(f"Twin definition cache unavailable: {e}")
+            self.twin_cache = None
 
     # Plugin interface implementation - single accept method
 
@@ -120,10 +143,17 @@ class BasePlugin(Node):
             return None, None
 
         current_stack = self._safely_parse_stack(request.input.current.stack)
-        # encode str and sha256 hash of the stack contents
+        # sha256 hash of the canonical stack contents, independent of key order and whitespace
         # Handle both real strings and test mocks
         if isinstance(request.input.current.stack, str):
-            hash = hashlib.sha256(request.input.current.stack.encode()).hexdigest()
+            reference = parse_reference(request.input.current.stack)
+            if reference and current_stack:
+                # The store digest is the canonical digest of the referenced manifest
+                hash = reference["digest"]
+            elif current_stack:
+                hash = manifest_digest(current_stack)
+            else:
+                hash = hashlib.sha256(request.input.current.stack.encode()).hexdigest()
         else:
             hash = None
         try:
@@ -161,11 +191,22 @@ class BasePlugin(Node):
 
     def _fetch_stack_manifest(self, stack_id: str) -> dict[str, Any] | None:
         """
-        Retrieve a stack manifest from CoreTwin using the provided stack ID.
+        Retrieve a stack manifest using the provided stack ID, from the twin
+        definition cache when another process fetched it recently.
         """
         if not stack_id:
             return None
 
+        twin_cache = getattr(self, "twin_cache", None)
+        if twin_cache is None:
+            return self._request_stack_manifest(stack_id)
+        return twin_cache.get_or_fetch(stack_id, self._request_stack_manifest)
+
+    def _request_stack_manifest(self, stack_id: str) -> dict[str, Any] | None:
+        """
+        Retrieve a stack manifest from CoreTwin using the provided stack ID.
+        """
+
         try:
             if not self._stack_definition_client:
                 return None
@@ -249,6 +290,11 @@ class BasePlugin(Node):
                 self.get_logger().warning(f"Stack string parsed to non-dict type: {type(parsed)}")
                 return None
 
+            # A manifest reference would otherwise pass for a manifest
+            reference = parse_reference(parsed)
+            if reference:
+                return self._resolve_manifest_reference(reference)
+
             if self._is_manifest_payload(parsed):
                 return parsed
 
@@ -275,6 +321,16 @@ class BasePlugin(Node):
             self.get_logger().warning(f"Failed to parse stack string as JSON: {e}")
             return None
 
+    def _resolve_manifest_reference(self, reference: dict[str, str]) -> dict[str, Any] | None:
+        """Read a manifest passed by reference from the manifest store."""
+        store = getattr(self, "manifest_store", None)
+        if store is None:
+            store = self.manifest_store = ManifestStore(logger=self.get_logger())
+        manifest = store.get(reference["digest"], reference.get("path"))
+        if manifest is None:
+            self.get_logger().error(f"Manifest {reference['digest']} could not be read from the manifest store")
+        return manifest
+
     def _validate_stack_manifest(self, stack: dict[str, Any]) -> bool:
         """
         Validate that the stack manifest is well-formed before processing.
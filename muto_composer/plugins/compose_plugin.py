@@ -12,25 +12,30 @@
 #
 
 import json
+import time
 
 import rclpy
 from muto_msgs.msg import StackManifest
 from muto_msgs.srv import ComposePlugin
 from std_msgs.msg import String
 
+from muto_composer.utils.metrics import process_footprint
+
 from .base_plugin import BasePlugin, StackOperation
 
 
 class MutoDefaultComposePlugin(BasePlugin):
-    def __init__(self):
-        super().__init__("compose_plugin")
+    def __init__(self, **kwargs):
+        super().__init__("compose_plugin", **kwargs)
 
         self.incoming_stack = None
         self.next_stack = None  # To store the next stack if needed
 
         self.create_subscription(String, "raw_stack", self.handle_raw_stack, 10)
         self.composed_stack_publisher = self.create_publisher(StackManifest, "composed_stack", 10)
-        self.compose_srv = self.create_service(ComposePlugin, "muto_compose", self.handle_compose)
+        self.compose_srv = self.create_service(
+            ComposePlugin, "muto_compose", self.handle_compose, callback_group=self.service_callback_group
+        )
 
     def handle_raw_stack(self, stack_msg: String):
         """
@@ -121,8 +126,11 @@ class MutoDefaultComposePlugin(BasePlugin):
 
 
 def main():
+    started = time.monotonic()
     rclpy.init()
     compose_plugin = MutoDefaultComposePlugin()
+    footprint = process_footprint(started)
+    compose_plugin.get_logger().info(f"Started in {footprint['startup_sec']}s, peak RSS {footprint['max_rss_mb']} MB")
     rclpy.spin(compose_plugin)
     compose_plugin.destroy_node()
     if rclpy.ok():
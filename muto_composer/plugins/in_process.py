@@ -0,0 +1,220 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+In-process plugin execution for single-host deployments.
+
+Plugins are registered as ``muto_composer.plugins`` entry points, named after
+their service type (``ComposePlugin``, ``ProvisionPlugin``, ``LaunchPlugin``).
+A pipeline step marked ``in_process: true`` instantiates the plugin node inside
+the composer on first use and calls the callback it registered for the step's
+service directly, with the same request and response types and the same
+``StackTypeRegistry`` handlers, skipping DDS serialization and discovery.
+
+The hosted node is named ``in_process_<plugin>`` and its ROS services are
+destroyed once their callbacks are taken, so it neither clashes with nor
+answers for a separately started plugin process. The callbacks run on worker
+threads; a call stops waiting for its handler when the step timeout, the run
+deadline or the run cancellation is reached. The plugin nodes are spun on a
+background executor for their own clients, timers and subscriptions.
+"""
+
+import re
+import threading
+from collections.abc import Callable
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from importlib.metadata import EntryPoint, entry_points
+from typing import Any
+
+from rclpy.executors import MultiThreadedExecutor
+
+from muto_composer.utils.futures import wait_for_future
+
+ENTRY_POINT_GROUP = "muto_composer.plugins"
+
+# The plugins registered by setup.py, used when no entry points are installed
+BUILTIN_PLUGINS = {
+    "ComposePlugin": "muto_composer.plugins.compose_plugin:MutoDefaultComposePlugin",
+    "ProvisionPlugin": "muto_composer.plugins.provision_plugin:MutoProvisionPlugin",
+    "LaunchPlugin": "muto_composer.plugins.launch_plugin:MutoDefaultLaunchPlugin",
+}
+
+
+def discover_plugins() -> dict[str, Callable[[], Any]]:
+    """Return the plugin node factories registered as entry points, by plugin name.
+
+    Defaults to the built-in plugins when the package was not installed with
+    its entry points, e.g. when run from a source checkout.
+    """
+    registered = list(entry_points(group=ENTRY_POINT_GROUP)) or [
+        EntryPoint(name, value, ENTRY_POINT_GROUP) for name, value in BUILTIN_PLUGINS.items()
+    ]
+    return {entry_point.name: entry_point.load for entry_point in registered}
+
+
+def in_process_node_name(plugin_name: str) -> str:
+    """Return the node name of a hosted plugin, e.g. ``in_process_compose_plugin`` for ``ComposePlugin``."""
+    return "in_process_" + re.sub(r"(?<!^)(?=[A-Z])", "_", plugin_name).lower()
+
+
+class InProcessPlugins:
+    """Plugin nodes hosted in the composer process and called without ROS services."""
+
+    def __init__(self, factories: dict[str, Callable[[], Any]] | None = None, logger=None, max_workers: int = 4):
+        """
+        Args:
+            factories: Plugin name to a callable returning the plugin node class,
+                defaults to ``discover_plugins``. The class is instantiated with
+                the ``cli_args`` of its node name.
+            logger: Optional logger.
+            max_workers: Threads running plugin handlers.
+        """
+        self.factories = discover_plugins() if factories is None else dict(factories)
+        self.logger = logger
+
+        self._lock = threading.Lock()
+        self._plugins: dict[str, Any] = {}
+        # Plugin name to service name to the service type and callback of the destroyed ROS service
+        self._handlers: dict[str, dict[str, tuple[Any, Callable]]] = {}
+        self._workers = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="in_process_plugin")
+        # A plugin handles one request at a time, as its service callback group does in service mode
+        self._plugin_locks: dict[str, threading.Lock] = {}
+        # Plugin name to a call that was given up on while its handler kept running
+        self._abandoned: dict[str, Future] = {}
+        self._executor = None
+        self._spin_thread: threading.Thread | None = None
+        self.calls = 0
+
+    def available(self, plugin_name: str) -> bool:
+        """Whether a plugin can run in-process."""
+        return plugin_name in self.factories
+
+    def get_plugin(self, plugin_name: str):
+        """Return the node of a plugin, creating it on first use.
+
+        Raises:
+            KeyError: If no plugin of that name is registered.
+        """
+        with self._lock:
+            plugin = self._plugins.get(plugin_name)
+            if plugin is None:
+                node_name = in_process_node_name(plugin_name)
+                plugin = self.factories[plugin_name]()(cli_args=["--ros-args", "-r", f"__node:={node_name}"])
+                self._handlers[plugin_name] = self._take_services(plugin)
+                self._plugins[plugin_name] = plugin
+                self._plugin_locks[plugin_name] = threading.Lock()
+                self._spin(plugin)
+                if self.logger:
+                    self.logger.info(f"Started in-process plugin {plugin_name}")
+            return plugin
+
+    def _spin(self, plugin):
+        if self._executor is None:
+            self._executor = MultiThreadedExecutor()
+            self._spin_thread = threading.Thread(target=self._executor.spin, name="in_process_plugins", daemon=True)
+            self._executor.add_node(plugin)
+            self._spin_thread.start()
+        else:
+            self._executor.add_node(plugin)
+
+    @staticmethod
+    def _take_services(plugin) -> dict[str, tuple[Any, Callable]]:
+        """Return the handlers of a plugin's services and destroy the ROS services."""
+        handlers = {}
+        for service in list(plugin.services):
+            handlers[service.srv_name.lstrip("/")] = (service.srv_type, service.callback)
+            plugin.destroy_service(service)
+        return handlers
+
+    def _invoke(self, plugin_name: str, srv_type, callback: Callable, request):
+        with self._plugin_locks[plugin_name]:
+            return callback(request, srv_type.Response())
+
+    def call(self, plugin_name: str, service_name: str, request, timeout: float | None = None, cancelled=None):
+        """Call the handler a plugin registered for a service and wait for its response.
+
+        A handler that is still running when the call gives up runs to
+        completion on its worker thread, holding the plugin until it returns.
+        Calls to the plugin fail until then instead of queueing behind it.
+
+        Args:
+            plugin_name: Name of the plugin.
+            service_name: Service whose handler is called.
+            request: Service request.
+            timeout: Seconds to wait for the response, None waits indefinitely.
+            cancelled (threading.Event, optional): Stops waiting for the response when set.
+
+        Returns:
+            The response filled in by the handler.
+
+        Raises:
+            KeyError: If the plugin is not registered or does not provide the service.
+            RuntimeError: If the plugin is still running the handler of an abandoned call.
+            TimeoutError: If the handler does not return within ``timeout``.
+            CancelledError: If ``cancelled`` is set before the handler returns.
+        """
+        self.get_plugin(plugin_name)
+        handler = self._handlers[plugin_name].get(service_name.lstrip("/"))
+        if handler is None:
+            raise KeyError(f"Plugin {plugin_name} does not provide service '{service_name}'")
+
+        with self._lock:
+            abandoned = self._abandoned.get(plugin_name)
+            if abandoned is not None:
+                raise RuntimeError(f"Plugin {plugin_name} is still running a call that timed out or was cancelled")
+            self.calls += 1
+        future = self._workers.submit(self._invoke, plugin_name, *handler, request)
+        try:
+            wait_for_future(future, timeout, cancelled, f"In-process call to {plugin_name} '{service_name}'")
+        except (TimeoutError, CancelledError):
+            if not future.cancelled():
+                self._abandon(plugin_name, service_name, future)
+            raise
+        return future.result()
+
+    def _abandon(self, plugin_name: str, service_name: str, future: Future):
+        """Keep the plugin busy until the handler of an abandoned call returns."""
+        if self.logger:
+            self.logger.warning(
+                f"Abandoned in-process call to {plugin_name} '{service_name}', "
+                "its handler keeps running and the plugin rejects calls until it returns"
+            )
+
+        def release(_future):
+            with self._lock:
+                if self._abandoned.get(plugin_name) is future:
+                    del self._abandoned[plugin_name]
+            if self.logger:
+                self.logger.info(f"Abandoned in-process call to {plugin_name} '{service_name}' returned")
+
+        with self._lock:
+            self._abandoned[plugin_name] = future
+        future.add_done_callback(release)
+
+    def metrics_snapshot(self) -> dict[str, Any]:
+        """Return the running plugins and the number of in-process calls."""
+        with self._lock:
+            return {"plugins": sorted(self._plugins), "calls": self.calls, "busy": sorted(self._abandoned)}
+
+    def shutdown(self):
+        """Stop the executor and destroy the plugin nodes."""
+        with self._lock:
+            plugins = list(self._plugins.values())
+            self._plugins.clear()
+            self._handlers.clear()
+        self._workers.shutdown(wait=False, cancel_futures=True)
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._spin_thread.join(timeout=5.0)
+        for plugin in plugins:
+            plugin.destroy_node()
@@ -16,13 +16,19 @@ import atexit
 import json
 import os
 import subprocess
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 import rclpy
 from muto_msgs.msg import StackManifest
 from muto_msgs.srv import CoreTwin, LaunchPlugin
 from rclpy.callback_groups import ReentrantCallbackGroup
+from rclpy.executors import MultiThreadedExecutor
 from std_msgs.msg import String
 
+from muto_composer.subsystems.digital_twin_integration import TwinSyncQueue
+from muto_composer.utils.metrics import process_footprint
 from muto_composer.utils.paths import WORKSPACES_PATH
 from muto_composer.utils.stack_parser import StackParser
 from muto_composer.workflow.launcher import Ros2LaunchParent
@@ -56,15 +62,27 @@ class ShellProcessWrapper:
 class MutoDefaultLaunchPlugin(BasePlugin):
     # Process health monitoring interval in seconds
     PROCESS_MONITOR_INTERVAL = 1.0
+    # Seconds to wait for CoreTwin to acknowledge a current stack update
+    TWIN_RESPONSE_TIMEOUT = 5.0
 
-    def __init__(self):
-        super().__init__("launch_plugin")
+    def __init__(self, **kwargs):
+        super().__init__("launch_plugin", **kwargs)
 
-        self.start_srv = self.create_service(LaunchPlugin, "muto_start_stack", self.handle_start)
-        self.stop_srv = self.create_service(LaunchPlugin, "muto_kill_stack", self.handle_kill)
-        self.apply_srv = self.create_service(LaunchPlugin, "muto_apply_stack", self.handle_apply)
+        self.start_srv = self.create_service(
+            LaunchPlugin, "muto_start_stack", self.handle_start, callback_group=self.service_callback_group
+        )
+        self.stop_srv = self.create_service(
+            LaunchPlugin, "muto_kill_stack", self.handle_kill, callback_group=self.service_callback_group
+        )
+        self.apply_srv = self.create_service(
+            LaunchPlugin, "muto_apply_stack", self.handle_apply, callback_group=self.service_callback_group
+        )
 
-        self.set_stack_cli = self.create_client(CoreTwin, "core_twin/set_current_stack")
+        self.set_stack_cli = self.create_client(
+            CoreTwin, "core_twin/set_current_stack", callback_group=self.client_callback_group
+        )
+        # Current stack updates are coalesced per stack and retried while the twin is unreachable
+        self.twin_sync = TwinSyncQueue(self._send_current_stack, logger=self.get_logger())
 
         self.stack_parser = StackParser(self.get_logger())
 
@@ -100,6 +118,7 @@ class MutoDefaultLaunchPlugin(BasePlugin):
         self.get_logger().info("Destroying launch_plugin node; terminating active launchers.")
         for launch_file in list(self._managed_launchers.keys()):
             self._terminate_launch_process(launch_file)
+        self.twin_sync.close()
         return super().destroy_node()
 
     def run_async_loop(self):
@@ -449,31 +468,64 @@ class MutoDefaultLaunchPlugin(BasePlugin):
 
     def _set_current_stack(self, stack_id: str, state: str = "unknown") -> bool:
         """
-        Update the current stack in the CoreTwin service.
+        Queue an update of the current stack in the CoreTwin service.
 
         Args:
             stack_id: The stack ID to set as current
             state: The state of the stack (e.g., "running", "killed", "unknown")
 
         Returns:
-            True if successful, False otherwise
+            True if the update was queued, False otherwise
         """
         try:
-            if not self.set_stack_cli.wait_for_service(timeout_sec=5.0):
-                self.get_logger().warning("CoreTwin set_current_stack service not available")
-                return False
-
-            request = CoreTwin.Request()
-            request.input = stack_id
-
-            self.set_stack_cli.call_async(request)
+            self.twin_sync.submit(stack_id, {"stackId": stack_id, "state": state})
             self.get_logger().info(f"Setting current stack to {stack_id} with state={state}")
             return True
 
         except Exception as e:
-            self.get_logger().error(f"Error calling set_current_stack: {e}")
+            self.get_logger().error(f"Error queueing set_current_stack: {e}")
+            return False
+
+    def _send_current_stack(self, stack_id: str, current: dict, patch: list | None) -> bool:
+        """Send a queued current stack update and wait for CoreTwin to acknowledge it.
+
+        The set_current_stack service takes the stack id alone, so the whole
+        update is sent every time and ``patch`` is not used. The state only
+        decides which queued updates replace each other.
+
+        Returns:
+            bool: The ``success`` of the response. False when the service is not
+            ready, fails or does not answer in time, so the sync queue retries
+            with backoff.
+        """
+        if not self.set_stack_cli.service_is_ready():
+            self.get_logger().warning("CoreTwin set_current_stack service not available")
+            return False
+
+        request = CoreTwin.Request()
+        request.input = current["stackId"]
+        result: Future = Future()
+
+        def _cb(done):
+            try:
+                result.set_result(bool(getattr(done.result(), "success", False)))
+            except Exception as e:
+                result.set_exception(e)
+
+        try:
+            self.set_stack_cli.call_async(request).add_done_callback(_cb)
+            success = result.result(timeout=self.TWIN_RESPONSE_TIMEOUT)
+        except FutureTimeoutError:
+            self.get_logger().warning(f"Timed out setting current stack to {stack_id}")
+            return False
+        except Exception as e:
+            self.get_logger().warning(f"Error setting current stack to {stack_id}: {e}")
             return False
 
+        if not success:
+            self.get_logger().warning(f"CoreTwin rejected current stack {stack_id}")
+        return success
+
     def _terminate_launch_process(self, launch_file: str) -> None:
         """
         Terminate a launch process using Ros2LaunchParent.kill().
@@ -570,9 +622,13 @@ class MutoDefaultLaunchPlugin(BasePlugin):
 
 
 def main():
+    started = time.monotonic()
     rclpy.init()
     launch_plugin = MutoDefaultLaunchPlugin()
-    rclpy.spin(launch_plugin)
+    footprint = process_footprint(started)
+    launch_plugin.get_logger().info(f"Started in {footprint['startup_sec']}s, peak RSS {footprint['max_rss_mb']} MB")
+    # A second thread delivers service responses, e.g. of parameter changes, while a request is handled
+    rclpy.spin(launch_plugin, executor=MultiThreadedExecutor(num_threads=2))
     launch_plugin.destroy_node()
     if rclpy.ok():
         rclpy.shutdown()
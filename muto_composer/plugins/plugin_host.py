@@ -0,0 +1,81 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Single-process host for the Muto plugins.
+
+``plugin_host`` instantiates every plugin registered as a
+``muto_composer.plugins`` entry point (the compose, provision and launch
+plugins by default) in one interpreter and spins them on a shared
+``MultiThreadedExecutor``, instead of one process per plugin. ``launch``,
+``rclpy`` and the stack handlers are imported once. The services of each
+plugin are given their own ``MutuallyExclusiveCallbackGroup``, so a plugin
+handles one request at a time while the plugins serve requests concurrently. The startup time and peak
+RSS are logged, as they are by the single-plugin entry points, to compare
+both layouts.
+"""
+
+import time
+
+import rclpy
+from rclpy.callback_groups import MutuallyExclusiveCallbackGroup
+from rclpy.executors import MultiThreadedExecutor
+
+from muto_composer.plugins.in_process import discover_plugins
+from muto_composer.utils.metrics import process_footprint
+
+
+def create_plugins(factories: dict | None = None) -> dict:
+    """Instantiate the plugin nodes, by plugin name.
+
+    Args:
+        factories: Plugin name to a callable returning the plugin node class,
+            defaults to ``discover_plugins``.
+    """
+    if factories is None:
+        factories = discover_plugins()
+    return {
+        name: factory()(service_callback_group=MutuallyExclusiveCallbackGroup()) for name, factory in factories.items()
+    }
+
+
+def main(args=None):
+    started = time.monotonic()
+    rclpy.init(args=args)
+    plugins = create_plugins()
+
+    # One thread per plugin, plus one for their clients and timers
+    executor = MultiThreadedExecutor(num_threads=len(plugins) + 1)
+    for plugin in plugins.values():
+        executor.add_node(plugin)
+
+    footprint = process_footprint(started)
+    rclpy.logging.get_logger("plugin_host").info(
+        f"Hosting {', '.join(plugins)} in one process: started in {footprint['startup_sec']}s, "
+        f"peak RSS {footprint['max_rss_mb']} MB"
+    )
+
+    try:
+        executor.spin()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown()
+        for plugin in plugins.values():
+            plugin.destroy_node()
+        if rclpy.ok():
+            rclpy.shutdown()
+
+
+if __name__ == "__main__":
+    main()
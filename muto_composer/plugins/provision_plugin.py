@@ -11,18 +11,24 @@
 #   Composiv.ai - initial API and implementation
 #
 
+import time
+
 import rclpy
 from muto_msgs.srv import ProvisionPlugin
 
+from muto_composer.utils.metrics import process_footprint
+
 from .base_plugin import BasePlugin, StackOperation
 
 
 class MutoProvisionPlugin(BasePlugin):
     """Plugin for setting up the workspace (decode, extract, build, install dependencies, etc.)"""
 
-    def __init__(self):
-        super().__init__("provision_plugin")
-        self.provision_srv = self.create_service(ProvisionPlugin, "muto_provision", self.handle_provision)
+    def __init__(self, **kwargs):
+        super().__init__("provision_plugin", **kwargs)
+        self.provision_srv = self.create_service(
+            ProvisionPlugin, "muto_provision", self.handle_provision, callback_group=self.service_callback_group
+        )
 
     def handle_provision(self, request: ProvisionPlugin.Request, response: ProvisionPlugin.Response):
         """Service handler to prepare the workspace using double dispatch pattern."""
@@ -46,8 +52,11 @@ class MutoProvisionPlugin(BasePlugin):
 
 
 def main():
+    started = time.monotonic()
     rclpy.init()
     provision_plugin = MutoProvisionPlugin()
+    footprint = process_footprint(started)
+    provision_plugin.get_logger().info(f"Started in {footprint['startup_sec']}s, peak RSS {footprint['max_rss_mb']} MB")
     rclpy.spin(provision_plugin)
     provision_plugin.destroy_node()
     if rclpy.ok():
@@ -34,6 +34,7 @@ from muto_composer.plugins.base_plugin import (
     StackOperation,
     StackTypeHandler,
 )
+from muto_composer.state.blob_store import BlobStore
 from muto_composer.utils.paths import ARTIFACT_STATE_FILE, WORKSPACES_PATH
 
 
@@ -205,13 +206,34 @@ class ArchiveStackHandler(StackTypeHandler):
     def _prepare_archive(self, manifest: dict[str, Any], temp_dir: str) -> tuple[str, dict[str, Any]]:
         artifact = manifest.get("launch", {})
         data_b64 = artifact.get("data")
+        blob = artifact.get("blob")
         url = artifact.get("url")
         props = artifact.get("properties", {})
         metadata = manifest.get("metadata", {})
 
-        if not data_b64 and not url:
+        if not data_b64 and not blob and not url:
             raise ValueError("Artifact specification must include either 'data' or 'url'.")
 
+        if blob:
+            # Inline data spooled to the blob store at intake
+            filename = props.get("filename") or metadata.get("name") or "artifact.tar"
+            archive_path = os.path.join(temp_dir, filename)
+            digest = BlobStore(logger=self.logger).copy_to(blob, archive_path)
+
+            checksum = props.get("checksum")
+            algorithm = props.get("algorithm", "sha256")
+            if checksum:
+                self._verify_checksum(archive_path, checksum, algorithm)
+
+            metadata.update(
+                {
+                    "source": "inline",
+                    "data_sha256": digest,
+                }
+            )
+
+            return archive_path, metadata
+
         if data_b64:
             filename = props.get("filename") or metadata.get("name") or "artifact.tar"
             archive_path = os.path.join(temp_dir, filename)
@@ -20,6 +20,7 @@ from muto_composer.plugins.base_plugin import (
     StackOperation,
     StackTypeHandler,
 )
+from muto_composer.workflow.apply_planner import execute_plan, plan_apply
 from muto_composer.workflow.launcher import Ros2LaunchParent
 
 
@@ -29,7 +30,10 @@ class JsonStackHandler(StackTypeHandler):
     def __init__(self, logger=None):
         self.logger = logger
         self.is_up_to_date = False
-        self.managed_launchers = {}
+        # Launchers of each launched manifest, by manifest hash
+        self.managed_launchers: dict[str, list[Ros2LaunchParent]] = {}
+        # Manifest hash and launched Stack of each running stack, by stack name
+        self.live_stacks: dict[str, tuple[str, Stack]] = {}
 
     def can_handle(self, payload: dict[str, Any]) -> bool:
         """Check for stack/json content_type in properly defined solution."""
@@ -70,19 +74,31 @@ class JsonStackHandler(StackTypeHandler):
 
         # JSON stacks support launch operations
         # For stack/json, the launch data is inside the manifest
+        # Starting a running stack only restarts what changed or stopped running
+        live = self.live_stacks.get(self._stack_key(context))
+        launch_data = context.stack_data.get("launch")
+        if live and self.managed_launchers.get(live[0]) and launch_data:
+            return self._apply_incremental(context, live, launch_data, plugin)
 
         self._kill_json(context, plugin)
 
         launcher = Ros2LaunchParent([])
-        launch_data = context.stack_data.get("launch")
         if not launch_data:
             self.logger.error("No 'launch' section found in stack/json manifest")
             return False
         stack = Stack(manifest=launch_data)
         stack.launch(launcher)
-        self.managed_launchers[context.hash] = launcher
+        self._track(context, stack, [launcher])
         return True
 
+    @staticmethod
+    def _stack_key(context: StackContext) -> str:
+        return context.metadata.get("name") or context.name
+
+    def _track(self, context: StackContext, stack: Stack, launchers: list):
+        self.managed_launchers[context.hash] = launchers
+        self.live_stacks[self._stack_key(context)] = (context.hash, stack)
+
     def _kill_json(self, context: StackContext, plugin: BasePlugin) -> bool:
 
         # JSON stacks support launch operations
@@ -92,24 +108,47 @@ class JsonStackHandler(StackTypeHandler):
         #    self.logger.error("No 'launch' section found in stack/json manifest")
         #    return False
         # stack = Stack(manifest=launch_data)
-        launcher = self.managed_launchers.get(context.hash, None)
-        if launcher:
+        for launcher in self.managed_launchers.pop(context.hash, None) or []:
             launcher.kill()
-            self.managed_launchers.pop(context.hash, None)
+        live = self.live_stacks.get(self._stack_key(context))
+        if live and live[0] == context.hash:
+            self.live_stacks.pop(self._stack_key(context), None)
         return True
 
     def _apply_json(self, context: StackContext, plugin: BasePlugin) -> bool:
 
         # JSON stacks support launch operations
         # For stack/json, the launch data is inside the manifest
+        live = self.live_stacks.get(self._stack_key(context))
+        launchers = self.managed_launchers.get(live[0]) if live else None
+        launch_data = context.stack_data.get("launch")
+        if launchers and launch_data:
+            return self._apply_incremental(context, live, launch_data, plugin)
+
         self._kill_json(context, plugin)
 
         launcher = Ros2LaunchParent([])
-        launch_data = context.stack_data.get("launch")
         if not launch_data:
             self.logger.error("No 'launch' section found in stack/json manifest")
             return False
         stack = Stack(manifest=launch_data)
         stack.apply(launcher)
-        self.managed_launchers[context.hash] = launcher
+        self._track(context, stack, [launcher])
+        return True
+
+    def _apply_incremental(
+        self, context: StackContext, live: tuple[str, Stack], launch_data: dict, plugin: BasePlugin
+    ) -> bool:
+        """Apply a manifest to the running stack, touching only the nodes that changed."""
+        live_hash, live_stack = live
+        launchers = self.managed_launchers.pop(live_hash)
+        stack = Stack(manifest=launch_data)
+        plan = plan_apply(live_stack, stack)
+        if self.logger:
+            self.logger.info(
+                f"Apply plan for {self._stack_key(context)}: start={len(plan.start)} stop={len(plan.stop)} "
+                f"restart={len(plan.restart)} reconfigure={len(plan.reconfigure)} unchanged={len(plan.unchanged)}"
+            )
+
+        self._track(context, stack, execute_plan(plan, stack, launchers, node=plugin, logger=self.logger))
         return True
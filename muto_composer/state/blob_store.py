@@ -0,0 +1,217 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Content-addressed blob store for inline stack artifacts.
+
+Base64 ``launch.data`` of ``stack/archive`` manifests is decoded once at
+intake into ``$MUTO_ROOT/blobs`` and replaced in the manifest by a
+``launch.blob`` reference of the form ``{"digest": <sha256>, "size": <bytes>}``.
+Events, state files and plugin requests then carry the small reference
+instead of the artifact, and the archive handler reads it back from disk.
+
+The store keeps the most recently used blobs within ``max_entries`` and
+``max_bytes``. Blobs referenced by the current or previous stack of a tracked
+stack are never pruned, so a rollback can always restore its artifact.
+"""
+
+import base64
+import binascii
+import hashlib
+import os
+import tempfile
+from typing import Any
+
+from muto_composer.state.persistence import StatePersistence
+from muto_composer.utils.paths import get_blob_store_path
+
+ARCHIVE_CONTENT_TYPE = "stack/archive"
+
+
+class BlobStore:
+    """Stores artifact bytes in files named by their sha256 digest."""
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        max_entries: int = 64,
+        max_bytes: int = 1024 * 1024 * 1024,
+        logger=None,
+        persistence: StatePersistence | None = None,
+    ):
+        """
+        Args:
+            directory: Store directory, defaults to ``$MUTO_ROOT/blobs``.
+            max_entries: Number of blobs kept on disk, 0 keeps all of them.
+            max_bytes: Total size of the blobs kept on disk, 0 keeps all of them.
+            logger: Optional logger.
+            persistence: State persistence listing the stacks whose blobs are
+                kept, defaults to the state under ``$MUTO_ROOT``.
+        """
+        self.directory = directory or get_blob_store_path()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.logger = logger
+        self.persistence = persistence
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path_for(self, digest: str) -> str:
+        """Path of the file holding the blob with the given digest."""
+        return os.path.join(self.directory, digest)
+
+    def put(self, data: bytes) -> str:
+        """Store bytes and return their digest. Writing is skipped when the blob is already stored."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        if os.path.exists(path):
+            # Keep recently used blobs from being pruned
+            os.utime(path)
+            return digest
+
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._prune(keep=digest)
+        return digest
+
+    def copy_to(self, reference: dict[str, Any], destination: str) -> str:
+        """Copy a referenced blob to ``destination`` and return its digest.
+
+        The blob is copied to a temporary file next to ``destination``, which
+        replaces ``destination`` only once the copy matches the reference.
+
+        Raises:
+            ValueError: If the blob is missing or does not match its reference.
+        """
+        digest = reference.get("digest", "")
+        path = self.path_for(digest)
+        if not digest or not os.path.isfile(path):
+            raise ValueError(f"Artifact blob {digest or '<none>'} not found in {self.directory}")
+
+        hasher = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(destination)), suffix=".tmp")
+        try:
+            with open(path, "rb") as source, os.fdopen(fd, "wb") as target:
+                for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+                    size += len(chunk)
+                    target.write(chunk)
+
+            expected_size = reference.get("size")
+            if hasher.hexdigest() != digest or (expected_size is not None and size != expected_size):
+                raise ValueError(f"Artifact blob {digest} is corrupted")
+            os.replace(temp_path, destination)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        # Keep recently used blobs from being pruned
+        os.utime(path)
+        return digest
+
+    def _referenced_digests(self) -> set[str]:
+        """Digests of the blobs referenced by the current or previous stack of a tracked stack."""
+        if self.persistence is None:
+            self.persistence = StatePersistence(logger=self.logger)
+        digests = set()
+        for state in self.persistence.get_all_stack_states().values():
+            for stack in (state.current_stack, state.previous_stack):
+                digest = blob_digest(stack)
+                if digest:
+                    digests.add(digest)
+        return digests
+
+    def _within_limits(self, count: int, total: int) -> bool:
+        return (self.max_entries <= 0 or count <= self.max_entries) and (self.max_bytes <= 0 or total <= self.max_bytes)
+
+    def _prune(self, keep: str = ""):
+        if self.max_entries <= 0 and self.max_bytes <= 0:
+            return
+        try:
+            entries = [
+                (entry.name, entry.stat())
+                for entry in os.scandir(self.directory)
+                if entry.is_file() and not entry.name.endswith(".tmp")
+            ]
+            count = len(entries)
+            total = sum(stat.st_size for _, stat in entries)
+            if self._within_limits(count, total):
+                return
+
+            protected = self._referenced_digests()
+            protected.add(keep)
+            entries.sort(key=lambda entry: entry[1].st_mtime)
+            for name, stat in entries:
+                if self._within_limits(count, total):
+                    break
+                if name in protected:
+                    continue
+                os.remove(os.path.join(self.directory, name))
+                count -= 1
+                total -= stat.st_size
+        except OSError as e:
+            if self.logger:
+                self.logger.warning(f"Failed to prune blob store: {e}")
+
+
+def blob_digest(manifest: dict[str, Any] | None) -> str | None:
+    """Return the digest of the blob referenced by a manifest, None if it references none."""
+    if not isinstance(manifest, dict):
+        return None
+    launch = manifest.get("launch")
+    blob = launch.get("blob") if isinstance(launch, dict) else None
+    if isinstance(blob, dict) and isinstance(blob.get("digest"), str):
+        return blob["digest"]
+    return None
+
+
+def spool_inline_data(manifest: dict[str, Any], store: BlobStore) -> bool:
+    """Move the inline ``launch.data`` of an archive manifest into the blob store.
+
+    The manifest is modified in place. Data that is not valid base64 is left
+    inline so the archive handler reports it as before.
+
+    Returns:
+        bool: True if the data was spooled.
+    """
+    if not isinstance(manifest, dict):
+        return False
+    metadata = manifest.get("metadata")
+    launch = manifest.get("launch")
+    if not isinstance(metadata, dict) or metadata.get("content_type") != ARCHIVE_CONTENT_TYPE:
+        return False
+    if not isinstance(launch, dict) or not isinstance(launch.get("data"), str) or not launch["data"]:
+        return False
+
+    try:
+        data = base64.b64decode(launch["data"], validate=True)
+    except (binascii.Error, ValueError):
+        return False
+
+    try:
+        digest = store.put(data)
+    except OSError as e:
+        if store.logger:
+            store.logger.warning(f"Failed to spool artifact data, keeping it inline: {e}")
+        return False
+
+    del launch["data"]
+    launch["blob"] = {"digest": digest, "size": len(data)}
+    return True
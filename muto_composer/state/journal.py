@@ -0,0 +1,205 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Event journal for Muto Composer.
+
+Appends one NDJSON record per published event to rotating segment files
+under ``$MUTO_ROOT/journal`` so deployment timelines can be inspected and
+replayed. Records are written by a background thread and made durable with
+one fsync per batch (group commit), keeping the publishing thread off disk I/O.
+"""
+
+import glob
+import json
+import os
+import re
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from muto_composer.events import BaseComposeEvent
+from muto_composer.utils.paths import get_journal_path
+
+_SEGMENT_PATTERN = re.compile(r"^events-(\d{8})\.ndjson$")
+
+
+class EventJournal:
+    """
+    Append-only event journal with segment rotation and group-commit fsync.
+
+    Use ``append`` as an EventBus sink::
+
+        journal = EventJournal()
+        event_bus.add_sink(journal.append)
+    """
+
+    SEGMENT_TEMPLATE = "events-{index:08d}.ndjson"
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        max_segments: int = 16,
+        commit_interval: float = 0.05,
+        logger=None,
+    ):
+        """
+        Args:
+            directory: Journal directory, defaults to ``$MUTO_ROOT/journal``.
+            segment_max_bytes: Size after which a new segment is started.
+            max_segments: Number of segments kept on disk, 0 keeps all of them.
+            commit_interval: Seconds to gather records before a write and fsync.
+            logger: Optional logger.
+        """
+        self.directory = directory or get_journal_path()
+        self.segment_max_bytes = segment_max_bytes
+        self.max_segments = max_segments
+        self.commit_interval = commit_interval
+        self.logger = logger
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._condition = threading.Condition()
+        self._pending: list[str] = []
+        self._sequence = 0
+        self._durable_sequence = 0
+        self._closed = False
+
+        existing = list_segments(self.directory)
+        self._segment_index = _segment_index(existing[-1]) if existing else 1
+        self._fd = self._open_segment(self._segment_index)
+        self._segment_size = os.fstat(self._fd).st_size
+
+        self._writer = threading.Thread(target=self._write_loop, name="event_journal", daemon=True)
+        self._writer.start()
+
+    def append(self, event: BaseComposeEvent) -> int:
+        """Queue an event record for writing and return its sequence number."""
+        record = {"class": type(event).__name__, "wall_time": time.time(), "event": event.to_dict()}
+        with self._condition:
+            if self._closed:
+                return self._sequence
+            self._sequence += 1
+            record["seq"] = self._sequence
+            self._pending.append(json.dumps(record, default=str, separators=(",", ":")))
+            self._condition.notify_all()
+            return self._sequence
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every appended record has been written and fsynced."""
+        with self._condition:
+            target = self._sequence
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: self._durable_sequence >= target, timeout)
+
+    def close(self, timeout: float | None = 5.0):
+        """Flush pending records and stop the writer thread."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._writer.join(timeout)
+        os.close(self._fd)
+
+    def _segment_path(self, index: int) -> str:
+        return os.path.join(self.directory, self.SEGMENT_TEMPLATE.format(index=index))
+
+    def _open_segment(self, index: int) -> int:
+        return os.open(self._segment_path(index), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _write_loop(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._closed:
+                    # Group commit: give concurrent publishers a moment to join this batch
+                    self._condition.wait(self.commit_interval)
+                batch, self._pending = self._pending, []
+                batch_end = self._sequence
+                closing = self._closed
+
+            written = True
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except OSError as e:
+                    written = False
+                    if self.logger:
+                        self.logger.error(f"Failed to write event journal batch: {e}")
+
+            with self._condition:
+                if written:
+                    self._durable_sequence = batch_end
+                    self._condition.notify_all()
+                elif not closing:
+                    # Retry the failed records ahead of the ones appended since
+                    self._pending[:0] = batch
+                if closing and not self._pending:
+                    return
+
+    def _write_batch(self, batch: list[str]):
+        data = ("\n".join(batch) + "\n").encode("utf-8")
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+        self._segment_size += len(data)
+        os.fsync(self._fd)
+
+        if self._segment_size >= self.segment_max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        os.close(self._fd)
+        self._segment_index += 1
+        self._fd = self._open_segment(self._segment_index)
+        self._segment_size = 0
+
+        if self.max_segments > 0:
+            for path in list_segments(self.directory)[: -self.max_segments]:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    if self.logger:
+                        self.logger.warning(f"Failed to remove old journal segment {path}: {e}")
+
+
+def _segment_index(path: str) -> int:
+    match = _SEGMENT_PATTERN.match(os.path.basename(path))
+    return int(match.group(1)) if match else 0
+
+
+def list_segments(directory: str) -> list[str]:
+    """Return the journal segment files of a directory in write order."""
+    segments = [path for path in glob.glob(os.path.join(directory, "events-*.ndjson")) if _segment_index(path)]
+    return sorted(segments, key=_segment_index)
+
+
+def read_journal(directory: str | None = None) -> Iterator[dict[str, Any]]:
+    """Yield journal records in write order.
+
+    A partially written trailing line, e.g. after a power loss, is skipped.
+    """
+    for path in list_segments(directory or get_journal_path()):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
@@ -0,0 +1,206 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Content-addressed manifest store for Muto Composer.
+
+Stack manifests are written once under ``$MUTO_ROOT/manifests`` in canonical
+JSON form, named by their sha256 digest. The composer passes a small
+reference instead of the full manifest to the plugins, which read the file
+through a memory map and keep recently parsed manifests in an LRU cache.
+"""
+
+import copy
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from muto_composer.utils.hashing import canonical_json
+from muto_composer.utils.paths import get_manifest_store_path
+
+# Key of the reference object passed in StackManifest.stack instead of a manifest
+REFERENCE_KEY = "manifest_ref"
+
+# Stack strings longer than this cannot be references and are not inspected
+_MAX_REFERENCE_LENGTH = 1024
+
+
+def make_reference(digest: str, path: str) -> dict[str, Any]:
+    """Build the reference object of a stored manifest."""
+    return {REFERENCE_KEY: {"digest": digest, "path": path}}
+
+
+def parse_reference(stack: str | dict[str, Any] | None) -> dict[str, str] | None:
+    """Return the ``{digest, path}`` of a manifest reference, None for anything else."""
+    if isinstance(stack, str):
+        if len(stack) > _MAX_REFERENCE_LENGTH or REFERENCE_KEY not in stack:
+            return None
+        try:
+            stack = json.loads(stack)
+        except json.JSONDecodeError:
+            return None
+    if not isinstance(stack, dict) or len(stack) != 1:
+        return None
+    reference = stack.get(REFERENCE_KEY)
+    if isinstance(reference, dict) and reference.get("digest"):
+        return reference
+    return None
+
+
+class ManifestStore:
+    """
+    Content-addressed store of stack manifests with an LRU of parsed manifests.
+
+    ``get`` returns a deep copy so handlers may modify the manifest they are
+    given without corrupting the cache.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        cache_size: int = 32,
+        max_entries: int = 256,
+        logger=None,
+    ):
+        """
+        Args:
+            directory: Store directory, defaults to ``$MUTO_ROOT/manifests``.
+            cache_size: Number of parsed manifests kept in memory.
+            max_entries: Number of manifest files kept on disk, 0 keeps all of them.
+            logger: Optional logger.
+        """
+        self.directory = directory or get_manifest_store_path()
+        self.cache_size = cache_size
+        self.max_entries = max_entries
+        self.logger = logger
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, digest: str) -> str:
+        """Path of the file holding the manifest with the given digest."""
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def put(self, manifest: dict[str, Any]) -> str:
+        """Store a manifest and return its digest.
+
+        Writing is skipped when the manifest is already stored.
+        """
+        data = canonical_json(manifest).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+
+        if os.path.exists(path):
+            # Keep recently used manifests from being pruned
+            os.utime(path)
+        else:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+            except OSError:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self._prune()
+
+        self._remember(digest, manifest)
+        return digest
+
+    def get(self, digest: str, path: str | None = None) -> dict[str, Any] | None:
+        """Return a copy of the manifest with the given digest, None if it is not available.
+
+        Args:
+            digest: Digest of the manifest.
+            path: File to read when the manifest is not in this store, e.g. the
+                path recorded in a reference written by another process.
+        """
+        with self._lock:
+            manifest = self._cache.get(digest)
+            if manifest is not None:
+                self._cache.move_to_end(digest)
+                self.hits += 1
+                return copy.deepcopy(manifest)
+            self.misses += 1
+
+        manifest = self._load(self.path_for(digest), digest)
+        if manifest is None and path and path != self.path_for(digest):
+            manifest = self._load(path, digest)
+        if manifest is None:
+            return None
+
+        self._remember(digest, manifest)
+        return copy.deepcopy(manifest)
+
+    def resolve(self, stack: str | dict[str, Any] | None) -> dict[str, Any] | None:
+        """Resolve a manifest reference, None if ``stack`` is not a reference or cannot be resolved."""
+        reference = parse_reference(stack)
+        if reference is None:
+            return None
+        manifest = self.get(reference["digest"], reference.get("path"))
+        if manifest is None and self.logger:
+            self.logger.error(f"Manifest {reference['digest']} not found in manifest store")
+        return manifest
+
+    def _remember(self, digest: str, manifest: dict[str, Any]):
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[digest] = copy.deepcopy(manifest)
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _load(self, path: str, digest: str) -> dict[str, Any] | None:
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if hashlib.sha256(mapped).hexdigest() != digest:
+                        if self.logger:
+                            self.logger.error(f"Manifest file {path} does not match digest {digest}")
+                        return None
+                    return json.loads(mapped[:])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            if self.logger:
+                self.logger.warning(f"Failed to read manifest {digest} from {path}: {e}")
+            return None
+
+    def _prune(self):
+        if self.max_entries <= 0:
+            return
+        try:
+            entries = [
+                os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".json")
+            ]
+            if len(entries) <= self.max_entries:
+                return
+            entries.sort(key=os.path.getmtime)
+            for path in entries[: len(entries) - self.max_entries]:
+                os.remove(path)
+        except OSError as e:
+            if self.logger:
+                self.logger.warning(f"Failed to prune manifest store: {e}")
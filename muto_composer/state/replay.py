@@ -0,0 +1,256 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Replay driver for recorded event journals.
+
+Feeds the external inputs of a journal (stack requests and process crashes)
+back through StackAnalyzer, DeploymentOrchestrator and PipelineExecutor.
+Plugin services are replaced by stand-ins that reproduce the recorded
+pipeline outcomes, so field incidents can be reproduced and the event path
+benchmarked without robots, plugins or a twin.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import rclpy.logging
+
+from muto_composer.events import EventBus, EventType, PipelineRequestedEvent, event_from_dict
+from muto_composer.state.journal import read_journal
+from muto_composer.subsystems.orchestration_manager import OrchestrationManager
+from muto_composer.subsystems.pipeline_engine import PipelineExecutor, PipelineManager
+from muto_composer.subsystems.stack_manager import StackManager
+
+# Events that enter the composer from outside and are re-injected on replay
+INPUT_EVENT_TYPES = (EventType.STACK_REQUEST, EventType.PROCESS_CRASHED)
+
+# Events compared between the recording and the replay
+OUTCOME_EVENT_TYPES = (
+    EventType.ORCHESTRATION_COMPLETED,
+    EventType.ORCHESTRATION_FAILED,
+    EventType.ROLLBACK_COMPLETED,
+    EventType.ROLLBACK_FAILED,
+)
+
+
+class StandInPlugins:
+    """
+    Replaces plugin service calls during replay.
+
+    Each pipeline execution consumes the next recorded outcome of that
+    pipeline; executions without a recording succeed. ``step_latency`` adds an
+    artificial service time per step to model plugin work.
+    """
+
+    def __init__(self, step_latency: float = 0.0):
+        self.step_latency = step_latency
+        self._outcomes: dict[str, deque] = defaultdict(deque)
+        self.calls: list[tuple[str, str]] = []
+
+    def record_outcome(self, pipeline_name: str, success: bool, error: str = "", failure_step: str = ""):
+        """Queue the recorded outcome of one execution of a pipeline."""
+        self._outcomes[pipeline_name].append({"success": success, "error": error, "failure_step": failure_step})
+
+    def run(self, pipeline_name: str, step_names: Iterable[str]) -> dict[str, Any]:
+        """Simulate one pipeline execution and return its outcome."""
+        outcome = (
+            self._outcomes[pipeline_name].popleft()
+            if self._outcomes[pipeline_name]
+            else {"success": True, "error": "", "failure_step": ""}
+        )
+        for step_name in step_names:
+            self.calls.append((pipeline_name, step_name))
+            if self.step_latency:
+                time.sleep(self.step_latency)
+            if not outcome["success"] and step_name == outcome["failure_step"]:
+                break
+        return outcome
+
+
+class ReplayPipelineExecutor(PipelineExecutor):
+    """PipelineExecutor that runs pipelines against stand-in plugins."""
+
+    def __init__(self, event_bus: EventBus, pipeline_manager: PipelineManager, stand_ins: StandInPlugins, logger=None):
+        super().__init__(event_bus, pipeline_manager, logger)
+        self.stand_ins = stand_ins
+
+    def _execute_pipeline_real(self, pipeline, event: PipelineRequestedEvent, run=None) -> dict[str, Any]:
+        outcome = self.stand_ins.run(pipeline.name, self._extract_step_names(pipeline))
+        result = {
+            "success": outcome["success"],
+            "pipeline": pipeline.name,
+            "context": {},
+            "execution_context": event.execution_context,
+        }
+        if not outcome["success"]:
+            result["error"] = outcome["error"] or "Recorded pipeline failure"
+        return result
+
+
+class JournalReplayer:
+    """Replays a recorded journal through the composer event path."""
+
+    def __init__(
+        self,
+        records: list[dict[str, Any]],
+        pipeline_config_path: str | None = None,
+        stand_ins: StandInPlugins | None = None,
+        muto_root: str | None = None,
+        speed: float = 0.0,
+        logger=None,
+    ):
+        """
+        Args:
+            records: Journal records, e.g. ``list(read_journal(path))``.
+            pipeline_config_path: Pipeline configuration, defaults to the installed one.
+            stand_ins: Stand-in plugins, defaults to ones primed with the recorded outcomes.
+            muto_root: MUTO_ROOT used for state written during replay, defaults to a temporary directory.
+            speed: Replay speed relative to the recording, 0 replays as fast as possible.
+            logger: Optional logger.
+        """
+        self.records = records
+        self.speed = speed
+        self.logger = logger or rclpy.logging.get_logger("journal_replay")
+        self.stand_ins = stand_ins or self.stand_ins_from_records(records)
+
+        # Keep replayed state away from the real deployment state
+        self.muto_root = muto_root or tempfile.mkdtemp(prefix="muto_replay_")
+
+        self.event_bus = EventBus()
+        self.event_bus.set_logger(self.logger)
+        with self._replay_root():
+            self.stack_manager = StackManager(self.event_bus, self.logger)
+            self.orchestration_manager = OrchestrationManager(self.event_bus, self.logger)
+            self.pipeline_manager = PipelineManager(pipeline_config_path, self.logger)
+            self.pipeline_executor = ReplayPipelineExecutor(
+                self.event_bus, self.pipeline_manager, self.stand_ins, self.logger
+            )
+
+        self._outcomes: list[str] = []
+        self._outcomes_lock = threading.Lock()
+        for event_type in OUTCOME_EVENT_TYPES:
+            self.event_bus.subscribe(event_type, self._record_outcome)
+
+    @staticmethod
+    def stand_ins_from_records(records: list[dict[str, Any]]) -> StandInPlugins:
+        """Build stand-in plugins primed with the pipeline outcomes of a recording."""
+        stand_ins = StandInPlugins()
+        for record in records:
+            event = record.get("event", {})
+            if event.get("event_type") == EventType.PIPELINE_COMPLETED.value:
+                stand_ins.record_outcome(event.get("pipeline_name", ""), True)
+            elif event.get("event_type") == EventType.PIPELINE_FAILED.value:
+                stand_ins.record_outcome(
+                    event.get("pipeline_name", ""),
+                    False,
+                    error=str(event.get("error_details", {}).get("error", "")),
+                    failure_step=event.get("failure_step", ""),
+                )
+        return stand_ins
+
+    @contextlib.contextmanager
+    def _replay_root(self):
+        """Point MUTO_ROOT at the replay root, restoring the caller's value afterwards."""
+        previous = os.environ.get("MUTO_ROOT")
+        os.environ["MUTO_ROOT"] = self.muto_root
+        try:
+            yield
+        finally:
+            if previous is None:
+                os.environ.pop("MUTO_ROOT", None)
+            else:
+                os.environ["MUTO_ROOT"] = previous
+
+    def _record_outcome(self, event):
+        with self._outcomes_lock:
+            self._outcomes.append(event.event_type.value)
+
+    def run(self, timeout: float | None = 60.0) -> dict[str, Any]:
+        """Inject the recorded input events and return a replay report."""
+        input_types = {event_type.value for event_type in INPUT_EVENT_TYPES}
+        outcome_types = {event_type.value for event_type in OUTCOME_EVENT_TYPES}
+        inputs = [record for record in self.records if record.get("event", {}).get("event_type") in input_types]
+        recorded_outcomes = [
+            record["event"]["event_type"]
+            for record in self.records
+            if record.get("event", {}).get("event_type") in outcome_types
+        ]
+
+        started = time.monotonic()
+        previous_wall_time = None
+        with self._replay_root():
+            self.event_bus.start()
+            try:
+                for record in inputs:
+                    if self.speed > 0 and previous_wall_time is not None:
+                        time.sleep(max(0.0, (record["wall_time"] - previous_wall_time) / self.speed))
+                    previous_wall_time = record.get("wall_time")
+                    self.event_bus.publish_async(event_from_dict(record["class"], record["event"]))
+                idle = self.event_bus.wait_until_idle(timeout)
+            finally:
+                self.event_bus.stop()
+        elapsed = time.monotonic() - started
+
+        return {
+            "inputs_replayed": len(inputs),
+            "completed": idle,
+            "elapsed_sec": round(elapsed, 6),
+            "inputs_per_sec": round(len(inputs) / elapsed, 2) if elapsed > 0 else None,
+            "recorded_outcomes": recorded_outcomes,
+            "replayed_outcomes": list(self._outcomes),
+            "outcomes_match": recorded_outcomes == self._outcomes,
+            "stand_in_calls": len(self.stand_ins.calls),
+            "metrics": self.event_bus.metrics_snapshot(),
+        }
+
+
+def replay_journal(
+    journal_path: str,
+    pipeline_config_path: str | None = None,
+    speed: float = 0.0,
+    step_latency: float = 0.0,
+    output: Callable[[str], None] = print,
+) -> dict[str, Any]:
+    """Replay a journal directory and print the report as JSON."""
+    records = list(read_journal(journal_path))
+    stand_ins = JournalReplayer.stand_ins_from_records(records)
+    stand_ins.step_latency = step_latency
+    report = JournalReplayer(records, pipeline_config_path, stand_ins=stand_ins, speed=speed).run()
+    output(json.dumps(report, indent=2, default=str))
+    return report
+
+
+def main(args=None):
+    """Command line entry point for journal replay."""
+    parser = argparse.ArgumentParser(description="Replay a Muto Composer event journal")
+    parser.add_argument("journal", help="Journal directory containing events-*.ndjson segments")
+    parser.add_argument("--pipeline-config", default=None, help="Pipeline configuration file")
+    parser.add_argument("--speed", type=float, default=0.0, help="Replay speed factor, 0 for as fast as possible")
+    parser.add_argument("--step-latency", type=float, default=0.0, help="Simulated seconds per plugin step")
+    parsed = parser.parse_args(args)
+
+    report = replay_journal(parsed.journal, parsed.pipeline_config, parsed.speed, parsed.step_latency)
+    return 0 if report["completed"] and report["outcomes_match"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
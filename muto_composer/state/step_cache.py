@@ -0,0 +1,174 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Memoized pipeline step results for Muto Composer.
+
+Pipeline steps marked ``cache: true`` are treated as pure functions of their
+input manifest and the state of the stack's workspace. Successful results are
+stored under ``$MUTO_ROOT/step_cache``, keyed by step, plugin, service, the
+digest of the input manifest and a fingerprint of the workspace, so a change
+to the workspace makes earlier results unreachable. Least recently used
+entries are pruned.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any
+
+from muto_composer.utils.hashing import canonical_json, manifest_digest
+from muto_composer.utils.paths import ARTIFACT_STATE_FILE, get_step_cache_path, get_workspaces_path
+
+
+def workspace_fingerprint(stack_name: str) -> str:
+    """Return a fingerprint of a stack's workspace that changes when it is re-provisioned or removed."""
+    workspace_dir = os.path.join(get_workspaces_path(), stack_name.replace(" ", "_"))
+    if not os.path.isdir(workspace_dir):
+        return "absent"
+    try:
+        with open(os.path.join(workspace_dir, ARTIFACT_STATE_FILE), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return f"dir:{os.stat(workspace_dir).st_mtime_ns}"
+
+
+class StepCache:
+    """
+    On-disk LRU cache of successful step results.
+
+    Entries are JSON files named by their key. A hit refreshes the file's
+    modification time, and the oldest files are removed once there are more
+    than ``max_entries``.
+    """
+
+    def __init__(self, directory: str | None = None, max_entries: int = 256, logger=None):
+        """
+        Args:
+            directory: Cache directory, defaults to ``$MUTO_ROOT/step_cache``.
+            max_entries: Entries kept before the least recently used are removed, 0 keeps all.
+            logger: Optional logger.
+        """
+        self.directory = directory or get_step_cache_path()
+        self.max_entries = max_entries
+        self.logger = logger
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "invalidations": 0}
+
+    def key(self, step_name: str, plugin_name: str, service: str, input_fields: dict[str, Any]) -> str:
+        """Return the cache key of a step applied to an input manifest in the current workspace."""
+        return manifest_digest(
+            {
+                "step": step_name,
+                "plugin": plugin_name,
+                "service": service,
+                "input": manifest_digest(input_fields),
+                "workspace": workspace_fingerprint(str(input_fields.get("name", ""))),
+            }
+        )
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            self._counters[counter] += amount
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the stored result of a key, None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except (OSError, ValueError) as e:
+            if self.logger:
+                self.logger.warning(f"Ignoring unreadable step cache entry {path}: {e}")
+            self._count("misses")
+            return None
+        self._count("hits")
+        return entry.get("result")
+
+    def put(self, key: str, step_name: str, result: dict[str, Any]):
+        """Store the result of a successful step."""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(canonical_json({"step": step_name, "result": result}))
+            os.replace(temp_path, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            if self.logger:
+                self.logger.warning(f"Failed to cache result of step {step_name}: {e}")
+            return
+        self._count("stores")
+        self._prune()
+
+    def invalidate(self, step_name: str | None = None) -> int:
+        """Remove cached results and return how many were removed.
+
+        Args:
+            step_name: Step whose results are removed, all steps when None.
+        """
+        removed = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if step_name is not None:
+                    with open(path, encoding="utf-8") as f:
+                        if json.load(f).get("step") != step_name:
+                            continue
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                if self.logger:
+                    self.logger.warning(f"Failed to remove step cache entry {path}: {e}")
+        self._count("invalidations", removed)
+        return removed
+
+    def _prune(self):
+        if self.max_entries <= 0:
+            return
+        try:
+            entries = [
+                os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".json")
+            ]
+            if len(entries) <= self.max_entries:
+                return
+            entries.sort(key=os.path.getmtime)
+            for path in entries[: len(entries) - self.max_entries]:
+                os.remove(path)
+        except OSError as e:
+            if self.logger:
+                self.logger.warning(f"Failed to prune step cache: {e}")
+
+    def metrics_snapshot(self) -> dict[str, Any]:
+        """Return hit, miss, store and invalidation counts of this process."""
+        with self._lock:
+            snapshot = dict(self._counters)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_ratio"] = snapshot["hits"] / lookups if lookups else 0.0
+        return snapshot
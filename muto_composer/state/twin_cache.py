@@ -0,0 +1,195 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Twin stack definition cache for Muto Composer.
+
+Stack definitions fetched from CoreTwin are kept as files under
+``$MUTO_ROOT/twin_cache`` so the composer and the plugin processes share
+them: a deployment that resolves the same ``stackId`` in several processes
+costs one twin round-trip. Entries expire after a TTL, carry the revision
+they were fetched at, and are removed when the twin reports an update.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from muto_composer.utils.hashing import manifest_digest
+from muto_composer.utils.paths import get_twin_cache_path
+
+
+class TwinDefinitionCache:
+    """
+    File-backed cache of twin stack definitions keyed by stack id.
+
+    ``get_or_fetch`` holds a per-key file lock while fetching, so processes
+    resolving the same stack at the same time wait for one fetch instead of
+    each calling the twin.
+    """
+
+    def __init__(self, directory: str | None = None, ttl: float = 30.0, logger=None):
+        """
+        Args:
+            directory: Cache directory, defaults to ``$MUTO_ROOT/twin_cache``.
+            ttl: Seconds an entry is used before it is fetched again, 0 disables caching.
+            logger: Optional logger.
+        """
+        self.directory = directory or get_twin_cache_path()
+        self.ttl = ttl
+        self.logger = logger
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "fetches": 0, "invalidations": 0}
+
+    def _path(self, stack_id: str, suffix: str = ".json") -> str:
+        name = hashlib.sha256(stack_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + suffix)
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get(self, stack_id: str, revision: str | None = None) -> dict[str, Any] | None:
+        """Return the cached definition of a stack, None if it is missing, expired or of another revision."""
+        if self.ttl <= 0:
+            return None
+        manifest, outcome = self._lookup(stack_id, revision)
+        self._count(outcome)
+        return manifest
+
+    def _lookup(self, stack_id: str, revision: str | None) -> tuple[dict[str, Any] | None, str]:
+        try:
+            with open(self._path(stack_id), encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None, "misses"
+        except (OSError, ValueError) as e:
+            if self.logger:
+                self.logger.warning(f"Ignoring unreadable twin cache entry for {stack_id}: {e}")
+            return None, "misses"
+
+        if time.time() - entry.get("fetched_at", 0.0) > self.ttl:
+            return None, "expired"
+        if entry.get("stack_id") != stack_id or (revision is not None and entry.get("revision") != revision):
+            return None, "misses"
+        return entry.get("manifest"), "hits"
+
+    def put(self, stack_id: str, manifest: dict[str, Any], revision: str | None = None) -> str:
+        """Cache the definition of a stack and return its revision.
+
+        The canonical manifest digest is used as revision when the twin does not provide one.
+        """
+        revision = revision or manifest_digest(manifest)
+        if self.ttl <= 0:
+            return revision
+
+        entry = {"stack_id": stack_id, "revision": revision, "fetched_at": time.time(), "manifest": manifest}
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, self._path(stack_id))
+        except (OSError, TypeError, ValueError) as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            if self.logger:
+                self.logger.warning(f"Failed to cache twin definition of {stack_id}: {e}")
+        return revision
+
+    def get_or_fetch(
+        self, stack_id: str, fetch: Callable[[str], dict[str, Any] | None], revision: str | None = None
+    ) -> dict[str, Any] | None:
+        """Return the cached definition of a stack or fetch and cache it.
+
+        Args:
+            stack_id: Stack id, also passed to ``fetch``.
+            fetch: Function retrieving the definition from the twin, returning None on failure.
+            revision: Required revision, if known.
+        """
+        if self.ttl <= 0:
+            return self._fetch(stack_id, fetch, revision)
+        manifest = self.get(stack_id, revision)
+        if manifest is not None:
+            return manifest
+
+        with open(self._path(stack_id, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Another process may have fetched it while this one waited for the lock
+                manifest, _ = self._lookup(stack_id, revision)
+                if manifest is not None:
+                    return manifest
+                return self._fetch(stack_id, fetch, revision)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _fetch(self, stack_id: str, fetch: Callable[[str], dict[str, Any] | None], revision: str | None):
+        self._count("fetches")
+        manifest = fetch(stack_id)
+        if manifest:
+            self.put(stack_id, manifest, revision)
+        return manifest
+
+    def invalidate(self, stack_id: str | None = None, revision: str | None = None) -> int:
+        """Remove cached definitions and return how many were removed.
+
+        Args:
+            stack_id: Stack to remove, all stacks when None.
+            revision: Keep the entry if it already has this revision.
+        """
+        if stack_id is None:
+            paths = [
+                os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".json")
+            ]
+        else:
+            if revision is not None and self._cached_revision(stack_id) == revision:
+                return 0
+            paths = [self._path(stack_id)]
+
+        removed = 0
+        for path in paths:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                if self.logger:
+                    self.logger.warning(f"Failed to remove twin cache entry {path}: {e}")
+        with self._lock:
+            self._counters["invalidations"] += removed
+        return removed
+
+    def _cached_revision(self, stack_id: str) -> str | None:
+        try:
+            with open(self._path(stack_id), encoding="utf-8") as f:
+                return json.load(f).get("revision")
+        except (OSError, ValueError):
+            return None
+
+    def metrics_snapshot(self) -> dict[str, Any]:
+        """Return hit, miss, expiry, fetch and invalidation counts of this process."""
+        with self._lock:
+            snapshot = dict(self._counters)
+        lookups = snapshot["hits"] + snapshot["misses"] + snapshot["expired"]
+        snapshot["hit_ratio"] = snapshot["hits"] / lookups if lookups else 0.0
+        return snapshot
@@ -16,9 +16,15 @@ Digital twin integration subsystem for the refactored Muto Composer.
 Manages communication with CoreTwin services and digital twin synchronization.
 """
 
+import copy
+import json
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import Any
 
-import rclpy
 from muto_msgs.srv import CoreTwin
 from rclpy.callback_groups import ReentrantCallbackGroup
 from rclpy.node import Node
@@ -26,19 +32,218 @@ from rclpy.node import Node
 from muto_composer.events import (
     EventBus,
     EventType,
+    OrchestrationCompletedEvent,
+    OrchestrationFailedEvent,
     OrchestrationStartedEvent,
     StackAnalyzedEvent,
     StackRequestEvent,
+    TwinUpdateEvent,
 )
+from muto_composer.state.twin_cache import TwinDefinitionCache
+from muto_composer.utils.hashing import manifest_digest
+from muto_composer.utils.json_patch import make_patch
+
+
+class TwinSyncQueue:
+    """
+    Write-behind queue of twin state updates.
+
+    ``submit`` records the latest state of a twin and returns immediately.
+    A worker thread sends it at most once per ``min_interval`` per twin;
+    states submitted in the meantime replace the pending one. Once a twin
+    has acknowledged a state, later updates are sent as JSON Patch operations
+    against that state instead of the whole document. Failed sends are
+    retried with exponential backoff, keeping only the newest state, which
+    is sent in full.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, dict[str, Any], list[dict[str, Any]] | None], bool],
+        min_interval: float = 1.0,
+        max_backoff: float = 30.0,
+        logger=None,
+    ):
+        """
+        Args:
+            send: Called with the twin id, the full state and the patch against the
+                last acknowledged state (None for the first update). Returns
+                whether the twin accepted the update.
+            min_interval: Minimum seconds between two updates of one twin.
+            max_backoff: Maximum seconds between retries of a failed update.
+            logger: Optional logger.
+        """
+        self.send = send
+        self.min_interval = max(0.0, min_interval)
+        self.max_backoff = max_backoff
+        self.logger = logger
+
+        self._condition = threading.Condition()
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._acknowledged: dict[str, dict[str, Any]] = {}
+        self._next_send: dict[str, float] = {}
+        self._failures: dict[str, int] = {}
+        self._in_flight = 0
+        self._worker: threading.Thread | None = None
+        self._closed = False
+
+        self._counters = {
+            "submitted": 0,
+            "coalesced": 0,
+            "sent": 0,
+            "patches": 0,
+            "unchanged": 0,
+            "failed": 0,
+            "full_bytes": 0,
+            "sent_bytes": 0,
+        }
+
+    def submit(self, twin_id: str, state: dict[str, Any]) -> None:
+        """Queue the latest state of a twin, replacing a pending state of the same twin."""
+        with self._condition:
+            if self._closed:
+                return
+            self._counters["submitted"] += 1
+            if twin_id in self._pending:
+                self._counters["coalesced"] += 1
+            self._pending[twin_id] = copy.deepcopy(state)
+            self._ensure_worker()
+            self._condition.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until no update is pending or being sent."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+
+    def close(self, timeout: float | None = 5.0):
+        """Send pending updates once, ignoring the rate limit, and stop the worker."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def metrics_snapshot(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot of the sync counters."""
+        with self._condition:
+            snapshot = dict(self._counters)
+            snapshot["pending"] = len(self._pending)
+            snapshot["retrying"] = sum(1 for failures in self._failures.values() if failures)
+        return snapshot
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._send_loop, name="twin_sync", daemon=True)
+            self._worker.start()
+
+    def _send_loop(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    now = time.monotonic()
+                    due = [twin_id for twin_id in self._pending if self._next_send.get(twin_id, 0.0) <= now]
+                    if due:
+                        break
+                    next_due = min((self._next_send[twin_id] for twin_id in self._pending), default=None)
+                    self._condition.wait(None if next_due is None else next_due - now)
+                if self._closed:
+                    due = list(self._pending)
+                batch = [(twin_id, self._pending.pop(twin_id)) for twin_id in due]
+                self._in_flight += len(batch)
+                closing = self._closed
+
+            for twin_id, state in batch:
+                self._send_update(twin_id, state, retry=not closing)
+
+            if closing:
+                return
+
+    def _send_update(self, twin_id: str, state: dict[str, Any], retry: bool = True):
+        with self._condition:
+            acknowledged = self._acknowledged.get(twin_id)
+        patch = make_patch(acknowledged, state) if acknowledged is not None else None
+
+        if patch == []:
+            with self._condition:
+                self._counters["unchanged"] += 1
+                self._in_flight -= 1
+                self._condition.notify_all()
+            return
+
+        try:
+            accepted = bool(self.send(twin_id, state, patch))
+        except Exception as e:
+            accepted = False
+            if self.logger:
+                self.logger.warning(f"Failed to send twin update for {twin_id}: {e}")
+
+        with self._condition:
+            now = time.monotonic()
+            self._in_flight -= 1
+            if accepted:
+                self._acknowledged[twin_id] = state
+                self._failures[twin_id] = 0
+                self._next_send[twin_id] = now + self.min_interval
+                self._counters["sent"] += 1
+                self._counters["full_bytes"] += len(json.dumps(state, default=str))
+                self._counters["sent_bytes"] += len(json.dumps(patch if patch is not None else state, default=str))
+                if patch is not None:
+                    self._counters["patches"] += 1
+            else:
+                failures = self._failures.get(twin_id, 0) + 1
+                self._failures[twin_id] = failures
+                # The twin may have lost the acknowledged state, so the retry sends the full state
+                self._acknowledged.pop(twin_id, None)
+                self._counters["failed"] += 1
+                backoff = min(self.max_backoff, max(self.min_interval, 0.5) * 2 ** (failures - 1))
+                self._next_send[twin_id] = now + backoff
+                # A newer submitted state supersedes the failed one
+                if retry:
+                    self._pending.setdefault(twin_id, state)
+                if self.logger:
+                    self.logger.debug(f"Twin update for {twin_id} failed, retrying in {backoff:.1f}s")
+            self._condition.notify_all()
 
 
 class TwinServiceClient:
     """Manages communication with CoreTwin services."""
 
-    def __init__(self, node: Node, event_bus: EventBus, logger=None):
+    def __init__(
+        self,
+        node: Node,
+        event_bus: EventBus,
+        logger=None,
+        response_timeout: float = 5.0,
+        service_wait_timeout: float = 2.0,
+        availability_ttl: float = 30.0,
+        twin_cache: TwinDefinitionCache | None = None,
+        state_service: str | None = None,
+    ):
+        """
+        Args:
+            node: Node owning the service clients. It must be spun by an executor,
+                manifest requests wait for responses the executor delivers.
+            event_bus: Event bus to subscribe to.
+            logger: Optional logger.
+            response_timeout: Seconds to wait for CoreTwin responses.
+            service_wait_timeout: Seconds to wait for the service when it is not ready.
+            availability_ttl: Seconds a service availability check is reused.
+            twin_cache: Cache of desired stack definitions shared with the plugins.
+            state_service: Name of the CoreTwin service accepting twin state updates,
+                None leaves twin state updates disabled.
+        """
         self.node = node
         self.event_bus = event_bus
         self.logger = logger
+        self.response_timeout = response_timeout
+        self.service_wait_timeout = service_wait_timeout
+        self.availability_ttl = availability_ttl
+        self.twin_cache = twin_cache
+
+        self._availability_lock = threading.Lock()
+        self._service_available: bool | None = None
+        self._availability_expires = 0.0
 
         # Service clients for CoreTwin
         self.callback_group = ReentrantCallbackGroup()
@@ -47,9 +252,16 @@ class TwinServiceClient:
         self.core_twin_client = self.node.create_client(
             CoreTwin, "/core_twin/get_stack_definition", callback_group=self.callback_group
         )
+        # CoreTwin does not provide a twin state service itself, see update_twin_state
+        self.twin_state_client = (
+            self.node.create_client(CoreTwin, state_service, callback_group=self.callback_group)
+            if state_service
+            else None
+        )
 
         # Subscribe to events that require twin services
         self.event_bus.subscribe(EventType.STACK_REQUEST, self.handle_stack_request)
+        self.event_bus.subscribe(EventType.TWIN_UPDATE, self.handle_twin_update)
 
         if self.logger:
             self.logger.info("TwinServiceClient initialized")
@@ -74,14 +286,21 @@ class TwinServiceClient:
             if self.logger:
                 self.logger.error(f"Error handling stack request: {e}")
 
+    def handle_twin_update(self, event: TwinUpdateEvent):
+        """Drop cached stack definitions the twin reports as changed."""
+        if self.twin_cache is None:
+            return
+        data = event.data or {}
+        stack_id = data.get("stackId") or data.get("stack_id") or event.twin_id or None
+        removed = self.twin_cache.invalidate(stack_id, data.get("revision"))
+        if removed and self.logger:
+            self.logger.debug(f"Invalidated {removed} cached twin definition(s) for {stack_id or 'all stacks'}")
+
     def _handle_compose_request(self, event: StackRequestEvent):
         """Handle compose request by getting manifests."""
         try:
-            # Get real stack manifest first
-            real_manifest = self.get_real_stack_manifest(event.stack_name)
-
-            # Get desired stack manifest
-            desired_manifest = self.get_desired_stack_manifest(event.stack_name)
+            # Request the real and desired manifests together
+            real_manifest, desired_manifest = self.get_stack_manifests(event.stack_name)
 
             # If no desired manifest exists and we have a stack payload, create it
             if not desired_manifest and event.stack_payload:
@@ -164,76 +383,168 @@ class TwinServiceClient:
                 self.logger.error(f"Error processing decompose request: {e}")
 
     def get_desired_stack_manifest(self, stack_name: str) -> dict[str, Any] | None:
-        """Retrieve desired stack manifest from CoreTwin."""
+        """Retrieve desired stack manifest from the twin definition cache or CoreTwin."""
+        if self.twin_cache is not None:
+            return self.twin_cache.get_or_fetch(stack_name, self._fetch_desired_manifest)
+        return self._fetch_desired_manifest(stack_name)
+
+    def _fetch_desired_manifest(self, stack_name: str) -> dict[str, Any] | None:
+        return self._wait_for_manifest(self._request_manifest(stack_name, "desired"))
+
+    def get_real_stack_manifest(self, stack_name: str) -> dict[str, Any] | None:
+        """Retrieve real stack manifest from CoreTwin."""
+        # Prefix to indicate real manifest
+        return self._wait_for_manifest(self._request_manifest(f"real_{stack_name}", "real"))
+
+    def get_stack_manifests(self, stack_name: str) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+        """Retrieve the real and desired stack manifests with concurrent requests.
+
+        Returns:
+            tuple: The real and the desired manifest, None for each one that could not be retrieved.
+        """
+        desired_manifest = self.twin_cache.get(stack_name) if self.twin_cache is not None else None
+
+        real_future = self._request_manifest(f"real_{stack_name}", "real")
+        desired_future = self._request_manifest(stack_name, "desired") if desired_manifest is None else None
+        deadline = time.monotonic() + self.response_timeout
+
+        real_manifest = self._wait_for_manifest(real_future, deadline)
+        if desired_future is not None:
+            desired_manifest = self._wait_for_manifest(desired_future, deadline)
+            if desired_manifest and self.twin_cache is not None:
+                self.twin_cache.put(stack_name, desired_manifest)
+        return real_manifest, desired_manifest
+
+    def is_service_available(self) -> bool:
+        """Whether the CoreTwin service is available, using a cached result.
+
+        A known state is reused for ``availability_ttl`` seconds, so concurrent
+        requests share one availability check instead of each waiting for the service.
+        """
+        with self._availability_lock:
+            now = time.monotonic()
+            if self._service_available is not None and now < self._availability_expires:
+                return self._service_available
+
+            available = self.core_twin_client.service_is_ready() or self.core_twin_client.wait_for_service(
+                timeout_sec=self.service_wait_timeout
+            )
+            self._service_available = bool(available)
+            self._availability_expires = now + (
+                self.availability_ttl if available else min(self.availability_ttl, self.service_wait_timeout)
+            )
+            if not available and self.logger:
+                self.logger.warning("CoreTwin service not available")
+            return self._service_available
+
+    def _request_manifest(self, request_input: str, kind: str) -> Future | None:
+        """Send a CoreTwin request without waiting for its response.
+
+        The response is completed by the node's executor, the composer's node is
+        never spun from here.
+
+        Returns:
+            Future: Resolves to the parsed manifest or None, None if the service is not available.
+        """
         try:
-            if not self.core_twin_client.wait_for_service(timeout_sec=2.0):
-                if self.logger:
-                    self.logger.warning("CoreTwin service not available")
+            if not self.is_service_available():
                 return None
 
             request = CoreTwin.Request()
-            request.input = stack_name
+            request.input = request_input
 
-            future = self.core_twin_client.call_async(request)
-            rclpy.spin_until_future_complete(self.node, future, timeout_sec=5.0)
+            result: Future = Future()
 
-            if future.result():
-                response = future.result()
-                if response.success:
-                    if self.logger:
-                        self.logger.debug(f"Retrieved desired manifest for stack: {stack_name}")
-                    import json
+            def _cb(done):
+                self._complete_manifest_request(done, result, request_input, kind)
 
-                    return json.loads(response.output) if response.output else {}
-                else:
-                    if self.logger:
-                        self.logger.warning(f"Failed to get desired manifest: {response.message}")
+            self.core_twin_client.call_async(request).add_done_callback(_cb)
+            return result
 
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error getting {kind} stack manifest: {e}")
             return None
 
+    def _complete_manifest_request(self, ros_future, result: Future, request_input: str, kind: str):
+        """Translate a CoreTwin response into the manifest of the request future."""
+        manifest = None
+        try:
+            response = ros_future.result()
+            if response and response.success:
+                if self.logger:
+                    self.logger.debug(f"Retrieved {kind} manifest for: {request_input}")
+                manifest = json.loads(response.output) if response.output else {}
+            elif response and self.logger:
+                self.logger.warning(f"Failed to get {kind} manifest: {response.message}")
         except Exception as e:
             if self.logger:
-                self.logger.error(f"Error getting desired stack manifest: {e}")
+                self.logger.error(f"Error getting {kind} stack manifest: {e}")
+        finally:
+            result.set_result(manifest)
+
+    def _wait_for_manifest(self, future: Future | None, deadline: float | None = None) -> dict[str, Any] | None:
+        """Wait for a manifest request until its response timeout or a shared deadline."""
+        if future is None:
+            return None
+        if deadline is None:
+            deadline = time.monotonic() + self.response_timeout
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            if self.logger:
+                self.logger.warning("Timed out waiting for CoreTwin response")
             return None
 
-    def get_real_stack_manifest(self, stack_name: str) -> dict[str, Any] | None:
-        """Retrieve real stack manifest from CoreTwin."""
+    def update_twin_state(self, twin_id: str, state: dict[str, Any], patch: list[dict[str, Any]] | None = None) -> bool:
+        """Send a twin state update to CoreTwin and wait for its acknowledgement.
+
+        The request input is ``{"twin_id": ..., "patch": [...]}`` when a JSON
+        Patch against the last acknowledged state is given, otherwise
+        ``{"twin_id": ..., "state": {...}}``. The service must apply the patch
+        to the last state it acknowledged and answer with ``success``. Returns
+        False without waiting when no state service is configured or it is not
+        ready, so callers can retry later.
+        """
         try:
-            if not self.core_twin_client.wait_for_service(timeout_sec=2.0):
-                if self.logger:
-                    self.logger.warning("CoreTwin service not available")
-                return None
+            if self.twin_state_client is None or not self.twin_state_client.service_is_ready():
+                return False
 
             request = CoreTwin.Request()
-            request.input = f"real_{stack_name}"  # Prefix to indicate real manifest
-
-            future = self.core_twin_client.call_async(request)
-            rclpy.spin_until_future_complete(self.node, future, timeout_sec=5.0)
+            body: dict[str, Any] = {"twin_id": twin_id}
+            if patch is not None:
+                body["patch"] = patch
+            else:
+                body["state"] = state
+            request.input = json.dumps(body, default=str)
 
-            if future.result():
-                response = future.result()
-                if response.success:
-                    if self.logger:
-                        self.logger.debug(f"Retrieved real manifest for stack: {stack_name}")
-                    import json
+            result: Future = Future()
 
-                    return json.loads(response.output) if response.output else {}
-                else:
-                    if self.logger:
-                        self.logger.warning(f"Failed to get real manifest: {response.message}")
+            def _cb(done):
+                try:
+                    result.set_result(bool(getattr(done.result(), "success", False)))
+                except Exception as e:
+                    result.set_exception(e)
 
-            return None
+            self.twin_state_client.call_async(request).add_done_callback(_cb)
+            return bool(result.result(timeout=self.response_timeout))
 
+        except FutureTimeoutError:
+            if self.logger:
+                self.logger.warning(f"Timed out updating twin state of {twin_id}")
+            return False
         except Exception as e:
             if self.logger:
-                self.logger.error(f"Error getting real stack manifest: {e}")
-            return None
+                self.logger.warning(f"Error updating twin state of {twin_id}: {e}")
+            return False
 
     def create_desired_stack_manifest(self, stack_name: str, manifest_data: dict[str, Any]) -> bool:
         """Create desired stack manifest in CoreTwin (stub implementation)."""
         try:
             # For now, this is a stub implementation since we don't have a separate service
             # In a full implementation, this would use a dedicated creation service
+            if self.twin_cache is not None:
+                self.twin_cache.invalidate(stack_name)
             if self.logger:
                 self.logger.info(f"Would create desired manifest for stack: {stack_name}")
                 self.logger.debug(f"Manifest data keys: {list(manifest_data.keys())}")
@@ -248,13 +559,34 @@ class TwinServiceClient:
 class TwinSynchronizer:
     """Manages digital twin synchronization and state consistency."""
 
-    def __init__(self, event_bus: EventBus, twin_client: TwinServiceClient, logger=None):
+    def __init__(
+        self,
+        event_bus: EventBus,
+        twin_client: TwinServiceClient,
+        logger=None,
+        sync_queue: TwinSyncQueue | None = None,
+        state_sync: bool = False,
+    ):
+        """
+        Args:
+            event_bus: Event bus to subscribe to.
+            twin_client: Client of the CoreTwin services.
+            logger: Optional logger.
+            sync_queue: Queue sending stack states to the twin.
+            state_sync: Whether stack states are sent to the twin, which requires
+                the twin state service of ``twin_client``.
+        """
         self.event_bus = event_bus
         self.twin_client = twin_client
         self.logger = logger
+        self.state_sync = state_sync
+        # Stack state reaches the twin write-behind, as deltas, at a limited rate
+        self.sync_queue = sync_queue or TwinSyncQueue(twin_client.update_twin_state, logger=logger)
 
         # Subscribe to events that require synchronization
         self.event_bus.subscribe(EventType.ORCHESTRATION_STARTED, self.handle_orchestration_started)
+        self.event_bus.subscribe(EventType.ORCHESTRATION_COMPLETED, self.handle_orchestration_completed)
+        self.event_bus.subscribe(EventType.ORCHESTRATION_FAILED, self.handle_orchestration_failed)
 
         # Track synchronization state
         self.sync_state: dict[str, dict[str, Any]] = {}
@@ -330,6 +662,29 @@ class TwinSynchronizer:
                 self.sync_state[event.correlation_id]["status"] = "error"
                 self.sync_state[event.correlation_id]["error"] = str(e)
 
+    def handle_orchestration_completed(self, event: OrchestrationCompletedEvent):
+        """Queue the state of a deployed stack for the twin."""
+        if not self.state_sync or not event.stack_name:
+            return
+        summary = event.execution_summary or {}
+        if summary.get("skipped"):
+            return
+        twin_data = self._extract_twin_data_from_stack(event.final_stack_state or {})
+        twin_data.setdefault("stack_name", event.stack_name)
+        twin_data["status"] = summary.get("status", "success")
+        if event.final_stack_state:
+            twin_data["manifest_digest"] = manifest_digest(event.final_stack_state)
+        self.sync_queue.submit(twin_data.pop("twin_id", event.stack_name), twin_data)
+
+    def handle_orchestration_failed(self, event: OrchestrationFailedEvent):
+        """Queue the failed state of a stack for the twin."""
+        if not self.state_sync or not event.stack_name:
+            return
+        self.sync_queue.submit(
+            event.stack_name,
+            {"stack_name": event.stack_name, "status": "failed", "failed_step": event.failed_step},
+        )
+
     def get_sync_status(self, correlation_id: str) -> dict[str, Any] | None:
         """Get synchronization status for a correlation ID."""
         return self.sync_state.get(correlation_id)
@@ -362,12 +717,13 @@ class TwinSynchronizer:
                 self.logger.error(f"Error handling deployment status event: {e}")
 
     async def sync_stack_state_to_twin(self, twin_id: str, stack_data: dict[str, Any]) -> bool:
-        """Synchronize stack state to digital twin."""
+        """Queue stack state for the digital twin; it is sent write-behind by the sync queue."""
+        if not self.state_sync:
+            return False
         try:
-            # This would call the twin service client to update the twin
-            # For now, return success to satisfy tests
             if self.logger:
                 self.logger.info(f"Syncing stack state to twin {twin_id}")
+            self.sync_queue.submit(twin_id, stack_data)
             return True
         except Exception as e:
             if self.logger:
@@ -392,14 +748,37 @@ class TwinSynchronizer:
 class DigitalTwinIntegration:
     """Main digital twin integration subsystem coordinator."""
 
-    def __init__(self, node: Node, event_bus: EventBus, logger=None):
+    def __init__(
+        self,
+        node: Node,
+        event_bus: EventBus,
+        logger=None,
+        twin_cache: TwinDefinitionCache | None = None,
+        sync_interval: float = 1.0,
+        state_service: str | None = None,
+    ):
+        """
+        Args:
+            node: Node owning the CoreTwin service clients.
+            event_bus: Event bus to subscribe to.
+            logger: Optional logger.
+            twin_cache: Cache of desired stack definitions shared with the plugins.
+            sync_interval: Minimum seconds between two state updates of one twin.
+            state_service: CoreTwin service accepting twin state updates. Stack
+                states are only sent to the twin when it is given.
+        """
         self.node = node
         self.event_bus = event_bus
         self.logger = logger
 
         # Initialize components
-        self.twin_client = TwinServiceClient(node, event_bus, logger)
-        self.synchronizer = TwinSynchronizer(event_bus, self.twin_client, logger)
+        self.twin_client = TwinServiceClient(
+            node, event_bus, logger, twin_cache=twin_cache, state_service=state_service or None
+        )
+        self.sync_queue = TwinSyncQueue(self.twin_client.update_twin_state, min_interval=sync_interval, logger=logger)
+        self.synchronizer = TwinSynchronizer(
+            event_bus, self.twin_client, logger, sync_queue=self.sync_queue, state_sync=bool(state_service)
+        )
 
         if self.logger:
             self.logger.info("DigitalTwinIntegration subsystem initialized")
@@ -425,6 +804,10 @@ class DigitalTwinIntegration:
         """Legacy interface: Create desired stack manifest."""
         return self.twin_client.create_desired_stack_manifest(stack_name, manifest_data)
 
+    def close(self, timeout: float | None = 5.0):
+        """Send pending twin updates once and stop the sync queue."""
+        self.sync_queue.close(timeout)
+
     def enable(self):
         """Enable digital twin integration."""
         if self.logger:
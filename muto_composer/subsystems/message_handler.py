@@ -17,6 +17,9 @@ Manages all ROS 2 communication including topics, services, and publishers.
 """
 
 import json
+import threading
+import time
+import uuid
 from typing import Any
 
 from muto_msgs.msg import MutoAction
@@ -25,33 +28,206 @@ from rclpy.node import Node
 from std_msgs.msg import String
 
 from muto_composer.events import EventBus, EventType, StackRequestEvent
+from muto_composer.state.blob_store import BlobStore, spool_inline_data
+from muto_composer.utils.hashing import is_stack_reference, manifest_digest
+
+
+def requested_stack_name(payload: Any) -> str | None:
+    """Return the stack a request payload names, None if it names none.
+
+    The name is read from ``value.stackId``, ``stackId``, ``metadata.name``
+    and the top-level ``name``, in that order.
+    """
+    if not isinstance(payload, dict):
+        return None
+    value = payload.get("value")
+    metadata = payload.get("metadata")
+    candidates = (
+        value.get("stackId") if isinstance(value, dict) else None,
+        payload.get("stackId"),
+        metadata.get("name") if isinstance(metadata, dict) else None,
+        payload.get("name"),
+    )
+    return next((name for name in candidates if isinstance(name, str) and name), None)
+
+
+def stack_request_coalesce_key(event: StackRequestEvent) -> str | None:
+    """Coalescing key of stack requests: the stack the payload names.
+
+    Requests whose payload names no stack are keyed by their unique
+    correlation id, so they never replace each other.
+    """
+    return requested_stack_name(event.stack_payload) or event.correlation_id
+
+
+class StackAdmissionQueue:
+    """
+    Admission layer in front of StackRequestEvent publishing.
+
+    Keeps at most one pending request per stack name. The first request for a
+    stack opens a debounce window; requests for the same stack arriving inside
+    the window supersede the pending one, and only the newest is published
+    when the window closes. Requests whose payload names no stack, and all
+    requests with a zero window, are published immediately.
+    """
+
+    def __init__(self, event_bus: EventBus, debounce_sec: float = 0.0, logger=None):
+        """
+        Args:
+            event_bus: Event bus that admitted requests are published to.
+            debounce_sec: Seconds a request is held for newer requests of the same stack.
+            logger: Optional logger.
+        """
+        self.event_bus = event_bus
+        self.debounce_sec = max(0.0, debounce_sec)
+        self.logger = logger
+
+        self._condition = threading.Condition()
+        self._pending: dict[str, tuple[float, StackRequestEvent]] = {}
+        self._worker: threading.Thread | None = None
+        self._closed = False
+
+        self.received = 0
+        self.admitted = 0
+        self.coalesced = 0
+        self._coalesced_by_stack: dict[str, int] = {}
+
+    def submit(self, event: StackRequestEvent) -> None:
+        """Admit a stack request, superseding a pending request for the same stack."""
+        # A fallback stack name is not a stack, so unnamed requests are never coalesced
+        stack_name = requested_stack_name(event.stack_payload)
+        with self._condition:
+            self.received += 1
+            if self.debounce_sec <= 0.0 or self._closed or stack_name is None:
+                self.admitted += 1
+                publish_now = True
+            else:
+                publish_now = False
+                pending = self._pending.get(stack_name)
+                if pending is not None:
+                    deadline, superseded = pending
+                    self.coalesced += 1
+                    self._coalesced_by_stack[stack_name] = self._coalesced_by_stack.get(stack_name, 0) + 1
+                    if self.logger:
+                        self.logger.info(
+                            f"Superseding pending {superseded.action} request for {stack_name} with {event.action}"
+                        )
+                else:
+                    deadline = time.monotonic() + self.debounce_sec
+                self._pending[stack_name] = (deadline, event)
+                self._ensure_worker()
+                self._condition.notify_all()
+
+        if publish_now:
+            self._publish(event)
+
+    def flush(self) -> int:
+        """Publish every pending request now and return how many were published."""
+        with self._condition:
+            released = [event for _deadline, event in self._pending.values()]
+            self._pending.clear()
+            self.admitted += len(released)
+        for event in released:
+            self._publish(event)
+        return len(released)
+
+    def close(self, timeout: float | None = 5.0):
+        """Publish pending requests and stop the release thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+        self.flush()
+
+    def pending_count(self) -> int:
+        """Number of requests currently held in the debounce window."""
+        with self._condition:
+            return len(self._pending)
+
+    def metrics_snapshot(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot of the admission counters."""
+        with self._condition:
+            return {
+                "debounce_sec": self.debounce_sec,
+                "received": self.received,
+                "admitted": self.admitted,
+                "coalesced": self.coalesced,
+                "coalesced_by_stack": dict(self._coalesced_by_stack),
+                "pending": len(self._pending),
+            }
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._release_loop, name="stack_admission", daemon=True)
+            self._worker.start()
+
+    def _release_loop(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    now = time.monotonic()
+                    due = [name for name, (deadline, _event) in self._pending.items() if deadline <= now]
+                    if due:
+                        break
+                    next_deadline = min((deadline for deadline, _event in self._pending.values()), default=None)
+                    self._condition.wait(None if next_deadline is None else next_deadline - now)
+                if self._closed:
+                    return
+                released = [self._pending.pop(name)[1] for name in due]
+                self.admitted += len(released)
+
+            for event in released:
+                self._publish(event)
+
+    def _publish(self, event: StackRequestEvent):
+        try:
+            self.event_bus.publish_async(event)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error publishing admitted stack request for {event.stack_name}: {e}")
 
 
 class MessageRouter:
     """Routes incoming messages to appropriate handlers via events."""
 
-    def __init__(self, event_bus: EventBus, logger=None):
+    def __init__(
+        self,
+        event_bus: EventBus,
+        logger=None,
+        admission: StackAdmissionQueue | None = None,
+        blob_store: BlobStore | None = None,
+    ):
         self.event_bus = event_bus
         self.logger = logger
+        # Without an explicit admission queue requests are published as they arrive
+        self.admission = admission or StackAdmissionQueue(event_bus, logger=logger)
+        # Without a blob store inline artifact data stays in the manifest
+        self.blob_store = blob_store
 
     def route_muto_action(self, action: MutoAction) -> None:
         """Route MutoAction to orchestration manager via events."""
         try:
             payload = json.loads(action.payload)
-            stack_name = self._extract_stack_name(payload, f"unknown:{action.method}")
+            correlation_id = str(uuid.uuid4())
+            # Unnamed requests get their own correlation id as stack name instead of a shared bucket
+            stack_name = self._extract_stack_name(payload, correlation_id)
 
             event = StackRequestEvent(
                 event_type=EventType.STACK_REQUEST,
                 source_component="message_router",
+                correlation_id=correlation_id,
                 stack_name=stack_name,
                 action=action.method,
                 stack_payload=payload,
+                metadata=self.intake_metadata(payload, self.blob_store),
             )
 
             if self.logger:
                 self.logger.info(f"Routing {action.method} action via event system")
 
-            self.event_bus.publish_sync(event)
+            self.admission.submit(event)
 
         except json.JSONDecodeError as e:
             if self.logger:
@@ -60,18 +236,26 @@ class MessageRouter:
             if self.logger:
                 self.logger.error(f"Error routing MutoAction: {e}")
 
-    def _extract_stack_name(self, payload: dict[str, Any], default_name: str) -> str:
-        """Extract stack name from payload."""
-        # Try to extract from value key
-        if "value" in payload and "stackId" in payload["value"]:
-            return payload["value"]["stackId"]
+    @staticmethod
+    def intake_metadata(payload: dict[str, Any], blob_store: BlobStore | None = None) -> dict[str, Any]:
+        """Build the request metadata of a payload at intake.
+
+        Pops the ``force`` flag from the payload, spools inline archive data
+        to ``blob_store`` when given, and records the canonical manifest
+        digest used to skip re-deployments of an unchanged manifest.
+        """
+        if not isinstance(payload, dict):
+            return {}
+        metadata = {"force": bool(payload.pop("force", False))}
+        if blob_store is not None:
+            spool_inline_data(payload, blob_store)
+        if not is_stack_reference(payload):
+            metadata["manifest_digest"] = manifest_digest(payload)
+        return metadata
 
-        # Try to extract from metadata
-        if "metadata" in payload and "name" in payload["metadata"]:
-            return payload["metadata"]["name"]
-
-        # Return default if not found
-        return default_name
+    def _extract_stack_name(self, payload: dict[str, Any], default_name: str) -> str:
+        """Extract stack name from payload, see ``requested_stack_name``."""
+        return requested_stack_name(payload) or default_name
 
 
 class PublisherManager:
@@ -106,13 +290,17 @@ class PublisherManager:
 class ServiceClientManager:
     """Manages service client connections and calls."""
 
-    def __init__(self, node: Node, core_twin_node_name: str = "core_twin"):
+    def __init__(self, node: Node, core_twin_node_name: str = "core_twin", callback_group=None):
         self.node = node
         self.logger = node.get_logger()
 
         # Initialize service clients
-        self.get_stack_client = node.create_client(CoreTwin, f"{core_twin_node_name}/get_stack_definition")
-        self.set_stack_client = node.create_client(CoreTwin, f"{core_twin_node_name}/set_current_stack")
+        self.get_stack_client = node.create_client(
+            CoreTwin, f"{core_twin_node_name}/get_stack_definition", callback_group=callback_group
+        )
+        self.set_stack_client = node.create_client(
+            CoreTwin, f"{core_twin_node_name}/set_current_stack", callback_group=callback_group
+        )
 
     async def get_stack_definition(self, stack_id: str) -> dict[str, Any] | None:
         """Retrieve stack definition from twin service."""
@@ -157,15 +345,25 @@ class ServiceClientManager:
 class MessageHandler:
     """Main message handling subsystem coordinator."""
 
-    def __init__(self, node: Node, event_bus: EventBus, core_twin_node_name: str = "core_twin"):
+    def __init__(
+        self,
+        node: Node,
+        event_bus: EventBus,
+        core_twin_node_name: str = "core_twin",
+        admission: StackAdmissionQueue | None = None,
+        blob_store: BlobStore | None = None,
+        callback_group=None,
+        client_callback_group=None,
+    ):
         self.node = node
         self.event_bus = event_bus
         self.logger = node.get_logger()
+        self.callback_group = callback_group
 
         # Initialize components
-        self.router = MessageRouter(event_bus, self.logger)
+        self.router = MessageRouter(event_bus, self.logger, admission, blob_store)
         self.publisher_manager = PublisherManager(node)
-        self.service_manager = ServiceClientManager(node, core_twin_node_name)
+        self.service_manager = ServiceClientManager(node, core_twin_node_name, callback_group=client_callback_group)
         # Add alias for compatibility
         self.service_client_manager = self.service_manager
 
@@ -180,7 +378,9 @@ class MessageHandler:
         stack_topic = self.node.get_parameter("stack_topic").get_parameter_value().string_value
 
         # Subscribe to MutoAction messages
-        self.node.create_subscription(MutoAction, stack_topic, self._muto_action_callback, 10)
+        self.node.create_subscription(
+            MutoAction, stack_topic, self._muto_action_callback, 10, callback_group=self.callback_group
+        )
 
         self.logger.info(f"Subscribed to {stack_topic} for MutoAction messages")
 
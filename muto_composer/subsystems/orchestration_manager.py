@@ -16,7 +16,12 @@ Orchestration management subsystem for the refactored Muto Composer.
 Handles high-level deployment workflows and coordination.
 """
 
+import threading
+import time
 import uuid
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
@@ -36,6 +41,11 @@ from muto_composer.events import (
 )
 from muto_composer.state.persistence import StatePersistence
 from muto_composer.subsystems.stack_manager import StackType
+from muto_composer.utils.hashing import manifest_digest
+from muto_composer.utils.metrics import DurationStats
+
+# Actions that deploy a manifest and can be skipped when it is already running
+DEPLOY_ACTIONS = ("start", "apply")
 
 
 @dataclass
@@ -155,12 +165,92 @@ class ExecutionPathDeterminer:
             )
 
 
+class StackScheduler:
+    """
+    Runs work for different stacks in parallel while keeping each stack in order.
+
+    Work submitted for a stack key is queued behind earlier work for the same
+    key; keys without pending work are handed to the next free worker.
+    """
+
+    def __init__(self, max_workers: int = 4, logger=None):
+        """
+        Args:
+            max_workers: Number of worker threads, i.e. stacks deployed concurrently.
+            logger: Optional logger.
+        """
+        self.max_workers = max_workers
+        self.logger = logger
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stack_scheduler")
+        self._condition = threading.Condition()
+        self._queues: dict[str, deque] = {}
+
+    def submit(self, key: str, fn: Callable[..., Any], *args) -> None:
+        """Queue ``fn(*args)`` to run after all earlier work submitted for ``key``."""
+        with self._condition:
+            queue = self._queues.get(key)
+            if queue is not None:
+                # The key already has a worker draining its queue
+                queue.append((fn, args))
+                return
+            self._queues[key] = deque([(fn, args)])
+        self._executor.submit(self._run_next, key)
+
+    def pending(self) -> dict[str, int]:
+        """Number of queued or running work items per stack key."""
+        with self._condition:
+            return {key: len(queue) for key, queue in self._queues.items()}
+
+    def wait_until_idle(self, timeout: float | None = None) -> bool:
+        """Block until no work is queued or running."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queues, timeout)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and optionally wait for running work to finish."""
+        self._executor.shutdown(wait=wait)
+
+    def _run_next(self, key: str):
+        with self._condition:
+            fn, args = self._queues[key][0]
+        try:
+            fn(*args)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Scheduled work for stack {key} failed: {e}")
+        finally:
+            with self._condition:
+                queue = self._queues[key]
+                queue.popleft()
+                if not queue:
+                    del self._queues[key]
+                    self._condition.notify_all()
+                    reschedule = False
+                else:
+                    reschedule = True
+            if reschedule:
+                # Resubmit instead of looping so busy stacks do not starve the others
+                self._executor.submit(self._run_next, key)
+
+
 class DeploymentOrchestrator:
     """Orchestrates complete deployment workflows with rollback support."""
 
-    def __init__(self, event_bus: EventBus, logger=None):
+    def __init__(
+        self, event_bus: EventBus, logger=None, scheduler: StackScheduler | None = None, pipeline_executor=None
+    ):
+        """
+        Args:
+            event_bus: Event bus the orchestrator subscribes and publishes to.
+            logger: Optional logger.
+            scheduler: Runs the orchestrations of each stack in order, None runs them on the calling thread.
+            pipeline_executor (PipelineExecutor, optional): Executor whose running pipeline
+                of a stack is cancelled when a newer request for the stack arrives.
+        """
         self.event_bus = event_bus
         self.logger = logger
+        self.scheduler = scheduler
+        self.pipeline_executor = pipeline_executor
         self.path_determiner = ExecutionPathDeterminer(logger)
         self.state_persistence = StatePersistence(logger=logger)
 
@@ -171,42 +261,95 @@ class DeploymentOrchestrator:
         self.event_bus.subscribe(EventType.PIPELINE_FAILED, self.handle_pipeline_failed)
         self.event_bus.subscribe(EventType.PROCESS_CRASHED, self.handle_process_crashed)
 
-        # Keep track of active orchestrations
+        # Keep track of active orchestrations, keyed by orchestration id
         self.active_orchestrations: dict[str, dict[str, Any]] = {}
-        # Track if we're currently in a rollback to prevent rollback loops
-        self._rollback_in_progress: bool = False
+        self._lock = threading.RLock()
+
+        # Indexes over active_orchestrations, updated with it under the lock
+        self._by_correlation: dict[str, str] = {}
+        self._pending_by_stack: dict[str, set[str]] = {}
+        self._running: set[str] = set()
+        # Stack name to the id of its queued or running rollback
+        self._rollbacks: dict[str, str] = {}
+
+        # Rolling end-to-end durations of orchestrations per action
+        self.timings = DurationStats()
 
         if self.logger:
             self.logger.info("DeploymentOrchestrator initialized with rollback support")
 
+    @property
+    def _rollback_in_progress(self) -> bool:
+        """Whether a rollback orchestration of any stack is queued or running."""
+        with self._lock:
+            return bool(self._rollbacks)
+
+    def _rollback_in_progress_for(self, stack_name: str | None) -> bool:
+        """Whether a rollback orchestration of the given stack is queued or running."""
+        with self._lock:
+            return stack_name in self._rollbacks
+
+    def _register(self, orchestration_id: str, context: dict[str, Any]):
+        """Add a pending orchestration and index it. Must be called with the lock held."""
+        self.active_orchestrations[orchestration_id] = context
+        if context.get("correlation_id"):
+            self._by_correlation[context["correlation_id"]] = orchestration_id
+        self._pending_by_stack.setdefault(context["stack_name"], set()).add(orchestration_id)
+        if context.get("is_rollback"):
+            self._rollbacks[context["stack_name"]] = orchestration_id
+
+    def _set_status(self, orchestration_id: str, context: dict[str, Any], status: str):
+        """Change the status of an orchestration and its indexes. Must be called with the lock held."""
+        if context["status"] == "pending" and status != "pending":
+            self._discard_pending(orchestration_id, context["stack_name"])
+        if status in ("started", "rollback_started"):
+            self._running.add(orchestration_id)
+        context["status"] = status
+
+    def _discard_pending(self, orchestration_id: str, stack_name: str):
+        pending = self._pending_by_stack.get(stack_name)
+        if pending is not None:
+            pending.discard(orchestration_id)
+            if not pending:
+                del self._pending_by_stack[stack_name]
+
+    def _unregister(self, orchestration_id: str) -> dict[str, Any] | None:
+        """Remove an orchestration and its index entries. Must be called with the lock held."""
+        context = self.active_orchestrations.pop(orchestration_id, None)
+        if context is None:
+            return None
+        self._discard_pending(orchestration_id, context["stack_name"])
+        self._running.discard(orchestration_id)
+        if self._rollbacks.get(context["stack_name"]) == orchestration_id:
+            del self._rollbacks[context["stack_name"]]
+        correlation_id = context.get("correlation_id")
+        if correlation_id and self._by_correlation.get(correlation_id) == orchestration_id:
+            del self._by_correlation[correlation_id]
+        return context
+
+    def get_orchestration_by_correlation(self, correlation_id: str) -> tuple[str | None, dict[str, Any] | None]:
+        """Return the active orchestration of a request correlation id."""
+        with self._lock:
+            orchestration_id = self._by_correlation.get(correlation_id)
+            if orchestration_id is None:
+                return None, None
+            return orchestration_id, self.active_orchestrations[orchestration_id]
+
     def handle_stack_analyzed(self, event: StackAnalyzedEvent):
         """Handle analyzed stack by determining orchestration path."""
         try:
             execution_path = self.path_determiner.determine_path(event)
 
             orchestration_id = str(uuid.uuid4())
-
-            # Save current state before deployment (enables rollback to previous stack)
             stack_payload = event.stack_payload
-            if stack_payload and not self._rollback_in_progress:
-                # Use global active state to enable cross-stack rollback
-                self.state_persistence.mark_active_deployment_started(stack_payload)
-                if self.logger:
-                    stack_name = self._get_stack_name_from_payload(stack_payload)
-                    self.logger.info(f"Saved active state for rollback: {stack_name}")
-
-            # Store orchestration context
-            self.active_orchestrations[orchestration_id] = {
-                "event": event,
-                "execution_path": execution_path,
-                "status": "started",
-            }
+            stack_name = self._get_stack_name_from_payload(stack_payload) or event.stack_name or "unknown"
 
             orchestration_event = OrchestrationStartedEvent(
                 event_type=EventType.ORCHESTRATION_STARTED,
                 source_component="deployment_orchestrator",
                 correlation_id=event.correlation_id,
                 orchestration_id=orchestration_id,
+                stack_name=stack_name,
                 action=event.metadata.get("action", "unknown"),
                 execution_plan=execution_path.to_dict(),
                 context_variables=execution_path.context_variables,
@@ -214,21 +357,132 @@ class DeploymentOrchestrator:
                 metadata={"requires_merging": execution_path.requires_merging},
             )
 
+            with self._lock:
+                # A newer request for the same stack supersedes orchestrations that have not started yet
+                for orch_id in list(self._pending_by_stack.get(stack_name, ())):
+                    self._set_status(orch_id, self.active_orchestrations[orch_id], "superseded")
+                    if self.logger:
+                        self.logger.info(f"Orchestration {orch_id} for {stack_name} superseded by {orchestration_id}")
+
+                # and the running orchestration of the stack, unless that is a rollback
+                running = [
+                    orch_id
+                    for orch_id in self._running
+                    if self.active_orchestrations[orch_id]["stack_name"] == stack_name
+                    and self.active_orchestrations[orch_id]["status"] == "started"
+                ]
+                cancel_running = bool(running) and self.pipeline_executor is not None
+                if cancel_running:
+                    for orch_id in running:
+                        self._set_status(orch_id, self.active_orchestrations[orch_id], "superseded")
+                        if self.logger:
+                            self.logger.info(
+                                f"Running orchestration {orch_id} for {stack_name} superseded by {orchestration_id}"
+                            )
+
+                # Store orchestration context
+                self._register(
+                    orchestration_id,
+                    {
+                        "event": event,
+                        "execution_path": execution_path,
+                        "status": "pending",
+                        "stack_name": stack_name,
+                        "action": event.metadata.get("action", "unknown"),
+                        "is_rollback": False,
+                        "created_at": time.monotonic(),
+                        "correlation_id": event.correlation_id,
+                    },
+                )
+
+            if cancel_running:
+                self.pipeline_executor.cancel_stack(stack_name, f"Superseded by orchestration {orchestration_id}")
+
             if self.logger:
-                self.logger.info(f"Starting orchestration {orchestration_id} for {event.metadata.get('action')}")
+                self.logger.info(f"Scheduling orchestration {orchestration_id} for {event.metadata.get('action')}")
 
-            self.event_bus.publish_sync(orchestration_event)
+            self._schedule(stack_name, orchestration_id, orchestration_event)
 
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Error handling stack analyzed event: {e}")
 
+    def _schedule(self, stack_name: str, orchestration_id: str, orchestration_event: OrchestrationStartedEvent):
+        """Run an orchestration in order with the other orchestrations of its stack."""
+        if self.scheduler is None:
+            self._run_orchestration(orchestration_id, orchestration_event)
+        else:
+            self.scheduler.submit(stack_name, self._run_orchestration, orchestration_id, orchestration_event)
+
+    def _run_orchestration(self, orchestration_id: str, orchestration_event: OrchestrationStartedEvent):
+        """Start a scheduled orchestration unless it was superseded or is a no-op."""
+        stack_payload = orchestration_event.stack_payload
+        unchanged = False
+        with self._lock:
+            context = self.active_orchestrations.get(orchestration_id)
+            if context is None:
+                return
+            if context["status"] == "superseded":
+                self._unregister(orchestration_id)
+                return
+
+            stack_name = context["stack_name"]
+            if context["is_rollback"]:
+                self._set_status(orchestration_id, context, "rollback_started")
+                context["tracks_state"] = self.state_persistence.mark_deployment_started(
+                    stack_name, stack_payload, manifest_digest(stack_payload)
+                )
+            else:
+                self._set_status(orchestration_id, context, "started")
+                metadata = context["event"].metadata
+                digest = metadata.get("manifest_digest")
+                deploys = context["action"] in DEPLOY_ACTIONS
+                # Stack references carry no digest, so they are never skipped as unchanged
+                unchanged = (
+                    deploys
+                    and bool(digest)
+                    and not metadata.get("force", False)
+                    and self.state_persistence.get_running_digest(stack_name) == digest
+                )
+
+                if not unchanged and deploys:
+                    # Keeps the running stack as the previous stack of this stack for rollback
+                    context["tracks_state"] = self.state_persistence.mark_deployment_started(
+                        stack_name, stack_payload, digest or ""
+                    )
+
+        if unchanged:
+            if self.logger:
+                self.logger.info(f"Stack {stack_name} is already running this manifest, skipping {context['action']}")
+            self.complete_orchestration(
+                orchestration_id,
+                stack_payload,
+                execution_summary={"status": "success", "skipped": True, "reason": "manifest unchanged"},
+            )
+            return
+
+        if self.logger:
+            self.logger.info(f"Starting orchestration {orchestration_id} for {stack_name}")
+
+        self.event_bus.publish_sync(orchestration_event)
+
     def handle_stack_merged(self, event):
         """Handle stack merged event - may trigger pipeline execution."""
         # This could be used to continue orchestration after stack merging
         if self.logger:
             self.logger.debug("Stack merged event received in orchestrator")
 
+    def _finish_timing(self, context: dict[str, Any], failed: bool = False) -> float:
+        """Return the seconds since an orchestration was created and record them per action.
+
+        Orchestrations are timed end to end, including the time spent queued
+        behind other orchestrations of the same stack.
+        """
+        duration = time.monotonic() - context.get("created_at", time.monotonic())
+        action = "rollback" if context.get("is_rollback") else context.get("action", "unknown")
+        self.timings.record(action, duration, failed=failed)
+        return duration
+
     def _get_stack_name_from_payload(self, stack_payload: dict[str, Any]) -> str | None:
         """Extract stack name from stack payload."""
         if not stack_payload:
@@ -236,17 +490,32 @@ class DeploymentOrchestrator:
         metadata = stack_payload.get("metadata", {})
         return metadata.get("name") or stack_payload.get("name")
 
+    def _find_orchestration(self, event) -> tuple[str | None, dict[str, Any] | None]:
+        """Find the running orchestration a pipeline event belongs to.
+
+        Events are matched by orchestration id, then by the correlation id of
+        the request that started the orchestration.
+        """
+        with self._lock:
+            if event.orchestration_id:
+                orchestration_id = event.orchestration_id
+            elif event.correlation_id and event.correlation_id in self._by_correlation:
+                orchestration_id = self._by_correlation[event.correlation_id]
+            elif len(self._running) == 1:
+                # Events without either id can only be attributed when a single run is active
+                orchestration_id = next(iter(self._running))
+            else:
+                return None, None
+
+            if orchestration_id in self._running:
+                return orchestration_id, self.active_orchestrations[orchestration_id]
+            return None, None
+
     def handle_pipeline_completed(self, event: PipelineCompletedEvent):
         """Handle pipeline completion and finalize orchestration."""
         try:
             # Find the orchestration for this pipeline
-            orchestration_id = None
-            orchestration_context = None
-            for orch_id, context in self.active_orchestrations.items():
-                if context.get("status") in ("started", "rollback_started"):
-                    orchestration_id = orch_id
-                    orchestration_context = context
-                    break
+            orchestration_id, orchestration_context = self._find_orchestration(event)
 
             if not orchestration_id:
                 if self.logger:
@@ -264,11 +533,17 @@ class DeploymentOrchestrator:
             stack_name = self._get_stack_name_from_payload(stack_payload) if stack_payload else None
 
             # Check if this was a rollback completion
-            is_rollback = orchestration_context.get("status") == "rollback_started"
+            is_rollback = orchestration_context.get("is_rollback", False)
+
+            # Keep the per-stack running state used to skip unchanged re-deployments
+            with self._lock:
+                if orchestration_context.get("action") == "kill":
+                    # The launch plugin terminates every managed launcher on kill
+                    self.state_persistence.mark_all_deployments_stopped()
+                elif orchestration_context.get("tracks_state"):
+                    self.state_persistence.mark_deployment_completed(orchestration_context["stack_name"])
 
             if is_rollback:
-                # Mark rollback as completed in global active state
-                self.state_persistence.mark_active_rollback_completed()
                 if self.logger:
                     self.logger.info(f"Rollback completed, restored: {stack_name}")
 
@@ -277,13 +552,12 @@ class DeploymentOrchestrator:
                     event_type=EventType.ROLLBACK_COMPLETED,
                     source_component="deployment_orchestrator",
                     orchestration_id=orchestration_id,
+                    correlation_id=orchestration_context.get("correlation_id"),
                     restored_stack=stack_payload or {},
-                    rollback_duration=0.0,
+                    rollback_duration=time.monotonic() - orchestration_context.get("created_at", time.monotonic()),
                 )
                 self.event_bus.publish_sync(rollback_completed)
             else:
-                # Normal deployment completed - update global active state
-                self.state_persistence.mark_active_deployment_completed()
                 if self.logger:
                     self.logger.info(f"Deployment completed: {stack_name}")
 
@@ -294,32 +568,35 @@ class DeploymentOrchestrator:
             if self.logger:
                 self.logger.error(f"Error handling pipeline completion: {e}")
 
-    def complete_orchestration(self, orchestration_id: str, final_stack_state: dict[str, Any]):
+    def complete_orchestration(
+        self,
+        orchestration_id: str,
+        final_stack_state: dict[str, Any],
+        execution_summary: dict[str, Any] | None = None,
+    ):
         """Complete an orchestration."""
         try:
-            if orchestration_id in self.active_orchestrations:
-                orchestration_context = self.active_orchestrations[orchestration_id]
+            with self._lock:
+                orchestration_context = self._unregister(orchestration_id)
+            if orchestration_context is not None:
                 orchestration_context["status"] = "completed"
+                duration = self._finish_timing(orchestration_context)
 
                 completion_event = OrchestrationCompletedEvent(
                     event_type=EventType.ORCHESTRATION_COMPLETED,
                     source_component="deployment_orchestrator",
+                    correlation_id=orchestration_context.get("correlation_id"),
                     orchestration_id=orchestration_id,
+                    stack_name=orchestration_context.get("stack_name"),
                     final_stack_state=final_stack_state,
-                    execution_summary={"status": "success"},
-                    duration=0.0,  # Would be calculated in real implementation
+                    execution_summary=execution_summary or {"status": "success"},
+                    duration=duration,
                 )
 
                 self.event_bus.publish_sync(completion_event)
 
-                # Clean up
-                del self.active_orchestrations[orchestration_id]
-
-                # Reset rollback flag if this was a rollback
-                if self._rollback_in_progress:
-                    self._rollback_in_progress = False
-                    if self.logger:
-                        self.logger.info("Rollback completed successfully")
+                if orchestration_context.get("is_rollback") and self.logger:
+                    self.logger.info("Rollback completed successfully")
 
                 if self.logger:
                     self.logger.info(f"Completed orchestration {orchestration_id}")
@@ -331,34 +608,52 @@ class DeploymentOrchestrator:
     def handle_pipeline_failed(self, event: PipelineFailedEvent):
         """Handle pipeline failure and trigger rollback if possible."""
         try:
-            # Don't trigger rollback if we're already in a rollback
-            if self._rollback_in_progress:
+            orchestration_id, orchestration_context = self._find_orchestration(event)
+            if orchestration_id:
+                self._finish_timing(orchestration_context, failed=True)
+                with self._lock:
+                    self._unregister(orchestration_id)
+                    if orchestration_context.get("tracks_state"):
+                        self.state_persistence.mark_deployment_failed(
+                            orchestration_context["stack_name"], str(event.error_details)
+                        )
+
+            # A pipeline cancelled for a newer request of its stack is not rolled back
+            if orchestration_context and orchestration_context["status"] == "superseded":
+                if self.logger:
+                    self.logger.info(f"Superseded orchestration {orchestration_id} stopped at {event.failure_step}")
+                return
+
+            # Don't trigger rollback if the failed pipeline was itself a rollback
+            if orchestration_context and orchestration_context.get("is_rollback"):
                 if self.logger:
                     self.logger.error(f"Rollback failed: {event.pipeline_name} - {event.error_details}")
                 # Publish rollback failed event
                 rollback_failed = RollbackFailedEvent(
                     event_type=EventType.ROLLBACK_FAILED,
                     source_component="deployment_orchestrator",
-                    orchestration_id=event.execution_id,
+                    correlation_id=event.correlation_id,
+                    orchestration_id=orchestration_id,
                     error_details=str(event.error_details),
                     original_failure="Rollback pipeline failed",
                 )
                 self.event_bus.publish_sync(rollback_failed)
-                self._rollback_in_progress = False
                 return
 
             if self.logger:
                 self.logger.error(f"Pipeline failed: {event.pipeline_name} at step {event.failure_step}")
 
-            # Mark deployment as failed in active state
-            self.state_persistence.mark_active_deployment_failed(str(event.error_details))
+            # The failed stack is rolled back to its own previous stack
+            stack_name = orchestration_context["stack_name"] if orchestration_context else None
+            with self._lock:
+                can_rollback = bool(stack_name) and self.state_persistence.can_rollback(stack_name)
+                previous_stack = self.state_persistence.get_previous_stack(stack_name) if can_rollback else None
 
-            # Check if rollback is possible using global active state
-            if self.state_persistence.can_rollback_active():
-                previous_stack = self.state_persistence.get_active_previous_stack()
+            if can_rollback:
                 if previous_stack:
-                    prev_name = previous_stack.get("metadata", {}).get("name", "unknown")
-                    self.trigger_rollback(prev_name, previous_stack, str(event.error_details))
+                    self.trigger_rollback(
+                        stack_name, previous_stack, str(event.error_details), correlation_id=event.correlation_id
+                    )
                 else:
                     if self.logger:
                         self.logger.warning("No previous stack available for rollback")
@@ -370,7 +665,9 @@ class DeploymentOrchestrator:
                 failed_event = OrchestrationFailedEvent(
                     event_type=EventType.ORCHESTRATION_FAILED,
                     source_component="deployment_orchestrator",
-                    orchestration_id=event.execution_id,
+                    correlation_id=event.correlation_id,
+                    orchestration_id=orchestration_id or event.execution_id,
+                    stack_name=orchestration_context["stack_name"] if orchestration_context else None,
                     error_details=str(event.error_details),
                     failed_step=event.failure_step,
                     can_rollback=False,
@@ -384,11 +681,10 @@ class DeploymentOrchestrator:
     def handle_process_crashed(self, event: ProcessCrashedEvent):
         """Handle process crash event and trigger rollback if possible."""
         try:
-            # Don't trigger rollback if we're already in a rollback
-            if self._rollback_in_progress:
+            # Don't trigger rollback if the stack is already rolling back
+            if self._rollback_in_progress_for(event.stack_name):
                 if self.logger:
                     self.logger.error(f"Process crashed during rollback: {event.process_name} - {event.error_message}")
-                self._rollback_in_progress = False
                 return
 
             if self.logger:
@@ -396,15 +692,21 @@ class DeploymentOrchestrator:
                     f"Process crashed: {event.process_name} (stack: {event.stack_name}, exit code: {event.exit_code})"
                 )
 
-            # Mark deployment as failed in active state
-            self.state_persistence.mark_active_deployment_failed(event.error_message)
-
-            # Check if rollback is possible using global active state
-            if self.state_persistence.can_rollback_active():
-                previous_stack = self.state_persistence.get_active_previous_stack()
+            can_rollback = False
+            previous_stack = None
+            with self._lock:
+                if event.stack_name:
+                    # A crashed stack is no longer running its manifest and must not be skipped on re-deploy
+                    self.state_persistence.mark_deployment_failed(event.stack_name, event.error_message)
+                    can_rollback = self.state_persistence.can_rollback(event.stack_name)
+                    if can_rollback:
+                        previous_stack = self.state_persistence.get_previous_stack(event.stack_name)
+
+            if can_rollback:
                 if previous_stack:
-                    prev_name = previous_stack.get("metadata", {}).get("name", "unknown")
-                    self.trigger_rollback(prev_name, previous_stack, event.error_message)
+                    self.trigger_rollback(
+                        event.stack_name, previous_stack, event.error_message, correlation_id=event.correlation_id
+                    )
                 else:
                     if self.logger:
                         self.logger.warning("No previous stack available for rollback")
@@ -418,28 +720,69 @@ class DeploymentOrchestrator:
 
     def _get_stack_name_from_context(self, event: PipelineFailedEvent) -> str | None:
         """Extract stack name from pipeline failure event context."""
-        # Try to find from active orchestrations
-        for _orch_id, context in self.active_orchestrations.items():
-            if hasattr(context.get("event"), "stack_name"):
-                return context["event"].stack_name
-            # Try to get from stack_payload
-            stack_payload = context.get("event", {})
-            if hasattr(stack_payload, "stack_payload"):
-                metadata = stack_payload.stack_payload.get("metadata", {})
-                name = metadata.get("name")
-                if name:
-                    return name
+        _orchestration_id, context = self._find_orchestration(event)
+        if context is None:
+            return None
+        if context.get("stack_name"):
+            return context["stack_name"]
+        # Try to get from stack_payload
+        analyzed_event = context.get("event")
+        if hasattr(analyzed_event, "stack_payload"):
+            return self._get_stack_name_from_payload(analyzed_event.stack_payload)
         return None
 
-    def trigger_rollback(self, stack_name: str, previous_stack: dict[str, Any], failure_reason: str):
-        """Trigger rollback to previous stack version."""
+    def trigger_rollback(
+        self,
+        stack_name: str,
+        previous_stack: dict[str, Any],
+        failure_reason: str,
+        schedule_key: str | None = None,
+        correlation_id: str | None = None,
+    ):
+        """Trigger rollback to previous stack version.
+
+        Args:
+            stack_name: Name of the stack that is restored.
+            previous_stack: Stack definition that is restored.
+            failure_reason: Reason of the failure that caused the rollback.
+            schedule_key: Stack whose orchestrations the rollback is ordered with,
+                defaults to ``stack_name``.
+            correlation_id: Correlation id of the request whose failure caused the rollback.
+        """
         try:
-            if self._rollback_in_progress:
-                if self.logger:
-                    self.logger.warning("Rollback already in progress, skipping")
-                return
+            orchestration_id = str(uuid.uuid4())
+
+            with self._lock:
+                if stack_name in self._rollbacks:
+                    if self.logger:
+                        self.logger.warning(f"Rollback of {stack_name} already in progress, skipping")
+                    return
 
-            self._rollback_in_progress = True
+                # Create execution path for rollback
+                execution_path = ExecutionPath(
+                    pipeline_name="rollback",
+                    context_variables={
+                        "should_run_provision": True,  # May need to provision previous version
+                        "should_run_launch": True,
+                        "is_rollback": True,
+                    },
+                    requires_merging=False,
+                )
+
+                # Store rollback orchestration context; it counts as in progress from here on
+                self._register(
+                    orchestration_id,
+                    {
+                        "execution_path": execution_path,
+                        "status": "pending",
+                        "stack_name": stack_name,
+                        "is_rollback": True,
+                        "previous_stack": previous_stack,
+                        "failed_stack": {},
+                        "created_at": time.monotonic(),
+                        "correlation_id": correlation_id,
+                    },
+                )
 
             if self.logger:
                 self.logger.info(f"Triggering rollback for {stack_name} due to: {failure_reason}")
@@ -447,44 +790,28 @@ class DeploymentOrchestrator:
             # Get the current (failed) stack for reference
             state = self.state_persistence.load_state(stack_name)
             failed_stack = state.current_stack if state else {}
+            self.active_orchestrations[orchestration_id]["failed_stack"] = failed_stack
 
             # Publish rollback started event
             rollback_event = RollbackStartedEvent(
                 event_type=EventType.ROLLBACK_STARTED,
                 source_component="deployment_orchestrator",
+                correlation_id=correlation_id,
+                orchestration_id=orchestration_id,
+                stack_name=stack_name,
                 previous_stack=previous_stack,
                 failed_stack=failed_stack,
                 failure_reason=failure_reason,
             )
             self.event_bus.publish_sync(rollback_event)
 
-            # Create a new orchestration for the rollback using the previous stack
-            orchestration_id = str(uuid.uuid4())
-
-            # Create execution path for rollback
-            execution_path = ExecutionPath(
-                pipeline_name="rollback",
-                context_variables={
-                    "should_run_provision": True,  # May need to provision previous version
-                    "should_run_launch": True,
-                    "is_rollback": True,
-                },
-                requires_merging=False,
-            )
-
-            # Store rollback orchestration context
-            self.active_orchestrations[orchestration_id] = {
-                "execution_path": execution_path,
-                "status": "rollback_started",
-                "previous_stack": previous_stack,
-                "failed_stack": failed_stack,
-            }
-
             # Trigger orchestration with previous stack
             orchestration_event = OrchestrationStartedEvent(
                 event_type=EventType.ORCHESTRATION_STARTED,
                 source_component="deployment_orchestrator",
+                correlation_id=correlation_id,
                 orchestration_id=orchestration_id,
+                stack_name=stack_name,
                 action="rollback",
                 execution_plan=execution_path.to_dict(),
                 context_variables=execution_path.context_variables,
@@ -492,13 +819,14 @@ class DeploymentOrchestrator:
                 metadata={"is_rollback": True, "failure_reason": failure_reason},
             )
 
-            self.event_bus.publish_sync(orchestration_event)
+            self._schedule(schedule_key or stack_name, orchestration_id, orchestration_event)
 
             if self.logger:
-                self.logger.info(f"Rollback orchestration {orchestration_id} started")
+                self.logger.info(f"Rollback orchestration {orchestration_id} scheduled")
 
         except Exception as e:
-            self._rollback_in_progress = False
+            with self._lock:
+                self._unregister(orchestration_id)
             if self.logger:
                 self.logger.error(f"Error triggering rollback: {e}")
 
@@ -506,12 +834,14 @@ class DeploymentOrchestrator:
 class OrchestrationManager:
     """Main orchestration management subsystem coordinator."""
 
-    def __init__(self, event_bus: EventBus, logger=None):
+    def __init__(
+        self, event_bus: EventBus, logger=None, scheduler: StackScheduler | None = None, pipeline_executor=None
+    ):
         self.event_bus = event_bus
         self.logger = logger
 
         # Initialize components
-        self.orchestrator = DeploymentOrchestrator(event_bus, logger)
+        self.orchestrator = DeploymentOrchestrator(event_bus, logger, scheduler, pipeline_executor)
 
         if self.logger:
             self.logger.info("OrchestrationManager subsystem initialized")
@@ -17,6 +17,7 @@ Manages pipeline configurations and execution.
 """
 
 import os
+import threading
 import uuid
 from typing import Any
 
@@ -33,6 +34,8 @@ from muto_composer.events import (
     PipelineRequestedEvent,
     PipelineStartedEvent,
 )
+from muto_composer.utils.metrics import DurationStats
+from muto_composer.workflow.compiler import compile_pipeline
 from muto_composer.workflow.pipeline import Pipeline
 from muto_composer.workflow.schemas.pipeline_schema import PIPELINE_SCHEMA
 
@@ -40,9 +43,33 @@ from muto_composer.workflow.schemas.pipeline_schema import PIPELINE_SCHEMA
 class PipelineManager:
     """Manages pipeline configurations and lifecycle."""
 
-    def __init__(self, config_path: str | None = None, logger=None):
+    def __init__(
+        self,
+        config_path: str | None = None,
+        logger=None,
+        manifest_store=None,
+        client_pool=None,
+        step_timeout: float | None = None,
+        pipeline_timeout: float | None = None,
+        step_cache=None,
+        in_process_plugins=None,
+    ):
         self.logger = logger
+        self.manifest_store = manifest_store
+        self.client_pool = client_pool
+        self.step_cache = step_cache
+        self.in_process_plugins = in_process_plugins
+        # Defaults for steps and pipelines that do not set a timeout
+        self.step_timeout = step_timeout
+        self.pipeline_timeout = pipeline_timeout
         self.pipelines: dict[str, Pipeline] = {}
+        self._definitions: dict[str, dict[str, Any]] = {}
+
+        # Reloads are serialized; executions keep the Pipeline they looked up
+        self._reload_lock = threading.Lock()
+        self._config_stamp = None
+        self._watch_stop = threading.Event()
+        self._watcher: threading.Thread | None = None
 
         # Set default config path if not provided
         if not config_path:
@@ -57,13 +84,23 @@ class PipelineManager:
     def _load_and_initialize_pipelines(self):
         """Load and initialize all configured pipelines."""
         try:
+            stamp = self._stat_config()
             config = self.load_pipeline_config(self.config_path)
             self.initialize_pipelines(config)
+            self._config_stamp = stamp
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Failed to initialize pipelines: {e}")
             raise
 
+    def _stat_config(self):
+        """Return the modification time and size of the configuration file, None if it is missing."""
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
     def load_pipeline_config(self, config_path: str) -> dict[str, Any]:
         """Load and validate pipeline configuration."""
         try:
@@ -91,22 +128,45 @@ class PipelineManager:
             raise
 
     def initialize_pipelines(self, config: dict[str, Any]):
-        """Initialize all configured pipelines."""
+        """Compile and initialize all configured pipelines.
+
+        Every pipeline is compiled into an execution plan before any is
+        replaced, so an invalid configuration leaves the loaded pipelines intact.
+        The new pipelines are swapped in at once; pipelines whose definition
+        did not change are kept as they are.
+        """
         try:
+            plans = self.compile_pipelines(config)
             loaded_pipelines = {}
+            definitions = {}
 
             for pipeline_item in config.get("pipelines", []):
                 name = pipeline_item["name"]
+                definitions[name] = pipeline_item
+                if self._definitions.get(name) == pipeline_item and name in self.pipelines:
+                    loaded_pipelines[name] = self.pipelines[name]
+                    continue
+
                 pipeline_spec = pipeline_item["pipeline"]
                 compensation_spec = pipeline_item.get("compensation", None)
 
-                pipeline = Pipeline(name, pipeline_spec, compensation_spec)
+                pipeline = Pipeline(
+                    name,
+                    pipeline_spec,
+                    compensation_spec,
+                    manifest_store=self.manifest_store,
+                    client_pool=self.client_pool,
+                    plan=plans[name],
+                    step_cache=self.step_cache,
+                    in_process_plugins=self.in_process_plugins,
+                )
                 loaded_pipelines[name] = pipeline
 
                 if self.logger:
                     self.logger.debug(f"Initialized pipeline: {name}")
 
             self.pipelines = loaded_pipelines
+            self._definitions = definitions
 
             if self.logger:
                 self.logger.info(f"Successfully initialized {len(loaded_pipelines)} pipelines")
@@ -116,6 +176,45 @@ class PipelineManager:
                 self.logger.error(f"Error initializing pipelines: {e}")
             raise
 
+    def compile_pipelines(self, config: dict[str, Any]) -> dict[str, Any]:
+        """Compile the configured pipelines into execution plans.
+
+        Plugin service types are resolved once for the whole configuration,
+        and steps whose conditions can never hold are logged as warnings.
+
+        Raises:
+            ValueError: If a pipeline has invalid references, conditions or dependencies.
+        """
+        plugin_cache = {}
+        plans = {}
+        for pipeline_item in config.get("pipelines", []):
+            name = pipeline_item["name"]
+            try:
+                plan = compile_pipeline(
+                    name,
+                    pipeline_item["pipeline"],
+                    pipeline_item.get("compensation"),
+                    plugin_cache=plugin_cache,
+                    timeout=pipeline_item.get("timeout", self.pipeline_timeout),
+                    step_timeout=self.step_timeout,
+                )
+            except ValueError as e:
+                raise ValueError(f"Invalid pipeline '{name}': {e}") from e
+            for warning in plan.warnings:
+                if self.logger:
+                    self.logger.warning(f"Pipeline '{name}': {warning}")
+            plans[name] = plan
+
+        # The hosted plugin and the plugin process keep separate state, e.g. the launchers they started
+        modes: dict[str, set[bool]] = {}
+        for plan in plans.values():
+            for step in [step for item in plan.items for step in item.steps] + list(plan.compensation):
+                modes.setdefault(step.plugin_name, set()).add(step.in_process)
+        for plugin_name, plugin_modes in sorted(modes.items()):
+            if len(plugin_modes) > 1 and self.logger:
+                self.logger.warning(f"Plugin {plugin_name} is called both in-process and through its service")
+        return plans
+
     def get_pipeline(self, name: str) -> Pipeline | None:
         """Retrieve pipeline by name."""
         pipeline = self.pipelines.get(name)
@@ -128,15 +227,62 @@ class PipelineManager:
         return self.pipelines.copy()
 
     def reload_configuration(self):
-        """Reload pipeline configuration from file."""
+        """Reload pipeline configuration from file.
+
+        The new configuration is validated and compiled before it replaces the
+        loaded pipelines. Executions that already looked up a pipeline finish
+        on its original plan.
+
+        Raises:
+            Exception: If the configuration cannot be loaded or compiled. The
+                loaded pipelines are kept.
+        """
+        with self._reload_lock:
+            try:
+                self._load_and_initialize_pipelines()
+                if self.logger:
+                    self.logger.info("Pipeline configuration reloaded successfully")
+            except Exception as e:
+                # Do not retry the same file on every poll
+                self._config_stamp = self._stat_config()
+                if self.logger:
+                    self.logger.error(f"Failed to reload pipeline configuration: {e}")
+                raise
+
+    def reload_if_changed(self) -> bool:
+        """Reload the configuration if its file changed since it was last loaded.
+
+        Returns:
+            bool: Whether a changed configuration was loaded.
+        """
+        stamp = self._stat_config()
+        if stamp is None or stamp == self._config_stamp:
+            return False
         try:
-            self._load_and_initialize_pipelines()
-            if self.logger:
-                self.logger.info("Pipeline configuration reloaded successfully")
-        except Exception as e:
-            if self.logger:
-                self.logger.error(f"Failed to reload pipeline configuration: {e}")
-            raise
+            self.reload_configuration()
+        except Exception:
+            return False
+        return True
+
+    def start_watching(self, interval: float = 2.0):
+        """Poll the configuration file and reload it when it changes."""
+        if interval <= 0 or (self._watcher is not None and self._watcher.is_alive()):
+            return
+        self._watch_stop.clear()
+
+        def watch():
+            while not self._watch_stop.wait(interval):
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=watch, name="pipeline_config_watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self, timeout: float | None = 5.0):
+        """Stop polling the configuration file."""
+        self._watch_stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout)
+            self._watcher = None
 
 
 class PipelineExecutor:
@@ -152,6 +298,10 @@ class PipelineExecutor:
 
         # Track active executions
         self.active_executions: dict[str, dict[str, Any]] = {}
+        self._executions_lock = threading.Lock()
+
+        # Rolling durations of pipelines and their steps
+        self.timings = DurationStats()
 
         if self.logger:
             self.logger.info("PipelineExecutor initialized")
@@ -175,6 +325,8 @@ class PipelineExecutor:
                 event_type=EventType.PIPELINE_REQUESTED,
                 source_component="pipeline_executor",
                 correlation_id=event.correlation_id,
+                orchestration_id=event.orchestration_id,
+                stack_name=event.stack_name,
                 pipeline_name=pipeline_name,
                 execution_context=context,
                 stack_payload=stack_payload,  # Use consistent naming
@@ -205,12 +357,15 @@ class PipelineExecutor:
                 )
                 return
 
-            # Store execution context
-            self.active_executions[execution_id] = {
-                "event": event,
-                "pipeline": pipeline,
-                "status": "running",
-            }
+            # Store execution context, with the run so it can be cancelled while it executes
+            run = pipeline.create_run(event.execution_context)
+            with self._executions_lock:
+                self.active_executions[execution_id] = {
+                    "event": event,
+                    "pipeline": pipeline,
+                    "run": run,
+                    "status": "running",
+                }
 
             # Publish pipeline started event
             self.event_bus.publish_sync(
@@ -218,6 +373,8 @@ class PipelineExecutor:
                     event_type=EventType.PIPELINE_STARTED,
                     source_component="pipeline_executor",
                     correlation_id=event.correlation_id,
+                    orchestration_id=event.orchestration_id,
+                    stack_name=event.stack_name,
                     pipeline_name=event.pipeline_name,
                     execution_id=execution_id,
                     steps_planned=self._extract_step_names(pipeline),
@@ -228,7 +385,8 @@ class PipelineExecutor:
                 self.logger.info(f"Starting pipeline execution: {event.pipeline_name} [{execution_id}]")
 
             # Execute pipeline
-            result = self._execute_pipeline_real(pipeline, event)
+            result = self._execute_pipeline_real(pipeline, event, run=run)
+            self._record_timings(pipeline.name, result)
 
             # Check if pipeline execution was successful
             if result.get("success", False):
@@ -238,11 +396,13 @@ class PipelineExecutor:
                         event_type=EventType.PIPELINE_COMPLETED,
                         source_component="pipeline_executor",
                         correlation_id=event.correlation_id,
+                        orchestration_id=event.orchestration_id,
+                        stack_name=event.stack_name,
                         pipeline_name=event.pipeline_name,
                         execution_id=execution_id,
                         final_result=result,
                         steps_executed=self._extract_step_names(pipeline),
-                        total_duration=0.0,  # Would be calculated in real implementation
+                        total_duration=result.get("duration", 0.0),
                     )
                 )
 
@@ -253,39 +413,76 @@ class PipelineExecutor:
                 self._publish_pipeline_failed(
                     event,
                     execution_id,
-                    "execution",
+                    result.get("failure_step") or "execution",
                     result.get("error", "Pipeline execution failed"),
+                    compensation_executed=result.get("compensation_executed", False),
                 )
                 if self.logger:
                     self.logger.error(f"Pipeline execution failed: {event.pipeline_name} [{execution_id}]")
 
             # Clean up
-            if execution_id in self.active_executions:
-                del self.active_executions[execution_id]
+            with self._executions_lock:
+                self.active_executions.pop(execution_id, None)
 
         except Exception as e:
             self._publish_pipeline_failed(event, execution_id, "execution", str(e))
 
             # Clean up
-            if execution_id in self.active_executions:
-                del self.active_executions[execution_id]
-
-    def _execute_pipeline_real(self, pipeline: Pipeline, event: PipelineRequestedEvent) -> dict[str, Any]:
+            with self._executions_lock:
+                self.active_executions.pop(execution_id, None)
+
+    def cancel_execution(self, execution_id: str, reason: str = "Pipeline execution cancelled") -> bool:
+        """Cancel a running execution.
+
+        The running step stops waiting for its plugin, compensation runs and
+        the execution is reported as failed at that step.
+
+        Returns:
+            bool: Whether a running execution was found.
+        """
+        with self._executions_lock:
+            execution = self.active_executions.get(execution_id)
+        if execution is None:
+            return False
+        execution["run"].cancel(reason)
+        if self.logger:
+            self.logger.warning(f"Cancelling pipeline execution {execution_id}: {reason}")
+        return True
+
+    def cancel_stack(self, stack_name: str, reason: str = "Superseded by a newer request") -> int:
+        """Cancel the running executions of a stack and return how many were cancelled."""
+        with self._executions_lock:
+            execution_ids = [
+                execution_id
+                for execution_id, execution in self.active_executions.items()
+                if execution["event"].stack_name == stack_name
+            ]
+        return sum(1 for execution_id in execution_ids if self.cancel_execution(execution_id, reason))
+
+    def _execute_pipeline_real(self, pipeline: Pipeline, event: PipelineRequestedEvent, run=None) -> dict[str, Any]:
         """Execute pipeline for real."""
         try:
             if self.logger:
                 self.logger.info(f"Executing pipeline: {pipeline.name}")
 
-            # Execute the actual pipeline
-            pipeline.execute_pipeline(additional_context=event.execution_context, next_manifest=event.stack_manifest)
+            # Every execution gets its own run, so concurrent executions for different stacks do not share results
+            run = pipeline.execute_pipeline(
+                additional_context=event.execution_context, next_manifest=event.stack_manifest, run=run
+            )
 
-            # Return pipeline context as result
-            return {
-                "success": True,
+            result = {
+                "success": run.success,
                 "pipeline": pipeline.name,
-                "context": pipeline.context,
+                "context": run.context,
                 "execution_context": event.execution_context,
+                "duration": run.duration,
+                "step_durations": dict(run.step_durations),
             }
+            if not run.success:
+                result["error"] = run.error or "Pipeline execution failed"
+                result["failure_step"] = run.failure_step
+                result["compensation_executed"] = run.compensation_executed
+            return result
 
         except Exception as e:
             if self.logger:
@@ -295,22 +492,26 @@ class PipelineExecutor:
                 "success": False,
                 "pipeline": pipeline.name,
                 "error": str(e),
-                "context": getattr(pipeline, "context", {}),
+                "context": {},
                 "execution_context": event.execution_context,
             }
 
+    def _record_timings(self, pipeline_name: str, result: dict[str, Any]):
+        """Add the durations of an execution and its steps to the rolling statistics."""
+        if "duration" not in result:
+            return
+        self.timings.record(pipeline_name, result["duration"], failed=not result.get("success", False))
+        for step_name, duration in result.get("step_durations", {}).items():
+            self.timings.record(
+                f"{pipeline_name}/{step_name}", duration, failed=step_name == result.get("failure_step")
+            )
+
     def _extract_step_names(self, pipeline: Pipeline) -> list:
-        """Extract step names from pipeline for reporting."""
-        step_names = []
+        """Return the step names of the pipeline's compiled plan for reporting."""
         try:
-            for item in pipeline.steps:
-                sequence = item.get("sequence", [])
-                for step in sequence:
-                    step_name = step.get("name", step.get("service", "unknown"))
-                    step_names.append(step_name)
+            return list(pipeline.plan.step_names)
         except Exception:
-            pass
-        return step_names
+            return []
 
     def _publish_pipeline_failed(
         self,
@@ -318,6 +519,7 @@ class PipelineExecutor:
         execution_id: str,
         failure_step: str,
         error_message: str,
+        compensation_executed: bool = False,
     ):
         """Publish pipeline failure event."""
         self.event_bus.publish_sync(
@@ -325,11 +527,13 @@ class PipelineExecutor:
                 event_type=EventType.PIPELINE_FAILED,
                 source_component="pipeline_executor",
                 correlation_id=event.correlation_id,
+                orchestration_id=event.orchestration_id,
+                stack_name=event.stack_name,
                 pipeline_name=event.pipeline_name,
                 execution_id=execution_id,
                 failure_step=failure_step,
                 error_details={"error": error_message},
-                compensation_executed=False,
+                compensation_executed=compensation_executed,
             )
         )
 
@@ -340,12 +544,32 @@ class PipelineExecutor:
 class PipelineEngine:
     """Main pipeline engine subsystem coordinator."""
 
-    def __init__(self, event_bus: EventBus, config_path: str | None = None, logger=None):
+    def __init__(
+        self,
+        event_bus: EventBus,
+        config_path: str | None = None,
+        logger=None,
+        manifest_store=None,
+        client_pool=None,
+        step_timeout: float | None = None,
+        pipeline_timeout: float | None = None,
+        step_cache=None,
+        in_process_plugins=None,
+    ):
         self.event_bus = event_bus
         self.logger = logger
 
         # Initialize components
-        self.manager = PipelineManager(config_path, logger)
+        self.manager = PipelineManager(
+            config_path,
+            logger,
+            manifest_store,
+            client_pool,
+            step_timeout=step_timeout,
+            pipeline_timeout=pipeline_timeout,
+            step_cache=step_cache,
+            in_process_plugins=in_process_plugins,
+        )
         self.executor = PipelineExecutor(event_bus, self.manager, logger)
 
         if self.logger:
@@ -376,6 +600,7 @@ class PipelineEngine:
                 pipeline_event = PipelineRequestedEvent(
                     event_type=EventType.PIPELINE_REQUESTED,
                     source_component="pipeline_engine_legacy",
+                    correlation_id=str(uuid.uuid4()),
                     pipeline_name=pipeline_name,
                     execution_context=additional_context or {},
                     stack_manifest=stack_manifest or {},
@@ -19,6 +19,7 @@ Handles stack states, analysis, and transformations.
 import json
 import os
 import re
+import threading
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
@@ -37,6 +38,7 @@ from muto_composer.events import (
 )
 from muto_composer.model.stack import Stack
 from muto_composer.state.persistence import StatePersistence
+from muto_composer.utils.hashing import is_stack_reference, manifest_digest
 from muto_composer.utils.stack_parser import create_stack_parser
 
 
@@ -89,6 +91,8 @@ class StackStateManager:
         self.current_stack: dict | None = None
         self.next_stack: dict | None = None
         self._current_stack_name: str | None = None
+        # Event handlers and ROS callbacks update the stacks from different threads
+        self._lock = threading.RLock()
 
         # Initialize state persistence
         self.persistence = StatePersistence(logger=logger)
@@ -110,14 +114,16 @@ class StackStateManager:
 
     def set_current_stack(self, stack: dict) -> None:
         """Update current stack state."""
-        self.current_stack = stack
-        self._current_stack_name = self._get_stack_name(stack)
+        with self._lock:
+            self.current_stack = stack
+            self._current_stack_name = self._get_stack_name(stack)
         if self.logger:
             self.logger.debug("Current stack updated")
 
     def set_next_stack(self, stack: dict) -> None:
         """Set stack for next deployment."""
-        self.next_stack = stack
+        with self._lock:
+            self.next_stack = stack
         if self.logger:
             self.logger.debug("Next stack set")
 
@@ -131,11 +137,12 @@ class StackStateManager:
 
     def get_stack_transition(self) -> StackTransition:
         """Calculate transition from current to next."""
-        return StackTransition(
-            current=self.current_stack,
-            next=self.next_stack,
-            transition_type=self._determine_transition_type(),
-        )
+        with self._lock:
+            return StackTransition(
+                current=self.current_stack,
+                next=self.next_stack,
+                transition_type=self._determine_transition_type(),
+            )
 
     def _determine_transition_type(self) -> str:
         """Determine the type of transition."""
@@ -197,7 +204,8 @@ class StackStateManager:
                 # Update in-memory state to match persisted state
                 state = self.persistence.load_state(self._current_stack_name)
                 if state and state.current_stack:
-                    self.current_stack = state.current_stack
+                    with self._lock:
+                        self.current_stack = state.current_stack
             return success
         return False
 
@@ -312,6 +320,11 @@ class StackAnalyzer:
             stack_type = self.analyze_stack_type(stack_payload)
             requirements = self.determine_execution_requirements(stack_payload)
 
+            # Digest is computed at intake; requests from other sources are hashed here
+            digest = event.metadata.get("manifest_digest")
+            if digest is None and not is_stack_reference(stack_payload):
+                digest = manifest_digest(stack_payload)
+
             analyzed_event = StackAnalyzedEvent(
                 event_type=EventType.STACK_ANALYZED,
                 source_component="stack_analyzer",
@@ -329,7 +342,11 @@ class StackAnalyzer:
                 processing_requirements=requirements.to_dict(),
                 stack_payload=stack_payload,  # Use direct field instead of nested structure
                 correlation_id=event.correlation_id,
-                metadata={"action": event.action},
+                metadata={
+                    "action": event.action,
+                    "manifest_digest": digest,
+                    "force": bool(event.metadata.get("force", False)),
+                },
             )
 
             if self.logger:
@@ -368,10 +385,10 @@ class StackProcessor:
 
             # Check if merging is required
             if processing_requirements.get("merge_manifests", False):
-                # For now, we'll simulate merging with current stack
-                # In a full implementation, this would get current stack from state manager
-                current_stack = {}  # Would be retrieved from state manager
-                processed_payload = self.merge_stacks(current_stack, processed_payload)
+                # The composer does not know which stack is running. The launch plugin
+                # compares the manifest with the stack it runs and applies only the
+                # difference (workflow/apply_planner), so here it is only normalized.
+                processed_payload = self.merge_stacks({}, processed_payload)
                 processing_applied = True
 
                 if self.logger:
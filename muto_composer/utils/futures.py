@@ -0,0 +1,76 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Bounded waiting on service call and worker futures.
+
+Pipeline steps wait for a plugin response with a step timeout and stop
+waiting when their run is cancelled. ``wait_for_future`` implements that wait
+for the service client pool, in-process plugins and private executor nodes.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import CancelledError
+from typing import Any
+
+# Seconds between checks for cancellation while waiting for a response
+CANCEL_POLL_PERIOD = 0.1
+
+
+def wait_for_future(
+    future,
+    timeout: float | None = None,
+    cancelled: threading.Event | None = None,
+    description: str = "Call",
+    wait: Callable[[float | None], Any] | None = None,
+):
+    """Wait until a future completes, times out or is cancelled.
+
+    The future is cancelled when the wait gives up. A handler that is already
+    running is not interrupted by this.
+
+    Args:
+        future: A ``concurrent.futures.Future`` or rclpy future.
+        timeout: Seconds to wait, None waits indefinitely.
+        cancelled: Stops waiting when set.
+        description: Call named in error messages, e.g. ``"Service call to '/muto/compose'"``.
+        wait: Blocks for at most the given seconds, None meaning indefinitely, or
+            until the future completes, e.g. by spinning a node. Defaults to
+            waiting for the future's done callback.
+
+    Raises:
+        TimeoutError: If the future does not complete within ``timeout``.
+        CancelledError: If ``cancelled`` is set before the future completes.
+    """
+    if wait is None:
+        done = threading.Event()
+        future.add_done_callback(lambda _future: done.set())
+        is_done = done.is_set
+        wait = done.wait
+    else:
+        is_done = future.done
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while not is_done():
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            future.cancel()
+            raise TimeoutError(f"{description} timed out after {timeout:.1f}s")
+        if cancelled is not None:
+            if cancelled.is_set():
+                future.cancel()
+                raise CancelledError(f"{description} was cancelled")
+            remaining = CANCEL_POLL_PERIOD if remaining is None else min(remaining, CANCEL_POLL_PERIOD)
+        wait(remaining)
@@ -0,0 +1,47 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Canonical hashing of stack manifests.
+
+Manifests are serialized with sorted keys and compact separators before
+hashing, so the digest does not depend on key order or on the whitespace of
+the JSON document the manifest was parsed from.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+
+def canonical_json(manifest: Any) -> str:
+    """Serialize a manifest to its canonical JSON form."""
+    return json.dumps(manifest, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def manifest_digest(manifest: Any) -> str:
+    """Return the sha256 hex digest of the canonical form of a manifest."""
+    return hashlib.sha256(canonical_json(manifest).encode("utf-8")).hexdigest()
+
+
+def is_stack_reference(payload: dict[str, Any] | None) -> bool:
+    """Whether a payload only references a stack by id instead of carrying its manifest.
+
+    The manifest behind a reference is resolved later from the twin and may
+    change without the reference changing, so references have no meaningful
+    content digest.
+    """
+    if not isinstance(payload, dict):
+        return False
+    value = payload.get("value")
+    return isinstance(value, dict) and "stackId" in value and "metadata" not in payload
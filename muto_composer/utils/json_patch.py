@@ -0,0 +1,93 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Minimal JSON Patch (RFC 6902) support for twin state deltas.
+
+``make_patch`` emits ``add``, ``remove`` and ``replace`` operations. Objects
+are compared key by key; lists and scalars that differ are replaced whole,
+which keeps patches small for the mostly-object twin state documents.
+"""
+
+import copy
+from typing import Any
+
+
+def _escape(key: str) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> list[dict[str, Any]]:
+    """Return the operations turning ``old`` into ``new``."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        operations = []
+        for key in old:
+            if key not in new:
+                operations.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                operations.append({"op": "add", "path": child, "value": copy.deepcopy(value)})
+            else:
+                operations.extend(make_patch(old[key], value, child))
+        return operations
+
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": path, "value": copy.deepcopy(new)}]
+
+
+def apply_patch(document: Any, operations: list[dict[str, Any]]) -> Any:
+    """Return a copy of ``document`` with the operations applied.
+
+    Raises:
+        ValueError: If an operation is not supported or its path does not exist.
+    """
+    result = copy.deepcopy(document)
+    for operation in operations:
+        op = operation.get("op")
+        tokens = [_unescape(token) for token in operation.get("path", "").split("/")[1:]]
+        if not tokens:
+            if op not in ("add", "replace"):
+                raise ValueError(f"Unsupported operation on the document root: {op}")
+            result = copy.deepcopy(operation["value"])
+            continue
+
+        parent = result
+        try:
+            for token in tokens[:-1]:
+                parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        except (KeyError, IndexError, ValueError, TypeError) as e:
+            raise ValueError(f"Path not found: {operation.get('path')}") from e
+
+        key: Any = tokens[-1]
+        if isinstance(parent, list):
+            key = len(parent) if key == "-" else int(key)
+
+        if op in ("add", "replace"):
+            if isinstance(parent, list) and op == "add":
+                parent.insert(key, copy.deepcopy(operation["value"]))
+            else:
+                parent[key] = copy.deepcopy(operation["value"])
+        elif op == "remove":
+            try:
+                del parent[key]
+            except (KeyError, IndexError) as e:
+                raise ValueError(f"Path not found: {operation.get('path')}") from e
+        else:
+            raise ValueError(f"Unsupported patch operation: {op}")
+    return result
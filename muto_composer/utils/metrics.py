@@ -0,0 +1,193 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Lightweight in-process metrics used for composer instrumentation.
+
+Provides a fixed-bucket latency histogram with percentile estimates, the
+counters collected by the EventBus, rolling duration statistics of
+pipelines, steps and orchestrations, and the startup footprint of a process.
+"""
+
+import bisect
+import resource
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any
+
+# Histogram bucket upper bounds in milliseconds: 0.01 ms doubling up to ~5.8 h
+_BUCKET_BOUNDS_MS = tuple(0.01 * (2**i) for i in range(31))
+
+
+class LatencyHistogram:
+    """Histogram of durations with logarithmic buckets.
+
+    Recording is O(log buckets) and memory is constant. Percentiles are
+    estimated by the upper bound of the bucket that contains them, clamped
+    to the largest observed value.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = [0] * (len(_BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_sec: float) -> None:
+        """Record one duration given in seconds."""
+        duration_ms = duration_sec * 1000.0
+        index = bisect.bisect_left(_BUCKET_BOUNDS_MS, duration_ms)
+        with self._lock:
+            self._buckets[index] += 1
+            self.count += 1
+            self.total_ms += duration_ms
+            if duration_ms > self.max_ms:
+                self.max_ms = duration_ms
+
+    def percentile(self, fraction: float) -> float:
+        """Return the estimated duration in milliseconds at the given fraction (0-1)."""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = max(1, int(fraction * self.count + 0.5))
+            seen = 0
+            for index, bucket_count in enumerate(self._buckets):
+                seen += bucket_count
+                if seen >= rank:
+                    if index < len(_BUCKET_BOUNDS_MS):
+                        return min(_BUCKET_BOUNDS_MS[index], self.max_ms)
+                    return self.max_ms
+            return self.max_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class EventBusMetrics:
+    """Counters and handler latency histograms collected by the EventBus."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.published: dict[str, int] = {}
+        self.handler_latency: dict[str, LatencyHistogram] = {}
+        self.handler_errors: dict[str, int] = {}
+
+    @staticmethod
+    def handler_key(event_type_value: str, handler) -> str:
+        """Build the metric key of a handler subscribed to an event type."""
+        name = getattr(handler, "__qualname__", None) or getattr(handler, "__name__", None) or repr(handler)
+        return f"{event_type_value}:{name}"
+
+    def record_publish(self, event_type_value: str) -> None:
+        with self._lock:
+            self.published[event_type_value] = self.published.get(event_type_value, 0) + 1
+
+    def record_handler(self, key: str, duration_sec: float, failed: bool = False) -> None:
+        histogram = self.handler_latency.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.handler_latency.setdefault(key, LatencyHistogram())
+        histogram.record(duration_sec)
+        if failed:
+            with self._lock:
+                self.handler_errors[key] = self.handler_errors.get(key, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.published.clear()
+            self.handler_latency.clear()
+            self.handler_errors.clear()
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            published = dict(self.published)
+            latency = dict(self.handler_latency)
+            errors = dict(self.handler_errors)
+        return {
+            "published": published,
+            "handlers": {key: histogram.to_dict() for key, histogram in latency.items()},
+            "handler_errors": errors,
+        }
+
+
+def _window_percentile(ordered: list[float], fraction: float) -> float:
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+
+class DurationStats:
+    """Rolling duration statistics per key, e.g. a pipeline, a pipeline step or an orchestration action.
+
+    The last ``window`` durations of every key are kept, so the percentiles
+    follow the current behaviour, e.g. after an upgrade, instead of the
+    whole lifetime of the process. Totals are kept for the lifetime.
+    """
+
+    def __init__(self, window: int = 100):
+        self.window = max(1, window)
+        self._lock = threading.Lock()
+        self._recent: dict[str, deque] = {}
+        self._totals: dict[str, dict[str, int]] = {}
+
+    def record(self, key: str, duration_sec: float, failed: bool = False) -> None:
+        """Record one duration given in seconds."""
+        with self._lock:
+            recent = self._recent.get(key)
+            if recent is None:
+                recent = self._recent[key] = deque(maxlen=self.window)
+                self._totals[key] = {"count": 0, "failed": 0}
+            recent.append(duration_sec * 1000.0)
+            self._totals[key]["count"] += 1
+            if failed:
+                self._totals[key]["failed"] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            self._totals.clear()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the statistics of every key over its window, in milliseconds."""
+        with self._lock:
+            entries = {key: (list(recent), dict(self._totals[key])) for key, recent in self._recent.items()}
+
+        stats = {}
+        for key, (durations, totals) in entries.items():
+            ordered = sorted(durations)
+            stats[key] = {
+                **totals,
+                "window": len(ordered),
+                "last_ms": round(durations[-1], 3),
+                "mean_ms": round(sum(ordered) / len(ordered), 3),
+                "p50_ms": _window_percentile(ordered, 0.50),
+                "p95_ms": _window_percentile(ordered, 0.95),
+                "max_ms": round(ordered[-1], 3),
+            }
+        return stats
+
+
+def process_footprint(started: float) -> dict[str, float]:
+    """Return the seconds since ``started`` (a ``time.monotonic()`` value) and the peak RSS of this process in MB."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    max_rss_mb = max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+    return {"startup_sec": round(time.monotonic() - started, 3), "max_rss_mb": round(max_rss_mb, 1)}
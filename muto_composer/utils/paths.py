@@ -55,6 +55,61 @@ def get_state_path() -> str:
     return os.path.join(get_muto_root(), "state")
 
 
+def get_journal_path() -> str:
+    """Returns the event journal directory path.
+
+    This is where recorded composer events are appended when journaling is enabled.
+
+    Returns:
+        str: The absolute path to the event journal directory.
+    """
+    return os.path.join(get_muto_root(), "journal")
+
+
+def get_manifest_store_path() -> str:
+    """Returns the manifest store directory path.
+
+    This is where stack manifests are stored by digest for the plugins to read.
+
+    Returns:
+        str: The absolute path to the manifest store directory.
+    """
+    return os.path.join(get_muto_root(), "manifests")
+
+
+def get_blob_store_path() -> str:
+    """Returns the artifact blob store directory path.
+
+    This is where inline archive data is stored by digest after intake.
+
+    Returns:
+        str: The absolute path to the blob store directory.
+    """
+    return os.path.join(get_muto_root(), "blobs")
+
+
+def get_twin_cache_path() -> str:
+    """Returns the twin definition cache directory path.
+
+    This is where stack definitions fetched from CoreTwin are shared between processes.
+
+    Returns:
+        str: The absolute path to the twin definition cache directory.
+    """
+    return os.path.join(get_muto_root(), "twin_cache")
+
+
+def get_step_cache_path() -> str:
+    """Returns the pipeline step cache directory path.
+
+    This is where results of cacheable pipeline steps are memoized.
+
+    Returns:
+        str: The absolute path to the step cache directory.
+    """
+    return os.path.join(get_muto_root(), "step_cache")
+
+
 def ensure_directories() -> None:
     """Ensure all required Muto directories exist.
 
@@ -0,0 +1,295 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Incremental apply planning for launched stacks.
+
+``plan_apply`` compares the stack that is running with the stack being
+applied, using ``Stack.compare_nodes`` and ``Stack.compare_composable``, and
+returns an ``ApplyPlan``: nodes and containers to start, stop and restart, and
+nodes whose only change is the value of ROS parameters. ``execute_plan``
+carries the plan out on the launchers of the running stack, so an update
+touches only what changed instead of restarting every process.
+"""
+
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+from rcl_interfaces.srv import SetParameters
+from rclpy.parameter import Parameter
+
+from muto_composer.model.stack import Stack, entity_key, process_label
+from muto_composer.utils.futures import wait_for_future
+from muto_composer.workflow.launcher import Ros2LaunchParent
+
+# Seconds a runtime parameter change may take before the node is restarted instead
+PARAM_SET_TIMEOUT = 10.0
+
+# Node and container attributes that only take effect when the process starts
+_LAUNCH_IGNORED = ("param", "action")
+_CONTAINER_ATTRIBUTES = ("package", "executable", "output", "remap")
+
+
+@dataclass(frozen=True)
+class ApplyPlan:
+    """Actions that turn the running stack into the applied stack.
+
+    Nodes and containers are identified by their fully qualified name, see
+    ``entity_key``. A container is started, stopped or restarted with all of
+    its composable nodes.
+    """
+
+    start: tuple[str, ...] = ()
+    stop: tuple[str, ...] = ()
+    restart: tuple[str, ...] = ()
+    # Node key to the new values of its changed ROS parameters
+    reconfigure: Mapping[str, Mapping[str, Any]] = field(default_factory=lambda: MappingProxyType({}))
+    unchanged: tuple[str, ...] = ()
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the running stack already matches the applied stack."""
+        return not (self.start or self.stop or self.restart or self.reconfigure)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the plan as a JSON-serializable dictionary."""
+        return {
+            "start": list(self.start),
+            "stop": list(self.stop),
+            "restart": list(self.restart),
+            "reconfigure": {key: dict(params) for key, params in self.reconfigure.items()},
+            "unchanged": list(self.unchanged),
+        }
+
+
+def _launch_config(node) -> dict[str, Any]:
+    manifest = node.toManifest()
+    for key in _LAUNCH_IGNORED:
+        manifest.pop(key, None)
+    return manifest
+
+
+def _parameter_changes(old, new) -> dict[str, Any] | None:
+    """Return the new values of changed ROS parameters, None if a parameter was removed."""
+    changes = {}
+    for diff in Stack.compare_ros_params(old.ros_params, new.ros_params):
+        if diff["in_node2"] is None:
+            return None
+        changes[diff["key"]] = diff["in_node2"]
+    return changes
+
+
+def _compare_node(old, new) -> tuple[bool, dict[str, Any]]:
+    """Return whether a node must be restarted and otherwise its parameter changes."""
+    if _launch_config(old) != _launch_config(new):
+        return True, {}
+    changes = _parameter_changes(old, new)
+    if changes is None:
+        return True, {}
+    return False, changes
+
+
+def _compare_container(old, new) -> tuple[bool, dict[str, dict[str, Any]]]:
+    """Return whether a container must be restarted and otherwise the parameter changes of its nodes."""
+    if any(getattr(old, attribute) != getattr(new, attribute) for attribute in _CONTAINER_ATTRIBUTES):
+        return True, {}
+    old_nodes = {entity_key(n): n for n in old.nodes}
+    new_nodes = {entity_key(n): n for n in new.nodes}
+    if old_nodes.keys() != new_nodes.keys():
+        return True, {}
+
+    reconfigure = {}
+    for key, old_node in old_nodes.items():
+        restart, changes = _compare_node(old_node, new_nodes[key])
+        if restart:
+            return True, {}
+        if changes:
+            reconfigure[key] = changes
+    return False, reconfigure
+
+
+def plan_apply(current: Stack, next_stack: Stack) -> ApplyPlan:
+    """Plan the actions that turn the running stack into the applied stack.
+
+    Args:
+        current: The stack that is running.
+        next_stack: The stack being applied.
+
+    Returns:
+        ApplyPlan: Nodes are started when added, stopped when removed and
+        restarted when anything but ROS parameter values changed, or when a
+        parameter was removed. Other parameter changes are applied at runtime.
+    """
+    start, stop, restart, unchanged = [], [], [], []
+    reconfigure = {}
+
+    # compare_nodes matches nodes by identity, so a node whose executable or
+    # arguments changed is both removed and added under the same key
+    _common, removed, added = current.compare_nodes(next_stack)
+    removed_keys = {entity_key(n) for n in removed}
+    added_keys = {entity_key(n) for n in added}
+    replaced = removed_keys & added_keys
+    start.extend(added_keys - replaced)
+    stop.extend(removed_keys - replaced)
+    restart.extend(replaced)
+
+    current_nodes = {entity_key(n): n for n in current.flatten_nodes([])}
+    next_nodes = {entity_key(n): n for n in next_stack.flatten_nodes([])}
+    for key in (current_nodes.keys() & next_nodes.keys()) - replaced:
+        must_restart, changes = _compare_node(current_nodes[key], next_nodes[key])
+        if must_restart:
+            restart.append(key)
+        elif changes:
+            reconfigure[key] = MappingProxyType(changes)
+        else:
+            unchanged.append(key)
+
+    common, added_containers, removed_containers = current.compare_composable(next_stack)
+    start.extend(entity_key(c) for c in added_containers)
+    stop.extend(entity_key(c) for c in removed_containers)
+    next_containers = {entity_key(c): c for c in next_stack.flatten_composable([])}
+    for container in common:
+        key = entity_key(container)
+        must_restart, node_changes = _compare_container(container, next_containers[key])
+        if must_restart:
+            restart.append(key)
+        elif node_changes:
+            reconfigure.update({node_key: MappingProxyType(changes) for node_key, changes in node_changes.items()})
+        else:
+            unchanged.append(key)
+
+    return ApplyPlan(
+        start=tuple(sorted(start)),
+        stop=tuple(sorted(stop)),
+        restart=tuple(sorted(restart)),
+        reconfigure=MappingProxyType(dict(sorted(reconfigure.items()))),
+        unchanged=tuple(sorted(unchanged)),
+    )
+
+
+def set_parameters(node, parameters: Mapping[str, Mapping[str, Any]], logger=None) -> set[str]:
+    """Set ROS parameters of running nodes through their ``set_parameters`` services.
+
+    Each node gets one request with all of its parameters. The requests are sent
+    together and share one ``PARAM_SET_TIMEOUT``.
+
+    Args:
+        node: The rclpy node that sends the requests. It must be spinning.
+        parameters: Node key to the new values of its parameters.
+        logger: Optional logger.
+
+    Returns:
+        set[str]: Keys of the nodes where some parameter was not set.
+    """
+    failed = set()
+    deadline = time.monotonic() + PARAM_SET_TIMEOUT
+    clients, pending = [], {}
+
+    def _fail(node_key, reason):
+        failed.add(node_key)
+        if logger:
+            logger.warning(f"Failed to set parameters of {node_key}: {reason}")
+
+    try:
+        for node_key, values in parameters.items():
+            request = SetParameters.Request()
+            try:
+                request.parameters = [Parameter(name, value=value).to_parameter_msg() for name, value in values.items()]
+            except (TypeError, ValueError) as e:
+                _fail(node_key, e)
+                continue
+            client = node.create_client(
+                SetParameters,
+                f"{node_key}/set_parameters",
+                callback_group=getattr(node, "client_callback_group", None),
+            )
+            clients.append(client)
+            if not client.wait_for_service(timeout_sec=max(0.0, deadline - time.monotonic())):
+                _fail(node_key, "service not available")
+                continue
+            pending[node_key] = client.call_async(request)
+
+        for node_key, future in pending.items():
+            try:
+                wait_for_future(future, max(0.0, deadline - time.monotonic()), description="set_parameters")
+                results = future.result().results
+            except Exception as e:
+                _fail(node_key, e)
+                continue
+            reasons = [result.reason for result in results if not result.successful]
+            if reasons:
+                _fail(node_key, "; ".join(reasons))
+    finally:
+        for client in clients:
+            node.destroy_client(client)
+    return failed
+
+
+def kill_processes(launchers: list, keys) -> list:
+    """Kill the processes of the nodes and containers with the given keys.
+
+    Returns:
+        list: The launchers left without processes, which shut themselves down.
+    """
+    labels = {process_label(key) for key in keys}
+    return [launcher for launcher in launchers if launcher.kill_by_label(labels)]
+
+
+def _owner_key(stack: Stack, node_key: str) -> str:
+    """Return the key of the process running a node: its container, or the node itself."""
+    for container in stack.flatten_composable([]):
+        if any(entity_key(n) == node_key for n in container.nodes):
+            return entity_key(container)
+    return node_key
+
+
+def execute_plan(plan: ApplyPlan, stack: Stack, launchers: list, node=None, logger=None) -> list:
+    """Carry out an apply plan on the launchers of the running stack.
+
+    Nodes whose parameters cannot be changed at runtime are restarted, and
+    unchanged nodes and containers that are no longer running, e.g. after a
+    crash, are started again.
+
+    Args:
+        plan: The plan from ``plan_apply``.
+        stack: The stack being applied.
+        launchers: Launchers of the running stack.
+        node: The rclpy node that sets parameters at runtime. Without it,
+            reconfigured nodes are restarted.
+        logger: Optional logger.
+
+    Returns:
+        list: The launchers of the applied stack, i.e. the given launchers that
+        still run processes and a new one for the started and restarted nodes.
+    """
+    kill = set(plan.stop) | set(plan.restart)
+    launch = set(plan.start) | set(plan.restart)
+    if plan.reconfigure:
+        failed = set(plan.reconfigure) if node is None else set_parameters(node, plan.reconfigure, logger)
+        for node_key in failed:
+            owner = _owner_key(stack, node_key)
+            kill.add(owner)
+            launch.add(owner)
+
+    emptied = kill_processes(launchers, kill) if kill else []
+    launchers = [launcher for launcher in launchers if launcher not in emptied]
+    running = set().union(*(launcher.running_labels() for launcher in launchers))
+    launch.update(key for key in plan.unchanged if process_label(key) not in running)
+    if launch:
+        launcher = Ros2LaunchParent([])
+        stack.launch_selected(launcher, launch)
+        launchers.append(launcher)
+    return launchers
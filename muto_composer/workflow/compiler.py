@@ -0,0 +1,291 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Pipeline compiler for Muto Composer.
+
+``compile_pipeline`` turns a pipeline definition into an immutable
+``PipelinePlan`` when the configuration is loaded. Plugin service types are
+resolved, step references validated, conditions compiled and the step order
+computed once, so an execution only walks the plan. Steps whose condition
+can never hold are reported as warnings.
+"""
+
+import importlib
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+from muto_composer.workflow.safe_evaluator import CompiledCondition, SafeEvaluator
+
+PLUGIN_MODULE = "muto_msgs.srv"
+
+
+@dataclass(frozen=True)
+class PlannedStep:
+    """A pipeline or compensation step with its resolved service type."""
+
+    name: str
+    plugin_name: str
+    plugin: Any
+    service: str
+    condition: CompiledCondition | None = None
+    depends_on: tuple[str, ...] = ()
+    compensates: tuple[str, ...] = ()
+    timeout: float | None = None  # Seconds the service call may take
+    cache: bool = False  # Memoize successful results by input manifest
+    in_process: bool = False  # Call the plugin inside the composer process instead of its service
+
+
+@dataclass(frozen=True)
+class PlanItem:
+    """A ``sequence`` or ``parallel`` pipeline item.
+
+    ``order`` lists the step names in an order that satisfies their dependencies.
+    """
+
+    parallel: bool
+    steps: tuple[PlannedStep, ...]
+    order: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class PipelinePlan:
+    """Immutable execution plan of a pipeline."""
+
+    name: str
+    items: tuple[PlanItem, ...]
+    compensation: tuple[PlannedStep, ...]
+    step_names: tuple[str, ...]
+    plugins: Mapping[str, Any]
+    endpoints: tuple[tuple[Any, str], ...]
+    warnings: tuple[str, ...] = field(default=())
+    timeout: float | None = None  # Seconds the steps of an execution may take
+
+
+def _item_steps(item: dict) -> list:
+    if "parallel" in item:
+        return item.get("parallel") or []
+    return item.get("sequence") or []
+
+
+def resolve_plugin(plugin_name: str, plugin_cache: dict | None = None, compensation: bool = False):
+    """Return the service type of a plugin, resolving each name once per cache.
+
+    Raises:
+        ImportError: If the plugin service module cannot be imported.
+        ValueError: If the module has no service type of that name.
+    """
+    if plugin_cache is not None and plugin_name in plugin_cache:
+        return plugin_cache[plugin_name]
+
+    module = importlib.import_module(PLUGIN_MODULE)
+    try:
+        plugin = getattr(module, plugin_name)
+    except AttributeError as exc:
+        kind = "Compensation Plugin" if compensation else "Plugin"
+        raise ValueError(
+            f"{kind} '{plugin_name}' not found in module '{PLUGIN_MODULE}'. "
+            "Ensure the plugin has a corresponding service definition."
+        ) from exc
+
+    if plugin_cache is not None:
+        plugin_cache[plugin_name] = plugin
+    return plugin
+
+
+def topological_order(steps: list) -> list:
+    """Return the step names of a parallel block ordered after their dependencies.
+
+    Raises:
+        ValueError: If a step depends on itself or the dependencies contain a cycle.
+    """
+    names = [step.get("name") for step in steps]
+    dependencies = {}
+    for step in steps:
+        if step.get("name") in step.get("depends_on", []):
+            raise ValueError(f"Step '{step.get('name')}' depends on itself")
+        dependencies[step.get("name")] = [d for d in step.get("depends_on", []) if d in names]
+
+    order = []
+    remaining = list(names)
+    while remaining:
+        ready = [name for name in remaining if all(d in order for d in dependencies[name])]
+        if not ready:
+            raise ValueError(f"Dependency cycle between steps: {', '.join(remaining)}")
+        order.extend(ready)
+        remaining = [name for name in remaining if name not in ready]
+    return order
+
+
+def _failing_condition(expression: str, error: ValueError) -> CompiledCondition:
+    def evaluate(_context):
+        raise error.__cause__ or error
+
+    return CompiledCondition(expression, frozenset(), evaluate)
+
+
+def compile_pipeline(
+    name: str,
+    steps: list,
+    compensation: list | None,
+    plugin_cache: dict | None = None,
+    strict: bool = True,
+    timeout: float | None = None,
+    step_timeout: float | None = None,
+) -> PipelinePlan:
+    """
+    Validate a pipeline definition and compile it into a plan.
+
+    Args:
+        name: Pipeline name.
+        steps: The ``pipeline`` items, each holding a ``sequence`` or ``parallel`` list of steps.
+        compensation: Compensation steps.
+        plugin_cache: Plugin service types shared between the pipelines of a configuration.
+        strict: Reject invalid conditions. Otherwise they fail the step when evaluated.
+        timeout: Deadline of an execution in seconds, None for no deadline.
+        step_timeout: Timeout of steps that do not set ``timeout``, None for no timeout.
+
+    Returns:
+        PipelinePlan: The execution plan.
+
+    Raises:
+        ValueError: If a step name is duplicated, a step or plugin reference is
+            unknown, a condition is invalid or dependencies form a cycle.
+    """
+    plugin_cache = {} if plugin_cache is None else plugin_cache
+    plugins = {}
+
+    def plan_step(step: dict, is_compensation: bool = False) -> PlannedStep:
+        plugin_name = step.get("plugin")
+        service = step.get("service")
+        if not plugin_name or not service:
+            raise ValueError("Step must contain 'plugin' and 'service' fields.")
+        plugins[plugin_name] = resolve_plugin(plugin_name, plugin_cache, is_compensation)
+        condition = step.get("condition")
+        if condition:
+            try:
+                condition = SafeEvaluator.compile(condition)
+            except ValueError as e:
+                if strict:
+                    raise
+                condition = _failing_condition(condition, e)
+        return PlannedStep(
+            name=step.get("name") or service,
+            plugin_name=plugin_name,
+            plugin=plugins[plugin_name],
+            service=service,
+            condition=condition or None,
+            depends_on=tuple(step.get("depends_on", ())),
+            compensates=tuple(step.get("compensates", ())),
+            timeout=step.get("timeout") or step_timeout or None,
+            cache=bool(step.get("cache", False)),
+            in_process=bool(step.get("in_process", False)),
+        )
+
+    items = []
+    seen = []
+    for item in steps:
+        item_steps = _item_steps(item)
+        names = [step.get("name") for step in item_steps]
+        earlier = set(seen)
+        for step_name in names:
+            if step_name in seen:
+                raise ValueError(f"Duplicate step name '{step_name}' in pipeline '{name}'")
+            seen.append(step_name)
+
+        parallel = "parallel" in item
+        for index, step in enumerate(item_steps):
+            allowed = earlier | set(names if parallel else names[:index])
+            for dependency in step.get("depends_on", []):
+                if dependency not in allowed:
+                    raise ValueError(
+                        f"Step '{step.get('name')}' depends on '{dependency}', "
+                        "which is not an earlier step or a step of the same parallel block"
+                    )
+        order = topological_order(item_steps) if parallel else names
+        items.append(PlanItem(parallel, tuple(plan_step(step) for step in item_steps), tuple(order)))
+
+    compensation_steps = tuple(plan_step(step, is_compensation=True) for step in compensation or [])
+    for step in compensation_steps:
+        for step_name in step.compensates:
+            if step_name not in seen:
+                raise ValueError(f"Compensation step '{step.service}' compensates unknown step '{step_name}'")
+
+    endpoints = []
+    for step in [step for item in items for step in item.steps] + list(compensation_steps):
+        if (step.plugin, step.service) not in endpoints:
+            endpoints.append((step.plugin, step.service))
+
+    return PipelinePlan(
+        name=name,
+        items=tuple(items),
+        compensation=compensation_steps,
+        step_names=tuple(seen),
+        plugins=MappingProxyType(plugins),
+        endpoints=tuple(endpoints),
+        warnings=tuple(_lint(items, compensation_steps)),
+        timeout=timeout or None,
+    )
+
+
+def _lint(items: list, compensation: tuple) -> list:
+    """Report steps that are always skipped and compensation steps that can never run.
+
+    A condition is decided at load time when every name it refers to is a step
+    that cannot have run when it is evaluated: the step itself, a step of a
+    later item, or a step that is always skipped. Such steps read as missing,
+    i.e. False. Context variables and concurrent steps leave it undecided.
+    """
+    all_names = {step.name for item in items for step in item.steps}
+    warnings = []
+    finished, never = set(), set()
+    for item in items:
+        by_name = {step.name: step for step in item.steps}
+        for index, step_name in enumerate(item.order):
+            step = by_name[step_name]
+            before, concurrent = set(finished), set()
+            if item.parallel:
+                pending = list(step.depends_on)
+                while pending:
+                    dependency = pending.pop()
+                    if dependency in by_name and dependency not in before:
+                        before.add(dependency)
+                        pending.extend(by_name[dependency].depends_on)
+                concurrent = set(by_name) - before - {step_name}
+            else:
+                before |= set(item.order[:index])
+
+            if step.condition is None or not all(
+                name in never or (name in all_names and name not in before and name not in concurrent)
+                for name in step.condition.names
+            ):
+                continue
+            try:
+                always_skipped = not step.condition({})
+            except ValueError as e:
+                warnings.append(f"Step '{step_name}' always fails its condition: {e}")
+                continue
+            if always_skipped:
+                never.add(step_name)
+                warning = f"Step '{step_name}' is always skipped by its condition '{step.condition.expression}'"
+                if step.condition.names:
+                    warning += f", it refers to steps that have not run: {', '.join(sorted(step.condition.names))}"
+                warnings.append(warning)
+        finished |= set(item.order)
+
+    for step in compensation:
+        if step.compensates and all(name in never for name in step.compensates):
+            warnings.append(f"Compensation step '{step.name}' is unreachable, the steps it compensates never run")
+    return warnings
@@ -17,6 +17,7 @@ import concurrent.futures
 import contextlib
 import multiprocessing
 import os
+import re
 import signal
 from collections import OrderedDict
 
@@ -29,6 +30,14 @@ from launch_ros.actions import Node
 
 from muto_composer.introspection.model.difference import Difference
 
+# Launch names processes ``<label>-<n>``
+_PROCESS_NUMBER = re.compile(r"-\d+$")
+
+
+def _launch_label(process_name: str) -> str:
+    """Return the label a process was launched with: its name without the ``-<n>`` launch adds."""
+    return _PROCESS_NUMBER.sub("", process_name)
+
 
 class Ros2LaunchParent:
     """
@@ -352,6 +361,32 @@ class Ros2LaunchParent:
                 )
                 self._process.terminate()
 
+    def running_labels(self) -> set[str]:
+        """Return the labels of the processes that are running."""
+        with self._lock:
+            return {_launch_label(process_name) for node in self._active_nodes for process_name in node}
+
+    def kill_by_label(self, labels) -> bool:
+        """
+        Kills the active nodes launched with one of the given labels, e.g. ``robot__talker``.
+        Shuts down the LaunchService when no nodes remain.
+
+        Returns:
+            bool: Whether no nodes remain.
+        """
+        labels = set(labels)
+        with self._lock:
+            names = [
+                process_name
+                for node in self._active_nodes
+                for process_name in node
+                if _launch_label(process_name) in labels
+            ]
+        if names:
+            self.kill_nodes_by_name(names)
+        with self._lock:
+            return not self._active_nodes
+
     def _event_handler(self, action, event, nodes_list, lock):
         """
         Generic event handler for both process start and exit events.
@@ -11,19 +11,126 @@
 #   Composiv.ai - initial API and implementation
 #
 
-import importlib
 import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ThreadPoolExecutor, wait
 
 import rclpy
 import rclpy.logging
 from muto_msgs.msg._stack_manifest import StackManifest
 from rclpy.node import Node
 
-from muto_composer.workflow.safe_evaluator import SafeEvaluator
+from muto_composer.state.manifest_store import make_reference
+from muto_composer.utils.futures import wait_for_future
+from muto_composer.utils.hashing import is_stack_reference
+from muto_composer.workflow.compiler import PipelinePlan, PlanItem, PlannedStep, compile_pipeline
+from muto_composer.workflow.service_pool import ServiceClientPool
+
+
+class PipelineRun:
+    """
+    State of one pipeline execution: context, step results and timing.
+
+    A ``Pipeline`` only holds the definition. Every execution gets its own run,
+    so executions for different stacks can overlap without sharing step
+    results, and the context is released together with the run.
+    """
+
+    def __init__(self, pipeline_name: str, context: dict = None, timeout: float | None = None):
+        """
+        Args:
+            pipeline_name: Name of the executed pipeline.
+            context: Initial context variables.
+            timeout: Seconds the steps may take before the run fails, None for no deadline.
+        """
+        self.pipeline_name = pipeline_name
+        self.context = dict(context or {})  # Context variables and step results
+        self.executed_steps = []  # Names of the steps whose service was called, in start order
+        self.step_status = {}  # Step name to "passed", "skipped" or "failed"
+        self.success = False
+        self.failure_step = ""
+        self.error = ""
+        self.compensation_executed = False
+        self.started_at = time.time()
+        self.finished_at = None
+        self.step_durations = {}  # Step name to seconds from its start to its recorded outcome
+        self._started = time.monotonic()
+        self._finished = None
+        self._step_starts = {}
+        self.deadline = None if not timeout else time.monotonic() + timeout
+        self.cancel_event = threading.Event()
+        self.cancel_reason = ""
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self) -> float:
+        """Seconds the run took, or has taken so far, on the monotonic clock."""
+        return (self._finished or time.monotonic()) - self._started
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self, reason: str = "Pipeline run cancelled"):
+        """Stop the run: running steps stop waiting, no further steps start and compensation runs."""
+        with self._lock:
+            if not self.cancel_reason:
+                self.cancel_reason = reason
+        self.cancel_event.set()
+
+    def step_timeout(self, step: PlannedStep) -> float | None:
+        """Seconds a step may take: its own timeout, bounded by the run deadline."""
+        if self.deadline is None:
+            return step.timeout
+        remaining = self.deadline - time.monotonic()
+        return remaining if step.timeout is None else min(step.timeout, remaining)
+
+    def context_snapshot(self) -> dict:
+        """Return a copy of the context for evaluating a condition."""
+        with self._lock:
+            return dict(self.context)
+
+    def step_started(self, step_name: str):
+        with self._lock:
+            self.executed_steps.append(step_name)
+            self._step_starts[step_name] = time.monotonic()
+
+    def record(self, step_name: str, status: str, response=None, error: str = ""):
+        """Record the outcome of a step; the first failure is kept as the failure step.
+
+        A step that was started is timed from its start, covering service
+        discovery, the call and the handling of its response.
+        """
+        with self._lock:
+            started = self._step_starts.pop(step_name, None)
+            if started is not None:
+                self.step_durations[step_name] = time.monotonic() - started
+            self.step_status[step_name] = status
+            if response is not None:
+                self.context[step_name] = response
+            if status == "failed" and not self.failure_step:
+                self.failure_step = step_name
+                self.error = error
+
+    def finish(self, success: bool):
+        self.success = success
+        self.finished_at = time.time()
+        self._finished = time.monotonic()
 
 
 class Pipeline:
-    def __init__(self, name, steps, compensation):
+    def __init__(
+        self,
+        name,
+        steps,
+        compensation,
+        manifest_store=None,
+        client_pool=None,
+        plan: PipelinePlan = None,
+        step_cache=None,
+        in_process_plugins=None,
+    ):
         """
         Initializes the Pipeline with a name, steps, and compensation steps.
 
@@ -31,158 +138,314 @@ class Pipeline:
             name (str): The name of the pipeline.
             steps (list): A list of steps to execute in the pipeline.
             compensation (list): A list of compensation steps to execute on failure.
+            manifest_store (ManifestStore, optional): Store used to pass manifests to
+                the plugins by reference. Manifests are passed inline when not set.
+            client_pool (ServiceClientPool, optional): Persistent node whose clients are
+                used for the steps. A node is created per execution when not set.
+            plan (PipelinePlan, optional): Compiled execution plan of the steps. When not
+                given the steps are compiled, and invalid conditions fail their step when run.
+            step_cache (StepCache, optional): Cache of the results of steps marked
+                ``cache: true``. Every step calls its service when not set.
+            in_process_plugins (InProcessPlugins, optional): Plugins hosted in this process,
+                used by steps marked ``in_process: true``. Those steps call the plugin
+                services when not set.
         """
         self.name = name
         self.steps = steps
         self.compensation = compensation
-        self.plugins = self.load_plugins()
+        self.manifest_store = manifest_store
+        self.client_pool = client_pool
+        self.step_cache = step_cache
+        self.in_process_plugins = in_process_plugins
         self.logger = rclpy.logging.get_logger(f"{self.name}_pipeline")
-        self.context = {}  # To store step results
+        self.plan = plan or compile_pipeline(name, steps, compensation, strict=False)
+        self.plugins = dict(self.plan.plugins)
+        self._last_run = None
 
-    def load_plugins(self) -> dict:
-        """
-        Load the plugins defined in the pipeline configuration.
+        if self.client_pool is not None:
+            self.client_pool.prepare(self.service_endpoints())
 
-        Returns:
-            dict: A dictionary mapping plugin names to their corresponding classes.
+    def create_run(self, additional_context: dict = None) -> PipelineRun:
+        """Create the state of a new execution, with the deadline of the plan."""
+        return PipelineRun(self.name, additional_context, timeout=self.plan.timeout)
 
-        Raises:
-            Exception: If a plugin class cannot be found in the module.
+    @property
+    def context(self) -> dict:
+        """Context of the most recent execution, kept for inspection."""
+        return self._last_run.context if self._last_run is not None else {}
+
+    def service_endpoints(self) -> list:
         """
-        plugin_dict = {}
-        try:
-            module_name = "muto_msgs.srv"
-            module = importlib.import_module(module_name)
-        except ImportError as e:
-            self.logger.error(f"Failed to import module '{module_name}': {e}")
-            raise
-
-        for item in self.steps:
-            sequence = item.get("sequence", [])
-            for step in sequence:
-                plugin_name = step.get("plugin")
-                if plugin_name and plugin_name not in plugin_dict:
-                    try:
-                        plugin_class = getattr(module, plugin_name)
-                        plugin_dict[plugin_name] = plugin_class
-                    except AttributeError as exc:
-                        self.logger.error(f"Plugin '{plugin_name}' not found in '{module_name}'")
-                        raise Exception(
-                            f"Plugin '{plugin_name}' not found in module '{module_name}'. "
-                            "Ensure the plugin has a corresponding service definition."
-                        ) from exc
-        for step in self.compensation:
-            plugin_name = step.get("plugin")
-            if plugin_name and plugin_name not in plugin_dict:
-                try:
-                    plugin_class = getattr(module, plugin_name)
-                    plugin_dict[plugin_name] = plugin_class
-                except AttributeError as exc:
-                    self.logger.error(f"Compensation Plugin '{plugin_name}' not found in '{module_name}'")
-                    raise Exception(
-                        f"Compensation Plugin '{plugin_name}' not found in module '{module_name}'. "
-                        "Ensure the plugin has a corresponding service definition."
-                    ) from exc
-        return plugin_dict
-
-    def execute_pipeline(self, additional_context: dict = None, next_manifest=None):
-        """
-        Execute each pipeline step sequentially.
-        If a step fails, execute compensation steps and abort the pipeline.
+        Return the (service type, service name) pairs called by the steps and compensation steps.
+        """
+        return list(self.plan.endpoints)
+
+    def execute_pipeline(
+        self, additional_context: dict = None, next_manifest=None, run: PipelineRun = None
+    ) -> PipelineRun:
+        """
+        Execute the pipeline items in order.
+
+        Steps of a ``sequence`` run one after another, each receiving the output
+        manifest of the previous one. Steps of a ``parallel`` block run
+        concurrently once their ``depends_on`` steps have passed; see
+        ``execute_parallel``. If a step fails, the compensation steps of the
+        steps that ran are executed and the pipeline is aborted.
         Supports conditional execution based on step outcomes.
 
+        Every service call is bounded by the step ``timeout`` and the pipeline
+        deadline. A step that exceeds them, or a run cancelled through
+        ``PipelineRun.cancel``, fails the run at that step.
+
         Args:
             additional_context (dict): Additional context variables to include.
+            run (PipelineRun, optional): Run created with ``create_run``, so the
+                caller can cancel it while it executes.
+
+        Returns:
+            PipelineRun: The state of this execution, including whether it succeeded.
         """
-        if additional_context:
-            self.context.update(additional_context)
+        if run is None:
+            run = self.create_run(additional_context)
+        elif additional_context:
+            run.context.update(additional_context)
+        self._last_run = run
+
+        # The pooled node outlives the execution, a private node is created otherwise
+        if self.client_pool is not None:
+            executor = self.client_pool
+        else:
+            executor = rclpy.create_node(f"{self.name}_pipeline_executor", enable_rosout=False)
 
-        executor = rclpy.create_node(f"{self.name}_pipeline_executor", enable_rosout=False)
-        failed = False
+        try:
+            input_manifest = self.toStackManifest(next_manifest)
+            status = "passed"
+            for item in self.plan.items:
+                if item.parallel:
+                    status, input_manifest = self.execute_parallel(item, executor, input_manifest, run)
+                else:
+                    for step in item.steps:
+                        status, input_manifest = self._run_step(step, executor, input_manifest, run)
+                        if status == "failed":
+                            break
+
+                if status == "failed":
+                    self.execute_compensation(executor, run)
+                    self.logger.error("Aborting the rest of the pipeline")
+                    break
+            run.finish(status != "failed")
+        finally:
+            if executor is not self.client_pool:
+                executor.destroy_node()
+        return run
 
-        input_manifest = self.toStackManifest(next_manifest)
-        for item in self.steps:
-            if failed:
-                break
-            sequence = item.get("sequence", [])
-            for step in sequence:
-                step_name = step.get("name")
-                condition = step.get("condition")
-
-                # Evaluate condition if present
-                if condition:
-                    evaluator = SafeEvaluator(self.context)
-                    try:
-                        should_execute = evaluator.eval_expr(condition)
-                        self.logger.debug(
-                            f"Evaluating condition for step '{step_name}': {condition} => {should_execute}"
-                        )
-                        if not should_execute:
-                            self.logger.info(f"Skipping step '{step_name}' due to condition: {condition}")
-                            continue
-                    except ValueError as e:
-                        self.logger.error(f"Condition evaluation failed for step '{step_name}': {e}")
-                        self.execute_compensation(executor)
-                        failed = True
-                        self.logger.error("Aborting the rest of the pipeline due to condition evaluation failure.")
-                        break
+    def execute_parallel(self, item: PlanItem, executor, input_manifest=None, run: PipelineRun = None):
+        """
+        Execute the steps of a parallel block as a dependency graph.
 
-                try:
-                    response = self.execute_step(step, executor, inputManifest=input_manifest)
-                    if not response:
-                        response = type(
-                            "Response",
-                            (),
-                            {"success": False, "err_msg": "No response from service."},
-                        )()
-                        self.logger.error(f"Step {step_name} failed due to no response.")
-                    # Store the response in context regardless of success or failure
-                    self.context[step_name] = type(
-                        "Response", (), {"success": response.success, "err_msg": response.err_msg}
-                    )()
-
-                    if not response.success:
-                        raise Exception(f"Step execution error: {response.err_msg}")
-                    input_manifest = response.output.current
-                    self.logger.info(f"Step passed: {step_name}")
+        A step starts once every step of the block it depends on has passed or
+        was skipped by its condition. Steps without dependencies in the block
+        receive the block's input manifest, others the output of their last
+        listed dependency. Step results are merged into the run context under
+        the step names, which are unique in the pipeline, so the merge does not
+        depend on completion order. After a failure no further steps are
+        started and the running ones are awaited.
 
-                except Exception as e:
-                    self.logger.warn(f"Step failed: {step_name}, Exception: {e}")
-                    self.execute_compensation(executor)
-                    failed = True
-                    self.logger.error("Aborting the rest of the pipeline")
+        Steps only run concurrently on a ``ServiceClientPool``; a private
+        executor node cannot be spun from several threads, so the block then
+        runs one step at a time in dependency order.
+
+        Returns:
+            tuple: ``("passed", manifest)`` with the output of the last passed
+            step in declaration order, or ``("failed", None)``.
+        """
+        run = run if run is not None else PipelineRun(self.name)
+        by_name = {step.name: step for step in item.steps}
+        workers = len(item.steps) if isinstance(executor, ServiceClientPool) else 1
+
+        status, outputs = {}, {}
+        pending = list(item.order)
+        running = {}
+        failed = False
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix=f"{self.name}_step") as pool:
+            while pending or running:
+                for name in list(pending):
+                    if failed or run.cancelled or len(running) >= workers:
+                        break
+                    step = by_name[name]
+                    block_dependencies = [d for d in step.depends_on if d in by_name]
+                    if not all(status.get(d) in ("passed", "skipped") for d in block_dependencies):
+                        continue
+                    step_input = outputs[block_dependencies[-1]] if block_dependencies else input_manifest
+                    pending.remove(name)
+                    running[pool.submit(self._run_step, step, executor, step_input, run)] = name
+
+                if not running:
                     break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    status[name], outputs[name] = future.result()
+                    failed = failed or status[name] == "failed"
+
+        if failed:
+            return "failed", None
+        for step in reversed(item.steps):
+            if status.get(step.name) == "passed":
+                return "passed", outputs[step.name]
+        return "passed", input_manifest
+
+    def _run_step(self, step: PlannedStep, executor, input_manifest=None, run: PipelineRun = None):
+        """
+        Evaluate the condition of a step and execute it.
 
-        executor.destroy_node()
+        Returns:
+            tuple: ``(status, manifest)`` where status is ``"passed"``,
+            ``"skipped"`` or ``"failed"``. A skipped step passes its input on.
+        """
+        run = run if run is not None else PipelineRun(self.name)
+        step_name = step.name
+        condition = step.condition
+
+        if run.cancelled:
+            self.logger.warn(f"Not starting step {step_name}: {run.cancel_reason}")
+            run.record(step_name, "failed", error=run.cancel_reason)
+            return "failed", None
+
+        # Evaluate the compiled condition if present
+        if condition is not None:
+            try:
+                should_execute = condition(run.context_snapshot())
+                self.logger.debug(
+                    f"Evaluating condition for step '{step_name}': {condition.expression} => {should_execute}"
+                )
+                if not should_execute:
+                    self.logger.info(f"Skipping step '{step_name}' due to condition: {condition.expression}")
+                    run.record(step_name, "skipped")
+                    return "skipped", input_manifest
+            except ValueError as e:
+                self.logger.error(f"Condition evaluation failed for step '{step_name}': {e}")
+                run.record(step_name, "failed", error=str(e))
+                return "failed", None
+
+        cached = self._cached_output(step, input_manifest)
+        if cached is not None:
+            self.logger.info(f"Step passed from cache: {step_name}")
+            run.record(step_name, "passed", type("Response", (), {"success": True, "err_msg": ""})())
+            return "passed", cached
+
+        run.step_started(step_name)
+        response = None
+        try:
+            response = self.execute_step(step, executor, inputManifest=input_manifest, run=run)
+            if not response:
+                response = type(
+                    "Response",
+                    (),
+                    {"success": False, "err_msg": "No response from service."},
+                )()
+                self.logger.error(f"Step {step_name} failed due to no response.")
+
+            if not response.success:
+                raise Exception(f"Step execution error: {response.err_msg}")
+            run.record(step_name, "passed", self._step_result(response))
+            self.logger.info(f"Step passed: {step_name}")
+            self._store_output(step, input_manifest, response.output.current)
+            return "passed", response.output.current
+
+        except CancelledError:
+            self.logger.warn(f"Step cancelled: {step_name}, {run.cancel_reason}")
+            run.record(step_name, "failed", error=run.cancel_reason)
+            return "failed", None
+        except Exception as e:
+            self.logger.warn(f"Step failed: {step_name}, Exception: {e}")
+            # Failed responses are kept in the context too, for conditions and reporting
+            run.record(step_name, "failed", self._step_result(response) if response else None, error=str(e))
+            return "failed", None
+
+    def _cache_key(self, step: PlannedStep, input_manifest):
+        if not step.cache or self.step_cache is None or input_manifest is None:
+            return None
+        return self.step_cache.key(step.name, step.plugin_name, step.service, self._message_fields(input_manifest))
 
-    def execute_step(self, step, executor: Node, inputManifest=None):
+    def _cached_output(self, step: PlannedStep, input_manifest):
+        """Return the memoized output manifest of a cacheable step, None on a miss."""
+        key = self._cache_key(step, input_manifest)
+        result = self.step_cache.get(key) if key else None
+        if result is None:
+            return None
+        output = StackManifest()
+        for field, value in result.get("output", {}).items():
+            setattr(output, field, value)
+        return output
+
+    def _store_output(self, step: PlannedStep, input_manifest, output_manifest):
+        key = self._cache_key(step, input_manifest)
+        if key and output_manifest is not None:
+            self.step_cache.put(key, step.name, {"output": self._message_fields(output_manifest)})
+
+    @staticmethod
+    def _message_fields(message) -> dict:
+        """Return the string and scalar fields of a StackManifest message."""
+        fields = {}
+        for field in message.get_fields_and_field_types():
+            value = getattr(message, field, None)
+            if isinstance(value, (str, int, float, bool)):
+                fields[field] = value
+        return fields
+
+    @staticmethod
+    def _step_result(response):
+        return type("Response", (), {"success": response.success, "err_msg": response.err_msg})()
+
+    def execute_step(self, step: PlannedStep, executor: Node, inputManifest=None, run: PipelineRun = None):
         """
         Executes a single step using the appropriate ROS 2 service.
 
+        Steps marked ``in_process`` call the plugin's handler directly when the
+        plugin is hosted in this process, bounded by the same timeout and
+        cancellation as a service call.
+
         Args:
-            step (dict): The step configuration containing 'plugin' and 'service'.
-            executor (Node): The ROS node used for service communication.
+            step (PlannedStep): The planned step with its service type and service name.
+            executor (Node | ServiceClientPool): The ROS node or client pool used for service communication.
+            run (PipelineRun, optional): The execution whose deadline and cancellation apply.
+                Only the step timeout applies without it.
 
         Returns:
             The response from the service call.
 
         Raises:
-            Exception: If the service call fails or required fields are missing.
+            TimeoutError: If the step exceeds its timeout or the run deadline.
+            CancelledError: If the run is cancelled before the step completes.
+            Exception: If the service call fails.
         """
-        plugin_name = step.get("plugin")
-        service_name = step.get("service")
-
-        if not plugin_name or not service_name:
-            raise ValueError("Step must contain 'plugin' and 'service' fields.")
-
-        plugin = self.plugins.get(plugin_name)
-        if not plugin:
-            raise Exception(f"Plugin '{plugin_name}' not loaded.")
+        plugin_name = step.plugin_name
+        service_name = step.service
+        plugin = step.plugin
+        timeout = run.step_timeout(step) if run is not None else step.timeout
+        cancelled = run.cancel_event if run is not None else None
+        if timeout is not None and timeout <= 0:
+            raise TimeoutError(f"Pipeline deadline passed before step {step.name} started")
+
+        if step.in_process and self.in_process_plugins is not None and self.in_process_plugins.available(plugin_name):
+            self.logger.info(f"Executing step in-process: {plugin_name}")
+            req = plugin.Request()
+            if inputManifest:
+                req.input.current = inputManifest
+            return self.in_process_plugins.call(plugin_name, service_name, req, timeout=timeout, cancelled=cancelled)
+
+        if isinstance(executor, ServiceClientPool):
+            self.logger.info(f"Executing step: {plugin_name}")
+            req = plugin.Request()
+            if inputManifest:
+                req.input.current = inputManifest
+            return executor.call(plugin, service_name, req, timeout=timeout, cancelled=cancelled)
 
         cli = executor.create_client(plugin, service_name)
         self.logger.info(f"Executing step: {plugin_name}")
 
-        if not cli.wait_for_service(timeout_sec=5.0):
+        if not cli.wait_for_service(timeout_sec=5.0 if timeout is None else min(5.0, timeout)):
             self.logger.error(f"Service '{cli.srv_name}' is not available. Cannot execute step.")
             return None
 
@@ -191,27 +454,55 @@ class Pipeline:
             req.input.current = inputManifest
 
         future = cli.call_async(req)
-        rclpy.spin_until_future_complete(executor, future)
+        self._spin_until_complete(executor, future, timeout, cancelled)
 
         if future.result():
             return future.result()
         else:
             raise Exception(f"Service call failed: {future.exception()}")
 
-    def execute_compensation(self, executor: Node):
+    def _spin_until_complete(self, executor: Node, future, timeout: float | None, cancelled=None):
+        """Spin the executor node until the future completes, times out or the run is cancelled."""
+        if timeout is None and cancelled is None:
+            rclpy.spin_until_future_complete(executor, future)
+            return
+
+        wait_for_future(
+            future,
+            timeout,
+            cancelled,
+            "Service call",
+            wait=lambda remaining: rclpy.spin_until_future_complete(executor, future, timeout_sec=remaining),
+        )
+
+    def execute_compensation(self, executor: Node, run: PipelineRun = None):
         """
         Executes compensation steps if the primary step execution fails.
 
+        A compensation step with ``compensates`` only runs if one of the listed
+        steps was executed; steps without it always run.
+
         Args:
-            executor (Node): The ROS node used for service communication.
+            executor (Node | ServiceClientPool): The ROS node or client pool used for service communication.
+            run (PipelineRun, optional): The failed execution; all compensation steps run without it.
         """
         self.logger.info("Executing compensation steps.")
-        if self.compensation:
-            for step in self.compensation:
+        executed_steps = run.executed_steps if run is not None else None
+        if run is not None:
+            run.compensation_executed = bool(self.plan.compensation)
+        if self.plan.compensation:
+            for step in self.plan.compensation:
+                if (
+                    executed_steps is not None
+                    and step.compensates
+                    and not any(name in executed_steps for name in step.compensates)
+                ):
+                    self.logger.debug(f"Skipping compensation step {step.service}, its steps did not run")
+                    continue
                 try:
                     self.execute_step(step, executor)
                 except Exception as e:
-                    self.logger.warn(f"Compensation step failed: {step.get('plugin', '')}, Exception: {e}")
+                    self.logger.warn(f"Compensation step failed: {step.plugin_name}, Exception: {e}")
         else:
             self.logger.warn("No compensation steps to execute.")
 
@@ -225,5 +516,21 @@ class Pipeline:
                 stack_msg.name = manifest["metadata"]["name"]
             else:
                 stack_msg.name = manifest.get("name", "")
-        stack_msg.stack = json.dumps(manifest)
+        stack_msg.stack = self._serialize_manifest(manifest)
         return stack_msg
+
+    def _serialize_manifest(self, manifest):
+        """Serialize a manifest for StackManifest.stack, as a store reference when possible."""
+        # Kill payloads stay inline, the plugins recognise them before resolving any manifest
+        if (
+            self.manifest_store is not None
+            and isinstance(manifest, dict)
+            and not is_stack_reference(manifest)
+            and not str(manifest.get("path", "")).endswith("/kill")
+        ):
+            try:
+                digest = self.manifest_store.put(manifest)
+                return json.dumps(make_reference(digest, self.manifest_store.path_for(digest)))
+            except (OSError, TypeError, ValueError) as e:
+                self.logger.warn(f"Failed to store manifest, passing it inline: {e}")
+        return json.dumps(manifest)
@@ -12,9 +12,31 @@
 #
 
 import ast
+import functools
 import operator as op
 
 
+class CompiledCondition:
+    """
+    A condition expression compiled into closures.
+
+    Calling it with a context evaluates the expression without parsing it again.
+    """
+
+    __slots__ = ("expression", "names", "_evaluate")
+
+    def __init__(self, expression, names, evaluate):
+        self.expression = expression
+        self.names = names  # Context names the expression refers to
+        self._evaluate = evaluate
+
+    def __call__(self, context):
+        try:
+            return self._evaluate(context)
+        except Exception as e:
+            raise ValueError(f"Invalid condition expression '{self.expression}': {e}") from e
+
+
 class SafeEvaluator:
     """
     A safe evaluator for simple expressions used in conditions.
@@ -40,36 +62,60 @@ class SafeEvaluator:
         """
         Evaluate an expression in the given context.
         """
+        return self.compile(expr)(self.context)
+
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def compile(cls, expr) -> CompiledCondition:
+        """
+        Compile an expression once for repeated evaluation.
+
+        Raises:
+            ValueError: If the expression is not valid or uses unsupported syntax.
+        """
         try:
-            expr_ast = ast.parse(expr, mode="eval").body
-            return self._eval(expr_ast)
+            names = set()
+            evaluate = cls._compile(ast.parse(expr, mode="eval").body, names)
         except Exception as e:
             raise ValueError(f"Invalid condition expression '{expr}': {e}") from e
+        return CompiledCondition(expr, frozenset(names), evaluate)
 
-    def _eval(self, node):
-        if isinstance(node, ast.BoolOp):
+    @classmethod
+    def _compile(cls, node, names):
+        if isinstance(node, ast.BoolOp) and isinstance(node.op, (ast.And, ast.Or)):
+            values = [cls._compile(value, names) for value in node.values]
             if isinstance(node.op, ast.And):
-                return all(self._eval(value) for value in node.values)
-            elif isinstance(node.op, ast.Or):
-                return any(self._eval(value) for value in node.values)
-        elif isinstance(node, ast.UnaryOp):
-            if isinstance(node.op, ast.Not):
-                return not self._eval(node.operand)
+                return lambda context: all(value(context) for value in values)
+            return lambda context: any(value(context) for value in values)
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            operand = cls._compile(node.operand, names)
+            return lambda context: not operand(context)
         elif isinstance(node, ast.Compare):
-            left = self._eval(node.left)
-            for op_, right in zip(node.ops, node.comparators, strict=False):
-                right_val = self._eval(right)
-                oper = self.operators[type(op_)]
-                if not oper(left, right_val):
-                    return False
-                left = right_val
-            return True
+            left = cls._compile(node.left, names)
+            comparisons = [
+                (cls.operators[type(op_)], cls._compile(right, names))
+                for op_, right in zip(node.ops, node.comparators, strict=False)
+            ]
+
+            def compare(context):
+                left_val = left(context)
+                for oper, right in comparisons:
+                    right_val = right(context)
+                    if not oper(left_val, right_val):
+                        return False
+                    left_val = right_val
+                return True
+
+            return compare
         elif isinstance(node, ast.Name):
-            return self.context.get(node.id, False)
+            name = node.id
+            names.add(name)
+            return lambda context: context.get(name, False)
         elif isinstance(node, ast.Attribute):
-            value = self._eval(node.value)
-            return getattr(value, node.attr, False)
+            value, attr = cls._compile(node.value, names), node.attr
+            return lambda context: getattr(value(context), attr, False)
         elif isinstance(node, ast.Constant):
-            return node.value
+            constant = node.value
+            return lambda context: constant
         else:
             raise TypeError(f"Unsupported expression: {ast.dump(node)}")
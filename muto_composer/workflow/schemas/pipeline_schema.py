@@ -11,6 +11,21 @@
 #   Composiv.ai - initial API and implementation
 #
 
+_STEP_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "service": {"type": "string"},
+        "plugin": {"type": "string"},
+        "condition": {"type": "string"},
+        "depends_on": {"type": "array", "items": {"type": "string"}},
+        "timeout": {"type": "number", "exclusiveMinimum": 0},
+        "cache": {"type": "boolean"},
+        "in_process": {"type": "boolean"},
+    },
+    "required": ["name", "service", "plugin"],
+}
+
 PIPELINE_SCHEMA = {
     "type": "object",
     "properties": {
@@ -20,26 +35,16 @@ PIPELINE_SCHEMA = {
                 "type": "object",
                 "properties": {
                     "name": {"type": "string"},
+                    "timeout": {"type": "number", "exclusiveMinimum": 0},
                     "pipeline": {
                         "type": "array",
                         "items": {
                             "type": "object",
                             "properties": {
-                                "sequence": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "name": {"type": "string"},
-                                            "service": {"type": "string"},
-                                            "plugin": {"type": "string"},
-                                            "condition": {"type": "string"},
-                                        },
-                                        "required": ["name", "service", "plugin"],
-                                    },
-                                }
+                                "sequence": {"type": "array", "items": _STEP_SCHEMA},
+                                "parallel": {"type": "array", "items": _STEP_SCHEMA},
                             },
-                            "required": ["sequence"],
+                            "oneOf": [{"required": ["sequence"]}, {"required": ["parallel"]}],
                         },
                     },
                     "compensation": {
@@ -49,6 +54,9 @@ PIPELINE_SCHEMA = {
                             "properties": {
                                 "service": {"type": "string"},
                                 "plugin": {"type": "string"},
+                                "compensates": {"type": "array", "items": {"type": "string"}},
+                                "timeout": {"type": "number", "exclusiveMinimum": 0},
+                                "in_process": {"type": "boolean"},
                             },
                             "required": ["service", "plugin"],
                         },
@@ -0,0 +1,164 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+"""
+Persistent service client pool for pipeline execution.
+
+One executor node lives for the lifetime of the composer and holds one
+service client per ``(plugin, service)`` pair, created when the pipelines are
+loaded. Client responses are handled by a background executor thread, and
+service availability is read from the node's graph cache and refreshed
+periodically, so a pipeline step is a dictionary lookup and a call instead
+of creating a node, discovering the service and tearing the node down again.
+"""
+
+import threading
+import time
+from typing import Any
+
+import rclpy
+from rclpy.executors import SingleThreadedExecutor
+
+from muto_composer.utils.futures import wait_for_future
+
+
+class ServiceClientPool:
+    """Long-lived node with pre-created plugin service clients."""
+
+    def __init__(
+        self,
+        node_name: str = "pipeline_executor",
+        refresh_period: float = 1.0,
+        wait_timeout: float = 5.0,
+        logger=None,
+    ):
+        """
+        Args:
+            node_name: Name of the executor node.
+            refresh_period: Seconds between service availability refreshes.
+            wait_timeout: Seconds to wait for a service that is not known to be available.
+            logger: Optional logger.
+        """
+        self.wait_timeout = wait_timeout
+        self.logger = logger
+
+        self.node = rclpy.create_node(node_name, enable_rosout=False)
+        self._executor = SingleThreadedExecutor()
+        self._executor.add_node(self.node)
+
+        self._lock = threading.Lock()
+        self._clients: dict[tuple[Any, str], Any] = {}
+        self._available: dict[tuple[Any, str], bool] = {}
+        self.calls = 0
+        self.unavailable = 0
+
+        self._refresh_timer = self.node.create_timer(refresh_period, self.refresh_availability)
+        self._spin_thread = threading.Thread(target=self._executor.spin, name="pipeline_executor", daemon=True)
+        self._spin_thread.start()
+
+    def get_client(self, plugin, service_name: str):
+        """Return the client of a plugin service, creating it on first use."""
+        key = (plugin, service_name)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self.node.create_client(plugin, service_name)
+                self._clients[key] = client
+                self._available[key] = client.service_is_ready()
+            return client
+
+    def prepare(self, endpoints) -> int:
+        """Create clients for ``(plugin, service)`` pairs ahead of their first call.
+
+        Returns:
+            int: Number of clients in the pool.
+        """
+        for plugin, service_name in endpoints:
+            self.get_client(plugin, service_name)
+        with self._lock:
+            return len(self._clients)
+
+    def refresh_availability(self):
+        """Update the availability of every pooled service from the graph cache."""
+        with self._lock:
+            clients = list(self._clients.items())
+        availability = {key: client.service_is_ready() for key, client in clients}
+        with self._lock:
+            self._available.update(availability)
+
+    def is_available(self, plugin, service_name: str) -> bool:
+        """Whether a service was available at the last refresh."""
+        with self._lock:
+            return self._available.get((plugin, service_name), False)
+
+    def call(self, plugin, service_name: str, request, timeout: float | None = None, cancelled=None):
+        """Call a plugin service and wait for its response.
+
+        Args:
+            plugin: Service type.
+            service_name: Service name.
+            request: Service request.
+            timeout: Seconds to wait for service discovery and the response, None waits indefinitely.
+            cancelled (threading.Event, optional): Stops waiting for the response when set.
+
+        Returns:
+            The service response, or None if the service is not available.
+
+        Raises:
+            TimeoutError: If the call does not complete within ``timeout``.
+            CancelledError: If ``cancelled`` is set before the call completes.
+            Exception: If the call fails.
+        """
+        client = self.get_client(plugin, service_name)
+        key = (plugin, service_name)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        if not self.is_available(plugin, service_name):
+            # Not seen at the last refresh; it may just have started
+            wait_timeout = self.wait_timeout if timeout is None else min(self.wait_timeout, timeout)
+            ready = client.wait_for_service(timeout_sec=wait_timeout)
+            with self._lock:
+                self._available[key] = ready
+                if not ready:
+                    self.unavailable += 1
+            if not ready:
+                if self.logger:
+                    self.logger.error(f"Service '{client.srv_name}' is not available. Cannot execute step.")
+                return None
+
+        with self._lock:
+            self.calls += 1
+
+        future = client.call_async(request)
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        wait_for_future(future, remaining, cancelled, f"Service call to '{client.srv_name}'")
+
+        if future.result():
+            return future.result()
+        raise Exception(f"Service call failed: {future.exception()}")
+
+    def metrics_snapshot(self) -> dict[str, Any]:
+        """Return pool size, availability and call counters."""
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "available": sum(1 for available in self._available.values() if available),
+                "calls": self.calls,
+                "unavailable": self.unavailable,
+            }
+
+    def shutdown(self):
+        """Stop the executor thread and destroy the pool node."""
+        self._executor.shutdown()
+        self._spin_thread.join(timeout=5.0)
+        self.node.destroy_node()
@@ -44,6 +44,13 @@ setup(
             "compose_plugin = muto_composer.plugins.compose_plugin:main",
             "provision_plugin = muto_composer.plugins.provision_plugin:main",
             "launch_plugin = muto_composer.plugins.launch_plugin:main",
+            "plugin_host = muto_composer.plugins.plugin_host:main",
+            "journal_replay = muto_composer.state.replay:main",
+        ],
+        "muto_composer.plugins": [
+            "ComposePlugin = muto_composer.plugins.compose_plugin:MutoDefaultComposePlugin",
+            "ProvisionPlugin = muto_composer.plugins.provision_plugin:MutoProvisionPlugin",
+            "LaunchPlugin = muto_composer.plugins.launch_plugin:MutoDefaultLaunchPlugin",
         ],
     },
 )
@@ -0,0 +1,231 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import copy
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+from muto_composer.model.stack import Stack
+from muto_composer.plugins.base_plugin import StackOperation
+from muto_composer.stack_handlers import json_handler
+from muto_composer.stack_handlers.json_handler import JsonStackHandler
+from muto_composer.workflow import apply_planner
+from muto_composer.workflow.apply_planner import ApplyPlan, execute_plan, plan_apply
+
+
+def _node(name, exec_name=None, rate=10, **extra):
+    node = {
+        "pkg": "demo_nodes_cpp",
+        "exec": exec_name or name,
+        "name": name,
+        "namespace": "/robot",
+        "param": [{"name": "params", "value": {"rate": rate}}],
+    }
+    node.update(extra)
+    return node
+
+
+class TestApplyPlanner(unittest.TestCase):
+    def setUp(self):
+        self.manifest = {
+            "name": "demo",
+            "node": [_node("talker"), _node("listener"), _node("relay")],
+            "composable": [
+                {
+                    "package": "rclcpp_components",
+                    "executable": "component_container",
+                    "name": "container",
+                    "namespace": "/robot",
+                    "node": [_node("camera", plugin="demo::Camera")],
+                }
+            ],
+        }
+
+    def _plan(self, change):
+        next_manifest = copy.deepcopy(self.manifest)
+        change(next_manifest)
+        return plan_apply(Stack(manifest=self.manifest), Stack(manifest=next_manifest))
+
+    def test_same_manifest_has_empty_plan(self):
+        """Test that applying the running manifest changes nothing."""
+        plan = self._plan(lambda manifest: None)
+
+        self.assertTrue(plan.is_empty)
+        self.assertEqual(plan.unchanged, ("/robot/container", "/robot/listener", "/robot/relay", "/robot/talker"))
+
+    def test_parameter_change_reconfigures_only_that_node(self):
+        """Test that a parameter-only change is applied at runtime without restarts."""
+
+        def change(manifest):
+            manifest["node"][0]["param"][0]["value"]["rate"] = 20
+            manifest["composable"][0]["node"][0]["param"][0]["value"]["rate"] = 30
+
+        plan = self._plan(change)
+
+        self.assertEqual(plan.start + plan.stop + plan.restart, ())
+        self.assertEqual(plan.to_dict()["reconfigure"], {"/robot/talker": {"rate": 20}, "/robot/camera": {"rate": 30}})
+        self.assertIn("/robot/listener", plan.unchanged)
+
+    def test_added_removed_and_changed_nodes(self):
+        """Test that added nodes start, removed nodes stop and changed nodes restart."""
+
+        def change(manifest):
+            manifest["node"][0]["exec"] = "talker_v2"
+            manifest["node"][1]["remap"] = [{"from": "chatter", "to": "news"}]
+            del manifest["node"][2]
+            manifest["node"].append(_node("logger"))
+            manifest["composable"][0]["node"].append(_node("lidar", plugin="demo::Lidar"))
+
+        plan = self._plan(change)
+
+        self.assertEqual(plan.start, ("/robot/logger",))
+        self.assertEqual(plan.stop, ("/robot/relay",))
+        self.assertEqual(plan.restart, ("/robot/container", "/robot/listener", "/robot/talker"))
+        self.assertEqual(dict(plan.reconfigure), {})
+
+    def test_removed_parameter_restarts_node(self):
+        """Test that a parameter that cannot be unset at runtime restarts the node."""
+
+        def change(manifest):
+            manifest["node"][0]["param"] = []
+
+        self.assertEqual(self._plan(change).restart, ("/robot/talker",))
+
+    def _launcher(self, *labels):
+        launcher = MagicMock()
+        launcher.running_labels.return_value = set(labels)
+        launcher.kill_by_label.return_value = False
+        return launcher
+
+    def test_execute_plan_touches_only_planned_processes(self):
+        """Test that only planned processes are killed and launched, and failed reconfigures restart."""
+        launcher = self._launcher("robot__talker", "robot__listener", "robot__container")
+        plan = ApplyPlan(
+            start=("/robot/logger",),
+            stop=("/robot/relay",),
+            reconfigure={"/robot/talker": {"rate": 20}, "/robot/camera": {"rate": 30}},
+            unchanged=("/robot/listener",),
+        )
+        stack = Stack(manifest=self.manifest)
+        node = MagicMock()
+
+        with (
+            patch.object(apply_planner, "set_parameters", return_value={"/robot/camera"}) as mock_set_parameters,
+            patch.object(apply_planner, "Ros2LaunchParent") as mock_launcher_class,
+            patch.object(Stack, "launch_selected") as mock_launch_selected,
+        ):
+            launchers = execute_plan(plan, stack, [launcher], node=node)
+
+        mock_set_parameters.assert_called_once_with(node, plan.reconfigure, None)
+        launcher.kill_by_label.assert_called_once_with({"robot__relay", "robot__container"})
+        # The camera runs in the container, which is restarted since its parameter could not be set
+        mock_launch_selected.assert_called_once_with(
+            mock_launcher_class.return_value, {"/robot/logger", "/robot/container"}
+        )
+        self.assertEqual(launchers, [launcher, mock_launcher_class.return_value])
+
+    def test_execute_plan_drops_emptied_launchers_and_restores_stopped_nodes(self):
+        """Test that emptied launchers are dropped and unchanged nodes that stopped running start again."""
+        emptied = self._launcher()
+        emptied.kill_by_label.return_value = True
+        launcher = self._launcher("robot__talker")
+        plan = ApplyPlan(stop=("/robot/relay",), unchanged=("/robot/listener", "/robot/talker"))
+
+        with (
+            patch.object(apply_planner, "Ros2LaunchParent") as mock_launcher_class,
+            patch.object(Stack, "launch_selected") as mock_launch_selected,
+        ):
+            launchers = execute_plan(plan, Stack(manifest=self.manifest), [emptied, launcher])
+
+        mock_launch_selected.assert_called_once_with(mock_launcher_class.return_value, {"/robot/listener"})
+        self.assertEqual(launchers, [launcher, mock_launcher_class.return_value])
+
+    def test_empty_plan_launches_nothing(self):
+        """Test that an empty plan leaves the launchers untouched."""
+        launcher = self._launcher("robot__talker")
+
+        with patch.object(apply_planner, "Ros2LaunchParent") as mock_launcher_class:
+            launchers = execute_plan(
+                ApplyPlan(unchanged=("/robot/talker",)), Stack(manifest=self.manifest), [launcher]
+            )
+
+        mock_launcher_class.assert_not_called()
+        launcher.kill_by_label.assert_not_called()
+        self.assertEqual(launchers, [launcher])
+
+    def _set_parameters_node(self, responses):
+        """Return a plugin node whose parameter clients answer with the given responses, by node key."""
+        node = MagicMock()
+        node.clients = {}
+
+        def create_client(srv_type, service_name, callback_group=None):
+            client = MagicMock()
+            node_key = service_name.rsplit("/", 1)[0]
+            node.clients[node_key] = client
+            response = responses.get(node_key)
+            client.wait_for_service.return_value = response is not None
+            future = Future()
+            future.set_result(response)
+            client.call_async.return_value = future
+            return client
+
+        node.create_client.side_effect = create_client
+        return node
+
+    def test_set_parameters_sends_one_request_per_node(self):
+        """Test that parameters are set with one request per node and failed nodes are reported."""
+        ok = MagicMock(results=[MagicMock(successful=True), MagicMock(successful=True)])
+        rejected = MagicMock(results=[MagicMock(successful=False, reason="read only")])
+        node = self._set_parameters_node({"/robot/talker": ok, "/robot/camera": rejected})
+
+        failed = apply_planner.set_parameters(
+            node,
+            {"/robot/talker": {"rate": 20, "topic": "chatter"}, "/robot/camera": {"rate": 30}, "/robot/gone": {"a": 1}},
+        )
+
+        self.assertEqual(failed, {"/robot/camera", "/robot/gone"})
+        self.assertEqual(
+            [c.args[1] for c in node.create_client.call_args_list],
+            ["/robot/talker/set_parameters", "/robot/camera/set_parameters", "/robot/gone/set_parameters"],
+        )
+        node.clients["/robot/talker"].call_async.assert_called_once()
+        request = node.clients["/robot/talker"].call_async.call_args[0][0]
+        self.assertEqual(len(request.parameters), 2)
+        node.clients["/robot/gone"].call_async.assert_not_called()
+        self.assertEqual(node.destroy_client.call_count, 3)
+
+    def test_start_applies_to_running_stack(self):
+        """Test that starting a running stack goes through the planner instead of relaunching it."""
+        handler = JsonStackHandler(logger=MagicMock())
+        context = MagicMock(hash="abc", metadata={"name": "demo"}, stack_data={"launch": self.manifest})
+        context.operation = StackOperation.START
+        plugin = MagicMock()
+
+        with (
+            patch.object(json_handler, "Ros2LaunchParent") as mock_launcher_class,
+            patch.object(Stack, "launch"),
+            patch.object(json_handler, "execute_plan", return_value=["launcher"]) as mock_execute_plan,
+        ):
+            self.assertTrue(handler.apply_to_plugin(plugin, context, None, None))
+            self.assertTrue(handler.apply_to_plugin(plugin, context, None, None))
+
+        mock_launcher_class.return_value.kill.assert_not_called()
+        mock_execute_plan.assert_called_once()
+        plan = mock_execute_plan.call_args[0][0]
+        self.assertTrue(plan.is_empty)
+        self.assertIs(mock_execute_plan.call_args.kwargs["node"], plugin)
+        self.assertEqual(handler.managed_launchers, {"abc": ["launcher"]})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from muto_composer.plugins.base_plugin import BasePlugin, StackOperation
+from muto_composer.state.manifest_store import ManifestStore, make_reference
+from muto_composer.utils.stack_parser import StackParser
+
+
+class TestBasePluginManifestReference(unittest.TestCase):
+    def setUp(self):
+        self.store_dir = tempfile.mkdtemp()
+        self.node = BasePlugin.__new__(BasePlugin)
+        self.node.get_logger = MagicMock()
+        self.node.stack_parser = StackParser(self.node.get_logger())
+        self.node.stack_registry = MagicMock()
+        self.node.manifest_store = ManifestStore(directory=self.store_dir)
+
+        self.manifest = {
+            "metadata": {"name": "stored_stack", "content_type": "stack/json"},
+            "launch": {"node": [{"name": "talker", "pkg": "demo_nodes_cpp", "exec": "talker"}]},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+
+    def test_reference_is_resolved_to_the_stored_manifest(self):
+        """Test that a stored manifest reference reaches the handler as the manifest itself."""
+        digest = self.node.manifest_store.put(self.manifest)
+        request = MagicMock()
+        request.input.current.stack = json.dumps(make_reference(digest, self.node.manifest_store.path_for(digest)))
+
+        handler, context = self.node.find_stack_handler(request)
+
+        self.assertIs(handler, self.node.stack_registry.get_handler.return_value)
+        self.node.stack_registry.get_handler.assert_called_once_with(self.manifest)
+        self.assertEqual(context.stack_data, self.manifest)
+        self.assertEqual(context.hash, digest)
+        self.assertEqual(context.operation, StackOperation.START)
+
+    def test_unknown_reference_is_not_used_as_manifest(self):
+        """Test that a reference to a missing manifest does not pass for a manifest."""
+        reference = json.dumps(make_reference("0" * 64, "/nonexistent/manifest.json"))
+
+        self.assertIsNone(self.node._safely_parse_stack(reference))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from muto_composer.state.blob_store import BlobStore, spool_inline_data
+from muto_composer.state.persistence import StackState
+
+
+class TestBlobStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = BlobStore(directory=self.directory)
+        self.data = os.urandom(4096)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _archive_manifest(self, data):
+        return {
+            "metadata": {"name": "stack_a", "content_type": "stack/archive"},
+            "launch": {"data": data, "properties": {"filename": "stack_a.tar.gz"}},
+        }
+
+    def test_inline_data_is_replaced_by_reference(self):
+        """Test that archive data is decoded into the store and referenced by digest and size."""
+        manifest = self._archive_manifest(base64.b64encode(self.data).decode())
+
+        self.assertTrue(spool_inline_data(manifest, self.store))
+
+        digest = hashlib.sha256(self.data).hexdigest()
+        self.assertNotIn("data", manifest["launch"])
+        self.assertEqual(manifest["launch"]["blob"], {"digest": digest, "size": len(self.data)})
+        self.assertEqual(manifest["launch"]["properties"], {"filename": "stack_a.tar.gz"})
+
+        target = os.path.join(self.directory, "restored.tar.gz")
+        self.assertEqual(self.store.copy_to(manifest["launch"]["blob"], target), digest)
+        with open(target, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_other_payloads_are_left_unchanged(self):
+        """Test that invalid data and non-archive manifests stay inline."""
+        invalid = self._archive_manifest("not base64!")
+        json_stack = {"metadata": {"name": "stack_b", "content_type": "stack/json"}, "launch": {"data": "AAAA"}}
+
+        self.assertFalse(spool_inline_data(invalid, self.store))
+        self.assertFalse(spool_inline_data(json_stack, self.store))
+        self.assertFalse(spool_inline_data({"value": {"stackId": "org.eclipse.muto:stack"}}, self.store))
+        self.assertEqual(invalid["launch"]["data"], "not base64!")
+        self.assertEqual(json_stack["launch"]["data"], "AAAA")
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_missing_or_corrupted_blob_is_rejected(self):
+        """Test that copying a blob fails when it is missing or does not match its digest."""
+        digest = self.store.put(self.data)
+        target = os.path.join(self.directory, "restored")
+
+        with open(self.store.path_for(digest), "r+b") as f:
+            f.write(b"corrupt")
+        with self.assertRaises(ValueError):
+            self.store.copy_to({"digest": digest, "size": len(self.data)}, target)
+        with self.assertRaises(ValueError):
+            self.store.copy_to({"digest": "0" * 64}, target)
+        self.assertFalse(os.path.exists(target))
+        self.assertEqual(os.listdir(self.directory), [digest])
+
+    def test_corrupted_blob_leaves_destination_untouched(self):
+        """Test that a blob that does not match its reference does not replace the destination."""
+        digest = self.store.put(self.data)
+        target = os.path.join(self.directory, "restored")
+        with open(target, "wb") as f:
+            f.write(b"previous artifact")
+
+        with self.assertRaises(ValueError):
+            self.store.copy_to({"digest": digest, "size": len(self.data) + 1}, target)
+
+        with open(target, "rb") as f:
+            self.assertEqual(f.read(), b"previous artifact")
+        self.assertCountEqual(os.listdir(self.directory), [digest, "restored"])
+
+    def _store_blobs(self, store, count):
+        digests = []
+        for i in range(count):
+            digest = store.put(bytes([i]) * 1024)
+            os.utime(store.path_for(digest), (1000 + i, 1000 + i))
+            digests.append(digest)
+        return digests
+
+    def _persistence(self, current=None, previous=None):
+        def manifest(digest):
+            return {"launch": {"blob": {"digest": digest, "size": 1024}}} if digest else None
+
+        persistence = MagicMock()
+        state = StackState(stack_name="stack_a", current_stack=manifest(current), previous_stack=manifest(previous))
+        persistence.get_all_stack_states.return_value = {"stack_a": state}
+        return persistence
+
+    def test_least_recently_used_blobs_are_pruned(self):
+        """Test that the oldest blobs are pruned beyond max_entries unless a stack state references them."""
+        setup = BlobStore(directory=self.directory, max_entries=0, max_bytes=0)
+        oldest, older, old, recent = self._store_blobs(setup, 4)
+        store = BlobStore(
+            directory=self.directory, max_entries=4, persistence=self._persistence(current=old, previous=oldest)
+        )
+        target_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, target_directory, ignore_errors=True)
+        # Copying a blob marks it as recently used
+        store.copy_to({"digest": older}, os.path.join(target_directory, "restored"))
+
+        newest = store.put(b"newest")
+
+        self.assertCountEqual(os.listdir(self.directory), [oldest, older, old, newest])
+
+    def test_blobs_are_pruned_by_total_size(self):
+        """Test that blobs are pruned once their total size exceeds max_bytes."""
+        setup = BlobStore(directory=self.directory, max_entries=0, max_bytes=0)
+        digests = self._store_blobs(setup, 4)
+        store = BlobStore(directory=self.directory, max_entries=0, max_bytes=3 * 1024, persistence=self._persistence())
+
+        newest = store.put(b"n" * 1024)
+
+        self.assertCountEqual(os.listdir(self.directory), digests[2:] + [newest])
+
+
+if __name__ == "__main__":
+    unittest.main()
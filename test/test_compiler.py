@@ -0,0 +1,98 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import dataclasses
+import unittest
+from unittest.mock import MagicMock, patch
+
+from muto_composer.workflow.compiler import compile_pipeline
+
+
+def step(name, plugin="ComposePlugin", condition=None, depends_on=()):
+    definition = {"name": name, "service": f"muto_{name}", "plugin": plugin, "depends_on": list(depends_on)}
+    if condition:
+        definition["condition"] = condition
+    return definition
+
+
+class TestPipelineCompiler(unittest.TestCase):
+    def setUp(self):
+        self.module = MagicMock(ComposePlugin=MagicMock(), LaunchPlugin=MagicMock())
+        patcher = patch("importlib.import_module", return_value=self.module)
+        self.import_module = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_plan_is_immutable_and_ordered(self):
+        """Test that the plan holds resolved plugins, step names and dependency order."""
+        steps = [
+            {"sequence": [step("compose")]},
+            {"parallel": [step("launch", "LaunchPlugin", depends_on=["verify"]), step("verify")]},
+        ]
+        compensation = [{"service": "muto_kill_stack", "plugin": "LaunchPlugin", "compensates": ["launch"]}]
+
+        plan = compile_pipeline("start", steps, compensation)
+
+        self.assertEqual(plan.step_names, ("compose", "launch", "verify"))
+        self.assertEqual(plan.items[1].order, ("verify", "launch"))
+        self.assertIs(plan.items[1].steps[0].plugin, self.module.LaunchPlugin)
+        self.assertEqual(len(plan.endpoints), 4)
+        self.assertEqual(plan.warnings, ())
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            plan.items[0].steps[0].service = "other"
+        with self.assertRaises(TypeError):
+            plan.plugins["Other"] = MagicMock()
+
+    def test_plugins_are_resolved_once_per_configuration(self):
+        """Test that a shared plugin cache resolves each plugin name once."""
+        plugin_cache = {}
+        first = compile_pipeline("start", [{"sequence": [step("compose")]}], [], plugin_cache=plugin_cache)
+        second = compile_pipeline("apply", [{"sequence": [step("compose")]}], [], plugin_cache=plugin_cache)
+
+        self.assertEqual(self.import_module.call_count, 1)
+        self.assertIs(first.plugins["ComposePlugin"], second.plugins["ComposePlugin"])
+
+    def test_invalid_condition(self):
+        """Test that invalid conditions are rejected, or fail when evaluated if not strict."""
+        steps = [{"sequence": [step("compose", condition="invalid expression!")]}]
+        with self.assertRaises(ValueError):
+            compile_pipeline("start", steps, [])
+
+        plan = compile_pipeline("start", steps, [], strict=False)
+        with self.assertRaises(ValueError):
+            plan.items[0].steps[0].condition({})
+        self.assertIn("always fails", plan.warnings[0])
+
+    def test_reports_always_skipped_and_unreachable_steps(self):
+        """Test that conditions decided at load time are reported, and context variables are not."""
+        steps = [
+            {
+                "sequence": [
+                    step("compose", condition="launch.success == True"),
+                    step("provision", condition="compose.success == True"),
+                    step("verify", condition="should_verify == True"),
+                    step("disabled", condition="False"),
+                ]
+            },
+            {"parallel": [step("launch", "LaunchPlugin"), step("report", condition="launch.success == True")]},
+        ]
+        compensation = [{"service": "muto_undo", "plugin": "ComposePlugin", "compensates": ["compose", "disabled"]}]
+
+        plan = compile_pipeline("start", steps, compensation)
+
+        warned = [warning.split("'")[1] for warning in plan.warnings]
+        self.assertEqual(warned, ["compose", "provision", "disabled", "muto_undo"])
+        self.assertIn("unreachable", plan.warnings[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,14 +12,27 @@
 #
 
 import asyncio
+import json
+import shutil
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import AsyncMock, MagicMock
 
-from muto_composer.events import EventBus, EventType, StackProcessedEvent, TwinUpdateEvent
+from muto_composer.events import (
+    EventBus,
+    EventType,
+    OrchestrationCompletedEvent,
+    StackProcessedEvent,
+    TwinUpdateEvent,
+)
+from muto_composer.state.twin_cache import TwinDefinitionCache
 from muto_composer.subsystems.digital_twin_integration import (
     DigitalTwinIntegration,
     TwinServiceClient,
     TwinSynchronizer,
+    TwinSyncQueue,
 )
 
 
@@ -108,6 +121,161 @@ class TestTwinServiceClient(unittest.TestCase):
         self.client.get_twin_state.assert_called_once_with("nonexistent_twin")
 
 
+class _DelayedResponseFuture:
+    """Stands in for an rclpy future completed by an executor thread after a delay."""
+
+    def __init__(self, response, delay):
+        self.response = response
+        self.delay = delay
+
+    def result(self):
+        return self.response
+
+    def add_done_callback(self, callback):
+        threading.Timer(self.delay, callback, (self,)).start()
+
+
+class TestTwinServiceClientRequests(unittest.TestCase):
+    def setUp(self):
+        self.client = TwinServiceClient(MagicMock(), EventBus(), MagicMock(), response_timeout=1.0)
+        self.core_twin = MagicMock()
+        self.core_twin.service_is_ready.return_value = True
+        self.client.core_twin_client = self.core_twin
+
+    def _respond(self, delay=0.2, success=True):
+        def call_async(request):
+            response = MagicMock(success=success, output=json.dumps({"name": request.input}), message="error")
+            return _DelayedResponseFuture(response, delay)
+
+        self.core_twin.call_async.side_effect = call_async
+
+    def test_real_and_desired_manifests_are_fetched_concurrently(self):
+        """Test that both manifest requests are in flight together and the node is never spun."""
+        self._respond(delay=0.3)
+
+        started = time.monotonic()
+        real, desired = self.client.get_stack_manifests("stack_a")
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(real, {"name": "real_stack_a"})
+        self.assertEqual(desired, {"name": "stack_a"})
+        self.assertLess(elapsed, 0.55)
+        self.assertEqual(self.core_twin.call_async.call_count, 2)
+        self.core_twin.wait_for_service.assert_not_called()
+
+    def test_service_availability_is_cached(self):
+        """Test that an unavailable service is checked once and not waited for on every request."""
+        self.core_twin.service_is_ready.return_value = False
+        self.core_twin.wait_for_service.return_value = False
+
+        self.assertEqual(self.client.get_stack_manifests("stack_a"), (None, None))
+        self.assertIsNone(self.client.get_desired_stack_manifest("stack_a"))
+
+        self.core_twin.wait_for_service.assert_called_once()
+        self.core_twin.call_async.assert_not_called()
+
+    def test_timeout_and_failed_response_return_none(self):
+        """Test that slow or unsuccessful responses yield no manifest."""
+        self._respond(delay=0.0, success=False)
+        self.assertIsNone(self.client.get_real_stack_manifest("stack_a"))
+
+        self.client.response_timeout = 0.05
+        self._respond(delay=0.5)
+        self.assertIsNone(self.client.get_desired_stack_manifest("stack_a"))
+
+    def test_desired_manifest_is_cached_until_twin_update(self):
+        """Test that cached desired manifests skip the twin until a TWIN_UPDATE invalidates them."""
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, True)
+        self.client.twin_cache = TwinDefinitionCache(directory=cache_dir)
+        self._respond(delay=0.0)
+
+        self.client.get_stack_manifests("stack_a")
+        self.assertEqual(self.client.get_desired_stack_manifest("stack_a"), {"name": "stack_a"})
+        self.assertEqual(self.core_twin.call_async.call_count, 2)
+
+        self.client.event_bus.publish_sync(TwinUpdateEvent(twin_id="stack_a", update_type="stack"))
+        self.client.get_desired_stack_manifest("stack_a")
+        self.assertEqual(self.core_twin.call_async.call_count, 3)
+        self.assertEqual(self.client.twin_cache.metrics_snapshot()["invalidations"], 1)
+
+
+class TestTwinSyncQueue(unittest.TestCase):
+    def setUp(self):
+        self.sent = []
+        self.accept = True
+        self.queue = TwinSyncQueue(self._send, min_interval=0.2, max_backoff=0.2)
+
+    def tearDown(self):
+        self.queue.close()
+
+    def _send(self, twin_id, state, patch):
+        self.sent.append((twin_id, state, patch))
+        return self.accept
+
+    def test_rapid_changes_are_coalesced_and_sent_as_patches(self):
+        """Test that states submitted within the rate limit collapse into one delta."""
+        nodes = [f"node_{index}" for index in range(50)]
+        self.queue.submit("stack_a", {"status": "deploying", "nodes": nodes})
+        self.assertTrue(self.queue.flush(2.0))
+
+        for status in ("running", "degraded", "running"):
+            self.queue.submit("stack_a", {"status": status, "nodes": nodes, "digest": "abc"})
+        self.assertTrue(self.queue.flush(2.0))
+
+        self.assertEqual(len(self.sent), 2)
+        self.assertIsNone(self.sent[0][2])
+        self.assertCountEqual(
+            self.sent[1][2],
+            [{"op": "replace", "path": "/status", "value": "running"}, {"op": "add", "path": "/digest", "value": "abc"}],
+        )
+        metrics = self.queue.metrics_snapshot()
+        self.assertEqual(metrics["coalesced"], 2)
+        self.assertEqual(metrics["patches"], 1)
+        self.assertLess(metrics["sent_bytes"], metrics["full_bytes"])
+
+    def test_failed_update_is_retried_with_newest_state(self):
+        """Test that an unavailable twin gets the newest state once it accepts updates again."""
+        self.accept = False
+        self.queue.submit("stack_a", {"status": "running"})
+        deadline = time.monotonic() + 2.0
+        while not self.sent and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.queue.submit("stack_a", {"status": "killed"})
+        self.accept = True
+        self.assertTrue(self.queue.flush(2.0))
+
+        self.assertEqual(self.sent[-1], ("stack_a", {"status": "killed"}, None))
+        self.assertGreaterEqual(self.queue.metrics_snapshot()["failed"], 1)
+
+    def test_rejected_patch_is_retried_with_full_state(self):
+        """Test that the update after a rejected patch sends the full state."""
+        self.queue.submit("stack_a", {"status": "running"})
+        self.assertTrue(self.queue.flush(2.0))
+
+        self.accept = False
+        self.queue.submit("stack_a", {"status": "degraded"})
+        deadline = time.monotonic() + 2.0
+        while len(self.sent) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.accept = True
+        self.assertTrue(self.queue.flush(2.0))
+
+        self.assertIsNotNone(self.sent[1][2])
+        self.assertEqual(self.sent[-1], ("stack_a", {"status": "degraded"}, None))
+
+    def test_unchanged_state_is_not_sent(self):
+        """Test that re-submitting the acknowledged state sends nothing."""
+        self.queue.submit("stack_a", {"status": "running"})
+        self.assertTrue(self.queue.flush(2.0))
+        self.queue.submit("stack_a", {"status": "running"})
+        self.assertTrue(self.queue.flush(2.0))
+
+        self.assertEqual(len(self.sent), 1)
+        self.assertEqual(self.queue.metrics_snapshot()["unchanged"], 1)
+
+
 class TestTwinSynchronizer(unittest.TestCase):
     def setUp(self):
         self.event_bus = EventBus()
@@ -285,6 +453,33 @@ class TestDigitalTwinIntegration(unittest.TestCase):
         # For testing, we verify the integration components are properly set up
         self.assertIsNotNone(self.integration.synchronizer)
 
+    def test_state_sync_requires_a_state_service(self):
+        """Test that stack states are only sent to the twin when a state service is configured."""
+        completed = OrchestrationCompletedEvent(
+            event_type=EventType.ORCHESTRATION_COMPLETED,
+            source_component="deployment_orchestrator",
+            orchestration_id="orch-1",
+            stack_name="test_stack",
+            final_stack_state={"metadata": {"name": "test_stack"}},
+        )
+
+        self.event_bus.publish_sync(completed)
+
+        self.assertIsNone(self.integration.twin_client.twin_state_client)
+        self.assertEqual(self.integration.sync_queue.metrics_snapshot()["submitted"], 0)
+        self.assertFalse(self.integration.twin_client.update_twin_state("test_stack", {"status": "success"}))
+
+        integration = DigitalTwinIntegration(
+            self.mock_node, EventBus(), self.logger, state_service="/core_twin/update_twin_state"
+        )
+        integration.synchronizer.sync_queue = MagicMock()
+        integration.event_bus.publish_sync(completed)
+
+        self.assertEqual(integration.twin_client.twin_state_client, self.mock_node.create_client.return_value)
+        self.assertEqual(self.mock_node.create_client.call_args.args[1], "/core_twin/update_twin_state")
+        integration.synchronizer.sync_queue.submit.assert_called_once()
+        self.assertEqual(integration.synchronizer.sync_queue.submit.call_args.args[0], "test_stack")
+
     def test_twin_id_extraction(self):
         """Test extraction of twin ID from stack metadata."""
         # Test stack with explicit twin_id
@@ -11,6 +11,7 @@
 #   Composiv.ai - initial API and implementation
 #
 
+import threading
 import unittest
 from unittest.mock import MagicMock
 
@@ -18,8 +19,13 @@ from muto_composer.events import (
     EventBus,
     EventType,
     OrchestrationStartedEvent,
+    OverflowPolicy,
+    PipelineRequestedEvent,
+    RollbackStartedEvent,
     StackAnalyzedEvent,
+    StackProcessedEvent,
     StackRequestEvent,
+    event_from_dict,
 )
 
 
@@ -118,6 +124,285 @@ class TestEventBus(unittest.TestCase):
         self.assertTrue(True)  # Test passes if no exception was raised
 
 
+class TestEventBusAsyncDispatch(unittest.TestCase):
+    def setUp(self):
+        self.event_bus = EventBus(max_workers=2)
+
+    def tearDown(self):
+        self.event_bus.stop(timeout=1.0, drain=False)
+
+    def _request(self, stack_name="test_stack", correlation_id=None, action="start"):
+        return StackRequestEvent(
+            event_type=EventType.STACK_REQUEST,
+            source_component="test",
+            stack_name=stack_name,
+            action=action,
+            correlation_id=correlation_id,
+        )
+
+    def _block_dispatch(self, event_type=EventType.STACK_REQUEST):
+        """Subscribe a handler that holds the dispatcher until released."""
+        started = threading.Event()
+        release = threading.Event()
+        received = []
+
+        def blocking_handler(event):
+            received.append(event)
+            started.set()
+            release.wait(5.0)
+
+        self.event_bus.subscribe(event_type, blocking_handler)
+        return started, release, received
+
+    def test_publish_async_without_dispatch_is_synchronous(self):
+        """Test that publish_async delivers inline until dispatch is started."""
+        handler = MagicMock()
+        self.event_bus.subscribe(EventType.STACK_REQUEST, handler)
+
+        event = self._request()
+        self.assertTrue(self.event_bus.publish_async(event))
+
+        handler.assert_called_once_with(event)
+
+    def test_publish_async_does_not_block_publisher(self):
+        """Test that a slow handler runs on a dispatcher thread."""
+        started, release, received = self._block_dispatch()
+        self.event_bus.start()
+
+        self.assertTrue(self.event_bus.publish_async(self._request()))
+        self.assertTrue(started.wait(2.0))
+        # The handler is still running while the publisher has already returned
+        self.assertFalse(self.event_bus.wait_until_idle(0.05))
+
+        release.set()
+        self.assertTrue(self.event_bus.wait_until_idle(2.0))
+        self.assertEqual(len(received), 1)
+
+    def test_events_with_same_correlation_id_are_ordered(self):
+        """Test that events sharing a correlation id are delivered in publish order."""
+        received = []
+        self.event_bus.subscribe(EventType.STACK_REQUEST, lambda event: received.append(event.action))
+        self.event_bus.subscribe(EventType.STACK_ANALYZED, lambda event: received.append(event.action))
+        self.event_bus.start(workers=4)
+
+        expected = []
+        for i in range(50):
+            expected.append(f"request-{i}")
+            self.event_bus.publish_async(self._request(correlation_id="corr-1", action=f"request-{i}"))
+            expected.append(f"analyzed-{i}")
+            self.event_bus.publish_async(
+                StackAnalyzedEvent(
+                    event_type=EventType.STACK_ANALYZED,
+                    source_component="test",
+                    stack_name="test_stack",
+                    action=f"analyzed-{i}",
+                    correlation_id="corr-1",
+                )
+            )
+
+        self.assertTrue(self.event_bus.wait_until_idle(5.0))
+        self.assertEqual(received, expected)
+
+    def test_drop_oldest_policy(self):
+        """Test that a full drop-oldest queue discards the oldest pending event."""
+        self.event_bus.configure_queue(EventType.STACK_REQUEST, maxsize=2, overflow=OverflowPolicy.DROP_OLDEST)
+        started, release, received = self._block_dispatch()
+        self.event_bus.start(workers=1)
+
+        self.event_bus.publish_async(self._request(action="first"))
+        self.assertTrue(started.wait(2.0))
+        for action in ("second", "third", "fourth"):
+            self.assertTrue(self.event_bus.publish_async(self._request(action=action)))
+
+        self.assertEqual(self.event_bus.queue_depths()[EventType.STACK_REQUEST], 2)
+        release.set()
+        self.assertTrue(self.event_bus.wait_until_idle(2.0))
+        self.assertEqual([event.action for event in received], ["first", "third", "fourth"])
+
+    def test_coalesce_policy_keeps_newest_per_key(self):
+        """Test that coalescing replaces a pending event for the same stack."""
+        self.event_bus.configure_queue(EventType.STACK_REQUEST, overflow=OverflowPolicy.COALESCE)
+        started, release, received = self._block_dispatch()
+        self.event_bus.start(workers=1)
+
+        self.event_bus.publish_async(self._request(stack_name="blocker", action="first"))
+        self.assertTrue(started.wait(2.0))
+        self.event_bus.publish_async(self._request(stack_name="stack_a", action="a1"))
+        self.event_bus.publish_async(self._request(stack_name="stack_b", action="b1"))
+        self.event_bus.publish_async(self._request(stack_name="stack_a", action="a2"))
+
+        release.set()
+        self.assertTrue(self.event_bus.wait_until_idle(2.0))
+        self.assertEqual([event.action for event in received], ["first", "b1", "a2"])
+
+    def test_block_policy_times_out_when_full(self):
+        """Test that a full blocking queue rejects the event after the timeout."""
+        self.event_bus.configure_queue(EventType.STACK_REQUEST, maxsize=1, block_timeout=0.1)
+        started, release, received = self._block_dispatch()
+        self.event_bus.start(workers=1)
+
+        self.event_bus.publish_async(self._request(action="first"))
+        self.assertTrue(started.wait(2.0))
+        self.assertTrue(self.event_bus.publish_async(self._request(action="second")))
+        self.assertFalse(self.event_bus.publish_async(self._request(action="third")))
+
+        release.set()
+        self.assertTrue(self.event_bus.wait_until_idle(2.0))
+        self.assertEqual([event.action for event in received], ["first", "second"])
+
+    def test_stop_drains_pending_events(self):
+        """Test that stopping dispatch delivers events that are still queued."""
+        handler = MagicMock()
+        self.event_bus.subscribe(EventType.STACK_REQUEST, handler)
+        self.event_bus.start()
+
+        for _ in range(10):
+            self.event_bus.publish_async(self._request())
+        self.event_bus.stop()
+
+        self.assertEqual(handler.call_count, 10)
+        self.assertFalse(self.event_bus.is_running)
+
+    def test_failing_middleware_rejects_the_event(self):
+        """Test that a middleware exception is logged and rejects the event instead of raising."""
+        handler = MagicMock()
+        self.event_bus.subscribe(EventType.STACK_REQUEST, handler)
+        self.event_bus.set_logger(MagicMock())
+        self.event_bus.add_middleware(MagicMock(side_effect=RuntimeError("middleware failed")))
+        self.event_bus.start()
+
+        self.assertFalse(self.event_bus.publish_async(self._request()))
+
+        self.assertTrue(self.event_bus.wait_until_idle(2.0))
+        handler.assert_not_called()
+        self.event_bus._logger.error.assert_called_once()
+
+    def test_stop_while_publishing_delivers_the_event(self):
+        """Test that an event published while dispatch stops is delivered instead of failing."""
+        handler = MagicMock()
+        self.event_bus.subscribe(EventType.STACK_REQUEST, handler)
+        self.event_bus.start()
+
+        def stopping_middleware(event):
+            self.event_bus.stop()
+            return event
+
+        self.event_bus.add_middleware(stopping_middleware)
+        event = self._request()
+
+        self.assertTrue(self.event_bus.publish_async(event))
+        handler.assert_called_once_with(event)
+
+
+class TestEventBusInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.event_bus = EventBus(max_workers=1)
+
+    def tearDown(self):
+        self.event_bus.stop(timeout=1.0, drain=False)
+
+    def _request(self, action="start"):
+        return StackRequestEvent(
+            event_type=EventType.STACK_REQUEST,
+            source_component="test",
+            stack_name="test_stack",
+            action=action,
+        )
+
+    def test_publish_counts_and_handler_latency(self):
+        """Test that publish counts and handler timings are recorded."""
+
+        def analyzer(event):
+            pass
+
+        self.event_bus.subscribe(EventType.STACK_REQUEST, analyzer)
+        for _ in range(3):
+            self.event_bus.publish_sync(self._request())
+
+        snapshot = self.event_bus.metrics_snapshot()
+        self.assertEqual(snapshot["published"]["stack.request"], 3)
+        handler_key = next(key for key in snapshot["handlers"] if key.endswith("analyzer"))
+        self.assertTrue(handler_key.startswith("stack.request:"))
+        self.assertEqual(snapshot["handlers"][handler_key]["count"], 3)
+        self.assertIn("p99_ms", snapshot["handlers"][handler_key])
+
+    def test_handler_exceptions_are_counted(self):
+        """Test that handler exceptions are counted per handler."""
+
+        def failing(event):
+            raise RuntimeError("boom")
+
+        self.event_bus.subscribe(EventType.STACK_REQUEST, failing)
+        self.event_bus.publish_sync(self._request())
+        self.event_bus.publish_sync(self._request())
+
+        errors = self.event_bus.metrics_snapshot()["handler_errors"]
+        self.assertEqual(list(errors.values()), [2])
+
+    def test_middleware_applies_to_publish_sync(self):
+        """Test that middleware can rewrite or drop events on the synchronous path."""
+        handler = MagicMock()
+        self.event_bus.subscribe(EventType.STACK_REQUEST, handler)
+
+        def tag(event):
+            event.metadata["tagged"] = True
+            return event
+
+        def drop_kill(event):
+            return None if event.action == "kill" else event
+
+        self.event_bus.add_middleware(tag)
+        self.event_bus.add_middleware(drop_kill)
+
+        self.event_bus.publish_sync(self._request("start"))
+        self.event_bus.publish_sync(self._request("kill"))
+
+        handler.assert_called_once()
+        self.assertTrue(handler.call_args[0][0].metadata["tagged"])
+        self.assertEqual(self.event_bus.metrics_snapshot()["published"]["stack.request"], 1)
+
+    def test_coroutine_middleware_skipped_by_publish_sync_is_reported_once(self):
+        """Test that async middleware skipped outside the asyncio path is logged once."""
+        handler = MagicMock()
+        self.event_bus.subscribe(EventType.STACK_REQUEST, handler)
+        self.event_bus.set_logger(MagicMock())
+
+        async def drop_all(event):
+            return None
+
+        self.event_bus.add_middleware(drop_all)
+        self.event_bus.publish_sync(self._request("start"))
+        self.event_bus.publish_sync(self._request("start"))
+
+        self.assertEqual(handler.call_count, 2)
+        self.event_bus._logger.warning.assert_called_once()
+        self.assertIn("drop_all", self.event_bus._logger.warning.call_args[0][0])
+
+    def test_snapshot_reports_queue_depth(self):
+        """Test that queue depth is reported while events are pending."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking(event):
+            started.set()
+            release.wait(5.0)
+
+        self.event_bus.subscribe(EventType.STACK_REQUEST, blocking)
+        self.event_bus.start()
+        self.event_bus.publish_async(self._request())
+        self.assertTrue(started.wait(2.0))
+        self.event_bus.publish_async(self._request())
+        self.event_bus.publish_async(self._request())
+
+        dispatch = self.event_bus.metrics_snapshot()["dispatch"]
+        self.assertTrue(dispatch["running"])
+        self.assertEqual(dispatch["queue_depth"]["stack.request"], 2)
+
+        release.set()
+        self.assertTrue(self.event_bus.wait_until_idle(2.0))
+        self.assertEqual(self.event_bus.metrics_snapshot()["published"]["stack.request"], 3)
+
+
 class TestEventClasses(unittest.TestCase):
     def test_stack_request_event_creation(self):
         """Test StackRequestEvent creation and attributes."""
@@ -170,6 +455,98 @@ class TestEventClasses(unittest.TestCase):
         self.assertTrue(event.context_variables["should_run_provision"])
         self.assertIsNotNone(event.orchestration_id)
 
+    def test_events_are_slot_based(self):
+        """Test that events do not carry a per-instance __dict__."""
+        event = StackAnalyzedEvent(
+            event_type=EventType.STACK_ANALYZED,
+            source_component="analyzer",
+            stack_name="test_stack",
+            action="start",
+        )
+        self.assertFalse(hasattr(event, "__dict__"))
+        with self.assertRaises(AttributeError):
+            event.unknown_attribute = True
+
+    def test_event_ids_are_unique_and_ordered(self):
+        """Test that generated event ids are unique and follow creation order."""
+        events = [
+            StackRequestEvent(
+                event_type=EventType.STACK_REQUEST, source_component="test", stack_name="s", action="start"
+            )
+            for _ in range(100)
+        ]
+        ids = [event.event_id for event in events]
+        self.assertEqual(len(set(ids)), 100)
+        self.assertEqual(ids, sorted(ids))
+
+        explicit = StackRequestEvent(
+            event_type=EventType.STACK_REQUEST,
+            source_component="test",
+            stack_name="s",
+            action="start",
+            event_id="fixed-id",
+        )
+        self.assertEqual(explicit.event_id, "fixed-id")
+
+    def test_orchestration_ids_are_generated_lazily(self):
+        """Test that started events derive unique orchestration ids from the event counter."""
+        started = [
+            OrchestrationStartedEvent(
+                event_type=EventType.ORCHESTRATION_STARTED, source_component="test", action="start"
+            )
+            for _ in range(50)
+        ]
+        rollback = RollbackStartedEvent(event_type=EventType.ROLLBACK_STARTED, source_component="test")
+        self.assertIsNone(started[0]._orchestration_id)
+
+        ids = [event.orchestration_id for event in started] + [rollback.orchestration_id]
+        self.assertEqual(len(set(ids)), 51)
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(started[0].orchestration_id, ids[0])
+
+        explicit = RollbackStartedEvent(
+            event_type=EventType.ROLLBACK_STARTED, source_component="test", orchestration_id="fixed-id"
+        )
+        self.assertEqual(explicit.orchestration_id, "fixed-id")
+        request = StackRequestEvent(
+            event_type=EventType.STACK_REQUEST, source_component="test", stack_name="s", action="start"
+        )
+        self.assertIsNone(request.orchestration_id)
+
+        rebuilt = event_from_dict("OrchestrationStartedEvent", started[0].to_dict())
+        self.assertEqual(rebuilt.orchestration_id, ids[0])
+
+    def test_payload_aliases_are_properties(self):
+        """Test that backward-compatible aliases share the stack payload."""
+        payload = {"metadata": {"name": "test_stack"}}
+        processed = StackProcessedEvent(stack_name="test_stack", stack_payload=payload)
+        self.assertIs(processed.merged_stack, payload)
+
+        replacement = {"metadata": {"name": "replaced"}}
+        processed.merged_stack = replacement
+        self.assertIs(processed.stack_payload, replacement)
+
+        analyzed = StackAnalyzedEvent(
+            event_type=EventType.STACK_ANALYZED,
+            source_component="analyzer",
+            stack_name="test_stack",
+            action="start",
+            stack_payload=payload,
+        )
+        self.assertIs(analyzed.manifest_data["stack_payload"], payload)
+
+    def test_pipeline_requested_accepts_stack_manifest(self):
+        """Test the legacy stack_manifest keyword of PipelineRequestedEvent."""
+        manifest = {"metadata": {"name": "legacy"}}
+        event = PipelineRequestedEvent(
+            event_type=EventType.PIPELINE_REQUESTED,
+            source_component="pipeline_engine_legacy",
+            pipeline_name="start",
+            stack_manifest=manifest,
+        )
+        self.assertIs(event.stack_payload, manifest)
+        self.assertIs(event.stack_manifest, manifest)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,69 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import threading
+import time
+import unittest
+from concurrent.futures import CancelledError, Future
+from unittest.mock import MagicMock
+
+from muto_composer.utils.futures import wait_for_future
+
+
+class TestWaitForFuture(unittest.TestCase):
+    def test_completed_future_returns(self):
+        """Test that a future completed from another thread ends the wait."""
+        future = Future()
+        threading.Timer(0.05, future.set_result, args=("done",)).start()
+
+        wait_for_future(future, timeout=2.0)
+
+        self.assertEqual(future.result(), "done")
+
+    def test_timeout_cancels_the_future(self):
+        """Test that the wait gives up and cancels the future at the timeout."""
+        future = Future()
+
+        started = time.monotonic()
+        with self.assertRaises(TimeoutError) as raised:
+            wait_for_future(future, timeout=0.1, description="Call to compose")
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertIn("Call to compose timed out", str(raised.exception))
+        self.assertTrue(future.cancelled())
+
+    def test_cancel_event_stops_waiting(self):
+        """Test that setting the cancel event stops an indefinite wait."""
+        future = Future()
+        cancelled = threading.Event()
+        threading.Timer(0.05, cancelled.set).start()
+
+        with self.assertRaises(CancelledError):
+            wait_for_future(future, cancelled=cancelled)
+        self.assertTrue(future.cancelled())
+
+    def test_custom_wait_is_polled_until_done(self):
+        """Test that a custom wait, e.g. spinning a node, is called with the remaining time."""
+        future = MagicMock()
+        future.done.side_effect = [False, False, True]
+        wait = MagicMock()
+
+        wait_for_future(future, timeout=5.0, cancelled=threading.Event(), wait=wait)
+
+        self.assertEqual(wait.call_count, 2)
+        self.assertLessEqual(wait.call_args[0][0], 0.1)
+        future.cancel.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
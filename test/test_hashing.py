@@ -0,0 +1,52 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import json
+import unittest
+
+from muto_composer.utils.hashing import canonical_json, is_stack_reference, manifest_digest
+
+
+class TestManifestHashing(unittest.TestCase):
+    def test_digest_ignores_key_order_and_whitespace(self):
+        """Test that equivalent JSON documents produce the same digest."""
+        compact = '{"metadata":{"name":"demo","content_type":"stack/json"},"launch":{"node":[{"name":"talker"}]}}'
+        pretty = """
+        {
+            "launch": {"node": [ {"name": "talker"} ]},
+            "metadata": {"content_type": "stack/json", "name": "demo"}
+        }
+        """
+
+        self.assertEqual(manifest_digest(json.loads(compact)), manifest_digest(json.loads(pretty)))
+
+    def test_digest_changes_with_content(self):
+        """Test that a changed value or list order changes the digest."""
+        base = {"metadata": {"name": "demo"}, "node": ["a", "b"]}
+
+        self.assertNotEqual(manifest_digest(base), manifest_digest({"metadata": {"name": "demo"}, "node": ["b", "a"]}))
+        self.assertNotEqual(manifest_digest(base), manifest_digest({"metadata": {"name": "demo2"}, "node": ["a", "b"]}))
+
+    def test_canonical_json_is_compact_and_sorted(self):
+        """Test the canonical serialization format."""
+        self.assertEqual(canonical_json({"b": 1, "a": {"d": 2, "c": 3}}), '{"a":{"c":3,"d":2},"b":1}')
+
+    def test_is_stack_reference(self):
+        """Test detection of reference-only payloads."""
+        self.assertTrue(is_stack_reference({"value": {"stackId": "org.eclipse.muto:demo"}}))
+        self.assertFalse(is_stack_reference({"metadata": {"name": "demo"}, "node": []}))
+        self.assertFalse(is_stack_reference(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import threading
+import time
+import unittest
+from concurrent.futures import CancelledError
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from muto_composer.plugins.in_process import InProcessPlugins, in_process_node_name
+
+
+class FakeComposePlugin:
+    instances = 0
+
+    def __init__(self, **kwargs):
+        FakeComposePlugin.instances += 1
+        self.kwargs = kwargs
+        srv_type = SimpleNamespace(Response=lambda: SimpleNamespace(success=False, err_msg=""))
+        self.services = [SimpleNamespace(srv_name="/muto_compose", srv_type=srv_type, callback=self.handle_compose)]
+        self.destroyed = False
+        self.release = threading.Event()
+        self.release.set()
+
+    def handle_compose(self, request, response):
+        self.release.wait(5.0)
+        response.success = request == "manifest"
+        return response
+
+    def destroy_service(self, service):
+        self.services.remove(service)
+
+    def destroy_node(self):
+        self.destroyed = True
+
+
+@patch("muto_composer.plugins.in_process.MultiThreadedExecutor")
+class TestInProcessPlugins(unittest.TestCase):
+    def setUp(self):
+        FakeComposePlugin.instances = 0
+
+    @staticmethod
+    def _wait_until_idle(plugins):
+        deadline = time.monotonic() + 2.0
+        while plugins.metrics_snapshot()["busy"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_call_runs_registered_service_handler(self, mock_executor):
+        """Test that a call reaches the handler the plugin registered for the service, in one node."""
+        plugins = InProcessPlugins(factories={"ComposePlugin": lambda: FakeComposePlugin})
+
+        first = plugins.call("ComposePlugin", "muto_compose", "manifest")
+        second = plugins.call("ComposePlugin", "/muto_compose", "other")
+
+        self.assertTrue(first.success)
+        self.assertFalse(second.success)
+        self.assertEqual(FakeComposePlugin.instances, 1)
+        mock_executor.return_value.add_node.assert_called_once()
+        self.assertEqual(plugins.metrics_snapshot(), {"plugins": ["ComposePlugin"], "calls": 2, "busy": []})
+
+    def test_plugin_node_does_not_duplicate_ros_endpoints(self, mock_executor):
+        """Test that the hosted node gets its own name and no longer serves its ROS services."""
+        plugins = InProcessPlugins(factories={"ComposePlugin": lambda: FakeComposePlugin})
+
+        plugin = plugins.get_plugin("ComposePlugin")
+
+        self.assertEqual(in_process_node_name("ComposePlugin"), "in_process_compose_plugin")
+        self.assertEqual(plugin.kwargs["cli_args"], ["--ros-args", "-r", "__node:=in_process_compose_plugin"])
+        self.assertEqual(plugin.services, [])
+        self.assertTrue(plugins.call("ComposePlugin", "muto_compose", "manifest").success)
+
+    def test_call_stops_waiting_on_timeout_or_cancel(self, mock_executor):
+        """Test that a handler that does not return is bounded by the timeout and the cancel event."""
+        plugins = InProcessPlugins(factories={"ComposePlugin": lambda: FakeComposePlugin})
+        plugin = plugins.get_plugin("ComposePlugin")
+        plugin.release.clear()
+
+        with self.assertRaises(TimeoutError):
+            plugins.call("ComposePlugin", "muto_compose", "manifest", timeout=0.05)
+        # Let the abandoned handler return so the plugin accepts calls again
+        plugin.release.set()
+        self._wait_until_idle(plugins)
+        plugin.release.clear()
+
+        cancelled = threading.Event()
+        threading.Timer(0.05, cancelled.set).start()
+        with self.assertRaises(CancelledError):
+            plugins.call("ComposePlugin", "muto_compose", "manifest", cancelled=cancelled)
+
+        plugin.release.set()
+        plugins.shutdown()
+
+    def test_plugin_rejects_calls_while_abandoned_handler_runs(self, mock_executor):
+        """Test that calls fail fast instead of queueing behind a handler that was given up on."""
+        logger = MagicMock()
+        plugins = InProcessPlugins(factories={"ComposePlugin": lambda: FakeComposePlugin}, logger=logger)
+        plugin = plugins.get_plugin("ComposePlugin")
+        plugin.release.clear()
+
+        with self.assertRaises(TimeoutError):
+            plugins.call("ComposePlugin", "muto_compose", "manifest", timeout=0.05)
+        logger.warning.assert_called_once()
+        self.assertEqual(plugins.metrics_snapshot()["busy"], ["ComposePlugin"])
+        with self.assertRaises(RuntimeError):
+            plugins.call("ComposePlugin", "muto_compose", "manifest", timeout=0.05)
+
+        plugin.release.set()
+        self._wait_until_idle(plugins)
+        self.assertTrue(plugins.call("ComposePlugin", "muto_compose", "manifest", timeout=2.0).success)
+        plugins.shutdown()
+
+    def test_unknown_plugin_or_service_is_rejected(self, mock_executor):
+        """Test that plugins without an entry point or service raise KeyError."""
+        plugins = InProcessPlugins(factories={"ComposePlugin": lambda: FakeComposePlugin})
+
+        self.assertFalse(plugins.available("LaunchPlugin"))
+        with self.assertRaises(KeyError):
+            plugins.call("LaunchPlugin", "muto_start_stack", MagicMock())
+        with self.assertRaises(KeyError):
+            plugins.call("ComposePlugin", "muto_start_stack", MagicMock())
+
+    def test_shutdown_destroys_plugin_nodes(self, mock_executor):
+        """Test that shutdown stops the executor and destroys the hosted plugins."""
+        plugins = InProcessPlugins(factories={"ComposePlugin": lambda: FakeComposePlugin})
+        plugin = plugins.get_plugin("ComposePlugin")
+
+        plugins.shutdown()
+
+        mock_executor.return_value.shutdown.assert_called_once()
+        self.assertTrue(plugin.destroyed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from muto_composer.events import (
+    EventBus,
+    EventType,
+    PipelineFailedEvent,
+    StackAnalyzedEvent,
+    StackRequestEvent,
+    event_from_dict,
+)
+from muto_composer.state.journal import EventJournal, list_segments, read_journal
+
+
+class TestEventJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _request(self, stack_name="test_stack"):
+        return StackRequestEvent(
+            event_type=EventType.STACK_REQUEST,
+            source_component="test",
+            stack_name=stack_name,
+            action="start",
+            stack_payload={"metadata": {"name": stack_name}},
+            correlation_id="corr-1",
+        )
+
+    def test_records_round_trip(self):
+        """Test that journaled events can be rebuilt with their attributes."""
+        journal = EventJournal(self.directory, commit_interval=0.0)
+        journal.append(self._request())
+        journal.append(
+            PipelineFailedEvent(
+                event_type=EventType.PIPELINE_FAILED,
+                source_component="pipeline_executor",
+                pipeline_name="start",
+                execution_id="exec-1",
+                failure_step="launch_step",
+                error_details={"error": "boom"},
+            )
+        )
+        self.assertTrue(journal.flush(2.0))
+        journal.close()
+
+        records = list(read_journal(self.directory))
+        self.assertEqual([record["seq"] for record in records], [1, 2])
+
+        request = event_from_dict(records[0]["class"], records[0]["event"])
+        self.assertIsInstance(request, StackRequestEvent)
+        self.assertEqual(request.event_type, EventType.STACK_REQUEST)
+        self.assertEqual(request.stack_payload, {"metadata": {"name": "test_stack"}})
+        self.assertEqual(request.correlation_id, "corr-1")
+
+        failed = event_from_dict(records[1]["class"], records[1]["event"])
+        self.assertEqual(failed.failure_step, "launch_step")
+        self.assertEqual(failed.error_details, {"error": "boom"})
+
+    def test_payload_aliases_are_not_duplicated(self):
+        """Test that stack_payload aliases are restored instead of stored twice."""
+        event = StackAnalyzedEvent(
+            event_type=EventType.STACK_ANALYZED,
+            source_component="analyzer",
+            stack_name="test_stack",
+            action="start",
+            stack_payload={"launch": {"data": "abc"}},
+        )
+        data = event.to_dict()
+        self.assertNotIn("manifest_data", data)
+
+        rebuilt = event_from_dict("StackAnalyzedEvent", data)
+        self.assertEqual(rebuilt.manifest_data["stack_payload"], {"launch": {"data": "abc"}})
+
+    def test_segments_rotate_and_are_pruned(self):
+        """Test segment rotation and retention."""
+        journal = EventJournal(self.directory, segment_max_bytes=200, max_segments=2, commit_interval=0.0)
+        for i in range(10):
+            journal.append(self._request(f"stack_{i}"))
+            journal.flush(2.0)
+        journal.close()
+
+        segments = list_segments(self.directory)
+        self.assertEqual(len(segments), 2)
+        self.assertTrue(all(os.path.basename(path).startswith("events-") for path in segments))
+
+    def test_failed_write_is_not_reported_durable(self):
+        """Test that a batch that fails to write is retried instead of being reported as flushed."""
+        journal = EventJournal(self.directory, commit_interval=0.0)
+        with patch.object(journal, "_write_batch", side_effect=OSError("disk full")):
+            journal.append(self._request("a"))
+            self.assertFalse(journal.flush(0.2))
+
+        journal.append(self._request("b"))
+        self.assertTrue(journal.flush(2.0))
+        journal.close()
+
+        records = list(read_journal(self.directory))
+        self.assertEqual([record["event"]["stack_name"] for record in records], ["a", "b"])
+
+    def test_truncated_trailing_record_is_skipped(self):
+        """Test that a partially written last line does not break reading."""
+        journal = EventJournal(self.directory, commit_interval=0.0)
+        journal.append(self._request())
+        journal.close()
+        with open(list_segments(self.directory)[-1], "a") as f:
+            f.write('{"seq": 2, "class": "StackRe')
+
+        self.assertEqual(len(list(read_journal(self.directory))), 1)
+
+    def test_event_bus_sink(self):
+        """Test that an EventBus sink journals every published event."""
+        journal = EventJournal(self.directory)
+        event_bus = EventBus()
+        event_bus.add_sink(journal.append)
+
+        event_bus.publish_sync(self._request("a"))
+        event_bus.publish_async(self._request("b"))
+        journal.close()
+
+        records = list(read_journal(self.directory))
+        self.assertEqual([record["event"]["stack_name"] for record in records], ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import unittest
+
+from muto_composer.utils.json_patch import apply_patch, make_patch
+
+
+class TestJsonPatch(unittest.TestCase):
+    def test_patch_contains_only_changes(self):
+        """Test that unchanged members produce no operations."""
+        old = {"stack_name": "stack_a", "status": "running", "nodes": ["talker"], "meta": {"a/b": 1, "gone": 2}}
+        new = {"stack_name": "stack_a", "status": "failed", "nodes": ["talker", "listener"], "meta": {"a/b": 1}}
+
+        patch = make_patch(old, new)
+
+        self.assertCountEqual(
+            patch,
+            [
+                {"op": "replace", "path": "/status", "value": "failed"},
+                {"op": "replace", "path": "/nodes", "value": ["talker", "listener"]},
+                {"op": "remove", "path": "/meta/gone"},
+            ],
+        )
+        self.assertEqual(make_patch(new, new), [])
+
+    def test_apply_round_trip(self):
+        """Test that applying a patch reproduces the new document without modifying the old one."""
+        old = {"status": "running", "meta": {"a/b": 1, "x~y": {"z": True}}, "count": 1}
+        new = {"status": "running", "meta": {"a/b": 2, "x~y": {"z": False, "w": None}}, "count": 1.5, "added": [1]}
+
+        self.assertEqual(apply_patch(old, make_patch(old, new)), new)
+        self.assertEqual(old["meta"]["a/b"], 1)
+
+    def test_invalid_path_is_rejected(self):
+        """Test that a patch for a missing member raises ValueError."""
+        with self.assertRaises(ValueError):
+            apply_patch({}, [{"op": "remove", "path": "/missing"}])
+        with self.assertRaises(ValueError):
+            apply_patch({}, [{"op": "move", "path": "/a"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
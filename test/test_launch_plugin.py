@@ -15,6 +15,7 @@ import json
 import os
 import subprocess
 import unittest
+from concurrent.futures import Future
 from unittest.mock import MagicMock, patch
 
 import rclpy
@@ -397,6 +398,33 @@ class TestLaunchPlugin(unittest.TestCase):
         self.assertTrue(response.success)
         self.assertEqual(response.err_msg, "")
 
+    def _twin_response(self, success):
+        future = Future()
+        future.set_result(MagicMock(success=success))
+        return future
+
+    def test_send_current_stack_returns_twin_response(self):
+        self.node.set_stack_cli = MagicMock()
+        self.node.set_stack_cli.call_async.return_value = self._twin_response(True)
+
+        sent = self.node._send_current_stack("org.eclipse.muto:stack", {"stackId": "org.eclipse.muto:stack"}, None)
+
+        self.assertTrue(sent)
+        request = self.node.set_stack_cli.call_async.call_args[0][0]
+        self.assertEqual(request.input, "org.eclipse.muto:stack")
+
+    def test_send_current_stack_retries_when_rejected_or_unanswered(self):
+        self.node.set_stack_cli = MagicMock()
+        self.node.set_stack_cli.call_async.return_value = self._twin_response(False)
+        self.assertFalse(self.node._send_current_stack("stack", {"stackId": "stack"}, None))
+
+        self.node.set_stack_cli.call_async.return_value = Future()
+        with patch.object(MutoDefaultLaunchPlugin, "TWIN_RESPONSE_TIMEOUT", 0.01):
+            self.assertFalse(self.node._send_current_stack("stack", {"stackId": "stack"}, None))
+
+        self.node.set_stack_cli.service_is_ready.return_value = False
+        self.assertFalse(self.node._send_current_stack("stack", {"stackId": "stack"}, None))
+
     @patch("muto_composer.stack_handlers.ditto_handler.Stack")
     @patch("muto_composer.stack_handlers.json_handler.Stack")
     @patch("muto_composer.plugins.launch_plugin.LaunchPlugin")
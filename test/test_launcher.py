@@ -337,5 +337,20 @@ class TestLauncher(unittest.TestCase):
         self.logger_mock.info.assert_any_call("No active nodes to kill.")
 
 
+    @patch("os.kill")
+    def test_kill_by_label(self, mock_kill):
+        with self.launch_parent._lock:
+            self.launch_parent._active_nodes.append({"robot__talker-1": 1234})
+            self.launch_parent._active_nodes.append({"robot__talker_v2-2": 5678})
+
+        self.assertEqual(self.launch_parent.running_labels(), {"robot__talker", "robot__talker_v2"})
+        self.assertFalse(self.launch_parent.kill_by_label({"robot__talker"}))
+
+        mock_kill.assert_called_once_with(1234, signal.SIGKILL)
+        self.assertEqual(self.launch_parent.running_labels(), {"robot__talker_v2"})
+        self.assertTrue(self.launch_parent.kill_by_label({"robot__talker_v2"}))
+        self.assertTrue(self.launch_parent.kill_by_label({"robot__talker"}))
+
+
 if __name__ == "__main__":
     unittest.main()
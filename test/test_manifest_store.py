@@ -0,0 +1,92 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from muto_composer.state.manifest_store import ManifestStore, make_reference, parse_reference
+from muto_composer.utils.hashing import manifest_digest
+
+
+class TestManifestStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = ManifestStore(directory=self.directory, cache_size=2)
+        self.manifest = {"metadata": {"name": "stack_a", "version": "1"}, "launch": {"data": "x" * 1000}}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_put_is_content_addressed(self):
+        """Test that the digest is the canonical manifest digest and equal manifests share one file."""
+        digest = self.store.put(self.manifest)
+        reordered = json.loads(json.dumps(self.manifest, sort_keys=True))
+
+        self.assertEqual(digest, manifest_digest(self.manifest))
+        self.assertEqual(self.store.put(reordered), digest)
+        self.assertEqual(os.listdir(self.directory), [f"{digest}.json"])
+
+    def test_get_from_another_store_instance(self):
+        """Test that a second process reads the manifest from disk and then from its cache."""
+        digest = self.store.put(self.manifest)
+        reader = ManifestStore(directory=self.directory)
+
+        self.assertEqual(reader.get(digest), self.manifest)
+        self.assertEqual(reader.get(digest), self.manifest)
+        self.assertEqual((reader.hits, reader.misses), (1, 1))
+        self.assertIsNone(reader.get("0" * 64))
+
+    def test_cached_manifest_cannot_be_modified_by_callers(self):
+        """Test that modifying a returned manifest does not change later reads."""
+        digest = self.store.put(self.manifest)
+
+        self.store.get(digest)["metadata"]["name"] = "changed"
+
+        self.assertEqual(self.store.get(digest)["metadata"]["name"], "stack_a")
+
+    def test_corrupted_file_is_rejected(self):
+        """Test that a file not matching its digest is not returned."""
+        digest = self.store.put(self.manifest)
+        with open(self.store.path_for(digest), "w") as f:
+            f.write('{"metadata": {"name": "other"}}')
+
+        reader = ManifestStore(directory=self.directory)
+        self.assertIsNone(reader.get(digest))
+
+    def test_resolve_reference(self):
+        """Test that references round-trip and ordinary payloads are not references."""
+        digest = self.store.put(self.manifest)
+        reference = json.dumps(make_reference(digest, self.store.path_for(digest)))
+
+        self.assertEqual(parse_reference(reference)["digest"], digest)
+        reader = ManifestStore(directory=os.path.join(self.directory, "reader"))
+        self.assertEqual(reader.resolve(reference), self.manifest)
+        self.assertIsNone(parse_reference(json.dumps(self.manifest)))
+        self.assertIsNone(parse_reference({"value": {"stackId": "org.eclipse.muto:stack"}}))
+
+    def test_old_manifests_are_pruned(self):
+        """Test that only the most recently stored manifests are kept on disk."""
+        store = ManifestStore(directory=self.directory, max_entries=2)
+        digests = []
+        for version in range(4):
+            digests.append(store.put({"metadata": {"name": "stack_a", "version": str(version)}}))
+            os.utime(store.path_for(digests[-1]), (version, version))
+
+        self.assertCountEqual(os.listdir(self.directory), [f"{digest}.json" for digest in digests[-2:]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,15 +11,25 @@
 #   Composiv.ai - initial API and implementation
 #
 
+import base64
 import contextlib
+import shutil
+import tempfile
+import time
 import unittest
 from unittest.mock import MagicMock
 
 import rclpy
 from muto_msgs.msg import MutoAction
 
-from muto_composer.events import EventBus, EventType
-from muto_composer.subsystems.message_handler import MessageHandler, MessageRouter
+from muto_composer.events import EventBus, EventType, StackRequestEvent
+from muto_composer.state.blob_store import BlobStore
+from muto_composer.subsystems.message_handler import (
+    MessageHandler,
+    MessageRouter,
+    StackAdmissionQueue,
+    stack_request_coalesce_key,
+)
 from muto_composer.subsystems.stack_manager import StackType
 
 
@@ -78,6 +88,62 @@ class TestMessageRouter(unittest.TestCase):
         self.assertEqual(event.stack_name, "direct_stack")
         self.assertIn("node", event.stack_payload)
 
+    def test_route_muto_action_records_digest_and_force(self):
+        """Test that intake pops the force flag and records the canonical manifest digest."""
+        routed_events = []
+        self.event_bus.subscribe(EventType.STACK_REQUEST, routed_events.append)
+
+        for payload in (
+            '{"metadata": {"name": "digest_stack"}, "node": ["talker"]}',
+            '{"node": ["talker"],   "metadata": {"name": "digest_stack"}, "force": true}',
+        ):
+            muto_action = MutoAction()
+            muto_action.method = "start"
+            muto_action.payload = payload
+            self.router.route_muto_action(muto_action)
+
+        first, second = routed_events
+        self.assertEqual(first.metadata["manifest_digest"], second.metadata["manifest_digest"])
+        # Each request gets its own correlation id
+        self.assertTrue(first.correlation_id)
+        self.assertNotEqual(first.correlation_id, second.correlation_id)
+        self.assertFalse(first.metadata["force"])
+        self.assertTrue(second.metadata["force"])
+        self.assertNotIn("force", second.stack_payload)
+
+    def test_route_muto_action_reference_has_no_digest(self):
+        """Test that reference-only payloads are not hashed."""
+        routed_events = []
+        self.event_bus.subscribe(EventType.STACK_REQUEST, routed_events.append)
+
+        muto_action = MutoAction()
+        muto_action.method = "start"
+        muto_action.payload = '{"value": {"stackId": "test_stack"}}'
+        self.router.route_muto_action(muto_action)
+
+        self.assertNotIn("manifest_digest", routed_events[0].metadata)
+
+    def test_route_muto_action_spools_archive_data(self):
+        """Test that inline archive data is moved to the blob store before the digest is taken."""
+        routed_events = []
+        self.event_bus.subscribe(EventType.STACK_REQUEST, routed_events.append)
+        blob_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, blob_dir, True)
+        router = MessageRouter(self.event_bus, self.logger, blob_store=BlobStore(directory=blob_dir))
+
+        data = base64.b64encode(b"archive bytes").decode()
+        muto_action = MutoAction()
+        muto_action.method = "start"
+        muto_action.payload = (
+            '{"metadata": {"name": "archive_stack", "content_type": "stack/archive"}, "launch": {"data": "%s"}}' % data
+        )
+        router.route_muto_action(muto_action)
+
+        launch = routed_events[0].stack_payload["launch"]
+        self.assertNotIn("data", launch)
+        self.assertEqual(launch["blob"]["size"], len(b"archive bytes"))
+        self.assertIn("manifest_digest", routed_events[0].metadata)
+
     def test_route_muto_action_invalid_json(self):
         """Test routing MutoAction with invalid JSON."""
         muto_action = MutoAction()
@@ -106,6 +172,24 @@ class TestMessageRouter(unittest.TestCase):
 
         self.assertEqual(stack_name, "metadata_stack")
 
+    def test_extract_stack_name_from_top_level_name(self):
+        """Test stack name extraction from the top-level name."""
+        stack_name = self.router._extract_stack_name({"name": "top_level_stack"}, "test_namespace:test_device")
+
+        self.assertEqual(stack_name, "top_level_stack")
+
+    def test_unnamed_request_is_named_by_its_correlation_id(self):
+        """Test that a payload without a stack name does not fall into a shared bucket."""
+        routed_events = []
+        self.event_bus.subscribe(EventType.STACK_REQUEST, routed_events.append)
+
+        muto_action = MutoAction()
+        muto_action.method = "apply"
+        muto_action.payload = '{"some": "data"}'
+        self.router.route_muto_action(muto_action)
+
+        self.assertEqual(routed_events[0].stack_name, routed_events[0].correlation_id)
+
     def test_extract_stack_name_fallback(self):
         """Test stack name extraction fallback to default."""
         payload = {"some": "data"}
@@ -116,6 +200,115 @@ class TestMessageRouter(unittest.TestCase):
         self.assertEqual(stack_name, default_name)
 
 
+class TestStackAdmissionQueue(unittest.TestCase):
+    def setUp(self):
+        self.event_bus = EventBus()
+        self.logger = MagicMock()
+        self.published = []
+        self.event_bus.subscribe(EventType.STACK_REQUEST, self.published.append)
+
+    def _request(self, stack_name, action="apply", version="1"):
+        return StackRequestEvent(
+            event_type=EventType.STACK_REQUEST,
+            source_component="test",
+            stack_name=stack_name,
+            action=action,
+            stack_payload={"metadata": {"name": stack_name, "version": version}},
+        )
+
+    def test_zero_debounce_publishes_immediately(self):
+        """Test that requests pass straight through without a debounce window."""
+        admission = StackAdmissionQueue(self.event_bus, debounce_sec=0.0, logger=self.logger)
+
+        admission.submit(self._request("stack_a", version="1"))
+        admission.submit(self._request("stack_a", version="2"))
+
+        self.assertEqual(len(self.published), 2)
+        self.assertEqual(admission.metrics_snapshot()["coalesced"], 0)
+
+    def test_newest_request_supersedes_pending_one(self):
+        """Test that only the newest pending request per stack is published."""
+        admission = StackAdmissionQueue(self.event_bus, debounce_sec=60.0, logger=self.logger)
+
+        admission.submit(self._request("stack_a", version="1"))
+        admission.submit(self._request("stack_b", version="1"))
+        admission.submit(self._request("stack_a", version="2"))
+        admission.submit(self._request("stack_a", action="start", version="3"))
+
+        self.assertEqual(self.published, [])
+        self.assertEqual(admission.pending_count(), 2)
+
+        self.assertEqual(admission.flush(), 2)
+        admission.close()
+
+        by_stack = {event.stack_name: event for event in self.published}
+        self.assertEqual(len(self.published), 2)
+        self.assertEqual(by_stack["stack_a"].action, "start")
+        self.assertEqual(by_stack["stack_a"].stack_payload["metadata"]["version"], "3")
+
+        metrics = admission.metrics_snapshot()
+        self.assertEqual(metrics["received"], 4)
+        self.assertEqual(metrics["admitted"], 2)
+        self.assertEqual(metrics["coalesced"], 2)
+        self.assertEqual(metrics["coalesced_by_stack"], {"stack_a": 2})
+        self.assertEqual(metrics["pending"], 0)
+
+    def test_request_released_when_window_closes(self):
+        """Test that a pending request is published once its debounce window has passed."""
+        admission = StackAdmissionQueue(self.event_bus, debounce_sec=0.05, logger=self.logger)
+
+        admission.submit(self._request("stack_a", version="1"))
+        admission.submit(self._request("stack_a", version="2"))
+
+        deadline = time.monotonic() + 2.0
+        while not self.published and time.monotonic() < deadline:
+            time.sleep(0.01)
+        admission.close()
+
+        self.assertEqual(len(self.published), 1)
+        self.assertEqual(self.published[0].stack_payload["metadata"]["version"], "2")
+
+    def test_unnamed_requests_are_never_coalesced(self):
+        """Test that requests naming no stack bypass the debounce window and the bus coalescing key."""
+        admission = StackAdmissionQueue(self.event_bus, debounce_sec=60.0, logger=self.logger)
+        requests = [
+            StackRequestEvent(
+                event_type=EventType.STACK_REQUEST,
+                source_component="test",
+                correlation_id=f"corr-{index}",
+                stack_name="test_namespace:test_device",
+                action="apply",
+                stack_payload={"launch": {}},
+            )
+            for index in range(2)
+        ]
+
+        for request in requests:
+            admission.submit(request)
+
+        self.assertEqual(self.published, requests)
+        self.assertEqual(admission.metrics_snapshot()["coalesced"], 0)
+        self.assertEqual([stack_request_coalesce_key(request) for request in requests], ["corr-0", "corr-1"])
+        self.assertEqual(stack_request_coalesce_key(self._request("stack_a")), "stack_a")
+
+    def test_router_submits_through_admission(self):
+        """Test that the router hands stack requests to its admission queue."""
+        admission = StackAdmissionQueue(self.event_bus, debounce_sec=60.0, logger=self.logger)
+        router = MessageRouter(self.event_bus, self.logger, admission)
+
+        for version in ("1", "2", "3"):
+            muto_action = MutoAction()
+            muto_action.method = "apply"
+            muto_action.payload = '{"metadata": {"name": "burst_stack", "version": "%s"}}' % version
+            router.route_muto_action(muto_action)
+
+        admission.close()
+
+        self.assertEqual(len(self.published), 1)
+        self.assertEqual(self.published[0].stack_payload["metadata"]["version"], "3")
+        self.assertEqual(admission.metrics_snapshot()["coalesced"], 2)
+
+
 class TestMessageHandler(unittest.TestCase):
     def setUp(self):
         # Initialize ROS if not already done
@@ -0,0 +1,78 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import time
+import unittest
+
+from muto_composer.utils.metrics import DurationStats, LatencyHistogram, process_footprint
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_empty_histogram(self):
+        """Test that an empty histogram reports zeros."""
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.to_dict()["count"], 0)
+        self.assertEqual(histogram.percentile(0.99), 0.0)
+
+    def test_percentiles_follow_distribution(self):
+        """Test percentile estimates for a skewed distribution."""
+        histogram = LatencyHistogram()
+        for _ in range(98):
+            histogram.record(0.001)  # 1 ms
+        histogram.record(0.5)  # 500 ms
+        histogram.record(2.0)  # 2 s
+
+        summary = histogram.to_dict()
+        self.assertEqual(summary["count"], 100)
+        self.assertLessEqual(summary["p50_ms"], 1.5)
+        self.assertGreaterEqual(summary["p50_ms"], 1.0)
+        self.assertLessEqual(summary["p95_ms"], 1.5)
+        self.assertGreaterEqual(summary["p99_ms"], 500.0)
+        self.assertEqual(summary["max_ms"], 2000.0)
+
+    def test_percentile_never_exceeds_max(self):
+        """Test that bucket upper bounds are clamped to the observed maximum."""
+        histogram = LatencyHistogram()
+        histogram.record(0.003)
+        self.assertEqual(histogram.percentile(0.5), histogram.max_ms)
+
+
+class TestDurationStats(unittest.TestCase):
+    def test_statistics_cover_the_recent_window(self):
+        """Test that percentiles follow the last durations while totals cover the lifetime."""
+        stats = DurationStats(window=10)
+        for _ in range(10):
+            stats.record("start/provision_step", 2.0)
+        for _ in range(10):
+            stats.record("start/provision_step", 0.1)
+        stats.record("start/provision_step", 0.5, failed=True)
+
+        summary = stats.to_dict()["start/provision_step"]
+        self.assertEqual(summary["count"], 21)
+        self.assertEqual(summary["failed"], 1)
+        self.assertEqual(summary["window"], 10)
+        self.assertEqual(summary["last_ms"], 500.0)
+        self.assertEqual(summary["p50_ms"], 100.0)
+        self.assertEqual(summary["max_ms"], 500.0)
+
+
+class TestProcessFootprint(unittest.TestCase):
+    def test_footprint_reports_startup_and_rss(self):
+        """Test that the footprint reports the elapsed startup time and a positive peak RSS."""
+        footprint = process_footprint(time.monotonic() - 1.5)
+        self.assertGreaterEqual(footprint["startup_sec"], 1.5)
+        self.assertGreater(footprint["max_rss_mb"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
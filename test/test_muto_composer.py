@@ -27,7 +27,7 @@ from muto_composer.events import (
     StackProcessedEvent,
     StackRequestEvent,
 )
-from muto_composer.muto_composer import MutoComposer
+from muto_composer.muto_composer import MutoComposer, main
 
 
 class TestMutoComposerIntegration(unittest.TestCase):
@@ -448,5 +448,22 @@ class TestMutoComposerLegacyCompatibility(unittest.TestCase):
                     pass
 
 
+class TestMutoComposerMain(unittest.TestCase):
+    @patch("muto_composer.muto_composer.rclpy")
+    @patch("muto_composer.muto_composer.MultiThreadedExecutor")
+    @patch("muto_composer.muto_composer.MutoComposer")
+    def test_main_spins_on_multi_threaded_executor(self, mock_composer, mock_executor, mock_rclpy):
+        """Test that main serves the composer on a multi-threaded executor and shuts it down."""
+        mock_composer.return_value.get_parameter.return_value.get_parameter_value.return_value.integer_value = 6
+        mock_executor.return_value.spin.side_effect = KeyboardInterrupt
+
+        main()
+
+        mock_executor.assert_called_once_with(num_threads=6)
+        mock_executor.return_value.add_node.assert_called_once_with(mock_composer.return_value)
+        mock_executor.return_value.shutdown.assert_called_once()
+        mock_composer.return_value.destroy_node.assert_called_once()
+
+
 if __name__ == "__main__":
     unittest.main()
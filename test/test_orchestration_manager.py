@@ -0,0 +1,425 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from muto_composer.events import (
+    EventBus,
+    EventType,
+    PipelineCompletedEvent,
+    PipelineFailedEvent,
+    ProcessCrashedEvent,
+    StackAnalyzedEvent,
+)
+from muto_composer.utils.hashing import manifest_digest
+from muto_composer.subsystems.orchestration_manager import DeploymentOrchestrator, StackScheduler
+
+
+class TestStackScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = StackScheduler(max_workers=4, logger=MagicMock())
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_work_for_one_stack_runs_in_order(self):
+        """Test that work submitted for the same stack runs strictly in submission order."""
+        order = []
+
+        def work(index):
+            time.sleep(0.005)
+            order.append(index)
+
+        for index in range(10):
+            self.scheduler.submit("stack_a", work, index)
+
+        self.assertTrue(self.scheduler.wait_until_idle(5.0))
+        self.assertEqual(order, list(range(10)))
+
+    def test_different_stacks_run_in_parallel(self):
+        """Test that work for different stacks overlaps."""
+        barrier = threading.Barrier(2, timeout=2.0)
+        reached = []
+
+        def work(name):
+            barrier.wait()
+            reached.append(name)
+
+        self.scheduler.submit("stack_a", work, "stack_a")
+        self.scheduler.submit("stack_b", work, "stack_b")
+
+        self.assertTrue(self.scheduler.wait_until_idle(5.0))
+        self.assertCountEqual(reached, ["stack_a", "stack_b"])
+
+    def test_failing_work_does_not_block_the_stack(self):
+        """Test that an exception in one work item does not stop later items of the stack."""
+        done = []
+
+        def fail():
+            raise RuntimeError("boom")
+
+        self.scheduler.submit("stack_a", fail)
+        self.scheduler.submit("stack_a", done.append, "next")
+
+        self.assertTrue(self.scheduler.wait_until_idle(5.0))
+        self.assertEqual(done, ["next"])
+        self.assertEqual(self.scheduler.pending(), {})
+
+
+class TestDeploymentOrchestrator(unittest.TestCase):
+    def setUp(self):
+        self.muto_root = tempfile.mkdtemp()
+        self._previous_root = os.environ.get("MUTO_ROOT")
+        os.environ["MUTO_ROOT"] = self.muto_root
+
+        self.event_bus = EventBus()
+        self.orchestrator = DeploymentOrchestrator(self.event_bus, MagicMock())
+
+        self.started = []
+        self.completed = []
+        self.event_bus.subscribe(EventType.ORCHESTRATION_STARTED, self.started.append)
+        self.event_bus.subscribe(EventType.ORCHESTRATION_COMPLETED, self.completed.append)
+
+    def tearDown(self):
+        if self._previous_root is None:
+            os.environ.pop("MUTO_ROOT", None)
+        else:
+            os.environ["MUTO_ROOT"] = self._previous_root
+        shutil.rmtree(self.muto_root, ignore_errors=True)
+
+    def _analyzed(self, name, version="1", action="start", force=False, correlation_id=None):
+        payload = {"metadata": {"name": name, "version": version}, "node": ["talker"]}
+        return StackAnalyzedEvent(
+            event_type=EventType.STACK_ANALYZED,
+            source_component="stack_analyzer",
+            correlation_id=correlation_id,
+            stack_name=name,
+            action=action,
+            analysis_result={"stack_type": "stack/json"},
+            stack_payload=payload,
+            metadata={"action": action, "manifest_digest": manifest_digest(payload), "force": force},
+        )
+
+    def _deploy(self, name, version="1", force=False):
+        """Run one deployment through the orchestrator and complete its pipeline if it started."""
+        started_before = len(self.started)
+        self.orchestrator.handle_stack_analyzed(self._analyzed(name, version, force=force))
+        if len(self.started) > started_before:
+            self.orchestrator.handle_pipeline_completed(self._pipeline_completed(self.started[-1].orchestration_id))
+            return True
+        return False
+
+    def _pipeline_completed(self, orchestration_id):
+        return PipelineCompletedEvent(
+            event_type=EventType.PIPELINE_COMPLETED,
+            source_component="pipeline_executor",
+            orchestration_id=orchestration_id,
+            pipeline_name="start",
+            execution_id="exec",
+        )
+
+    def test_completion_is_matched_by_orchestration_id(self):
+        """Test that a pipeline completion finishes its own orchestration, not the first started one."""
+        self.orchestrator.handle_stack_analyzed(self._analyzed("stack_a"))
+        self.orchestrator.handle_stack_analyzed(self._analyzed("stack_b"))
+        first, second = self.started
+
+        self.orchestrator.handle_pipeline_completed(self._pipeline_completed(second.orchestration_id))
+
+        self.assertEqual(len(self.completed), 1)
+        self.assertEqual(self.completed[0].orchestration_id, second.orchestration_id)
+        self.assertEqual(self.completed[0].stack_name, "stack_b")
+        self.assertIn(first.orchestration_id, self.orchestrator.active_orchestrations)
+        self.assertNotIn(second.orchestration_id, self.orchestrator.active_orchestrations)
+
+    def test_completion_is_matched_by_correlation_id(self):
+        """Test that a completion without orchestration id is matched by the request's correlation id."""
+        self.orchestrator.handle_stack_analyzed(self._analyzed("stack_a", correlation_id="corr-a"))
+        self.orchestrator.handle_stack_analyzed(self._analyzed("stack_b", correlation_id="corr-b"))
+        first, second = self.started
+        self.assertEqual(second.correlation_id, "corr-b")
+
+        completed = self._pipeline_completed(None)
+        completed.correlation_id = "corr-b"
+        self.orchestrator.handle_pipeline_completed(completed)
+
+        self.assertEqual(len(self.completed), 1)
+        self.assertEqual(self.completed[0].orchestration_id, second.orchestration_id)
+        self.assertEqual(self.completed[0].correlation_id, "corr-b")
+        self.assertEqual(self.orchestrator.get_orchestration_by_correlation("corr-b"), (None, None))
+        self.assertEqual(self.orchestrator.get_orchestration_by_correlation("corr-a")[0], first.orchestration_id)
+
+    def test_rollback_carries_failed_request_correlation_id(self):
+        """Test that a rollback caused by a failed pipeline keeps the correlation id of the request."""
+        rollback_started = []
+        self.event_bus.subscribe(EventType.ROLLBACK_STARTED, rollback_started.append)
+        self.assertTrue(self._deploy("stack_a", "1"))
+        self.orchestrator.handle_stack_analyzed(self._analyzed("stack_a", "2", correlation_id="corr-2"))
+
+        failed = PipelineFailedEvent(
+            event_type=EventType.PIPELINE_FAILED,
+            source_component="pipeline_executor",
+            correlation_id="corr-2",
+            pipeline_name="start",
+            execution_id="exec",
+            failure_step="launch",
+        )
+        self.orchestrator.handle_pipeline_failed(failed)
+
+        self.assertEqual(len(rollback_started), 1)
+        self.assertEqual(rollback_started[0].correlation_id, "corr-2")
+        self.assertEqual(self.started[-1].correlation_id, "corr-2")
+        self.assertTrue(self.orchestrator._rollback_in_progress)
+
+    def test_failed_stack_rolls_back_to_its_own_previous_stack(self):
+        """Test that rollback state and the rollback guard are kept per stack."""
+        rollback_started = []
+        self.event_bus.subscribe(EventType.ROLLBACK_STARTED, rollback_started.append)
+        self.assertTrue(self._deploy("stack_a", "1"))
+        self.assertTrue(self._deploy("stack_a", "2"))
+        self.assertTrue(self._deploy("stack_b", "1"))
+        self.assertTrue(self._deploy("stack_b", "2"))
+
+        # stack_b is deploying when stack_a fails
+        self.orchestrator.handle_stack_analyzed(self._analyzed("stack_b", "3"))
+        self.orchestrator.handle_stack_analyzed(self._analyzed("stack_a", "3"))
+        self.orchestrator.handle_pipeline_failed(
+            PipelineFailedEvent(
+                event_type=EventType.PIPELINE_FAILED,
+                source_component="pipeline_executor",
+                orchestration_id=self.started[-1].orchestration_id,
+                pipeline_name="start",
+                execution_id="exec",
+                failure_step="launch",
+            )
+        )
+
+        self.assertEqual(len(rollback_started), 1)
+        self.assertEqual(rollback_started[0].stack_name, "stack_a")
+        self.assertEqual(rollback_started[0].previous_stack["metadata"], {"name": "stack_a", "version": "2"})
+        self.assertTrue(self.orchestrator._rollback_in_progress_for("stack_a"))
+        self.assertFalse(self.orchestrator._rollback_in_progress_for("stack_b"))
+
+        # A rollback of stack_a does not keep a crashed stack_b from rolling back
+        self.orchestrator.handle_process_crashed(
+            ProcessCrashedEvent(
+                event_type=EventType.PROCESS_CRASHED,
+                source_component="launch_plugin",
+                process_name="talker",
+                stack_name="stack_b",
+                error_message="crash",
+            )
+        )
+
+        self.assertEqual(len(rollback_started), 2)
+        self.assertEqual(rollback_started[1].stack_name, "stack_b")
+        self.assertEqual(rollback_started[1].previous_stack["metadata"], {"name": "stack_b", "version": "2"})
+
+    def test_failed_stack_reference_rolls_back(self):
+        """Test that stackId payloads, which carry no manifest digest, keep rollback state."""
+        rollback_started = []
+        self.event_bus.subscribe(EventType.ROLLBACK_STARTED, rollback_started.append)
+        stack_id = "org.eclipse.muto:referenced_stack"
+
+        def analyzed():
+            return StackAnalyzedEvent(
+                event_type=EventType.STACK_ANALYZED,
+                source_component="stack_analyzer",
+                stack_name=stack_id,
+                action="start",
+                analysis_result={"stack_type": "stack/reference"},
+                stack_payload={"value": {"stackId": stack_id}},
+                metadata={"action": "start"},
+            )
+
+        self.orchestrator.handle_stack_analyzed(analyzed())
+        self.orchestrator.handle_pipeline_completed(self._pipeline_completed(self.started[-1].orchestration_id))
+        self.orchestrator.handle_stack_analyzed(analyzed())
+        self.assertEqual(len(self.started), 2)
+
+        self.orchestrator.handle_pipeline_failed(
+            PipelineFailedEvent(
+                event_type=EventType.PIPELINE_FAILED,
+                source_component="pipeline_executor",
+                orchestration_id=self.started[-1].orchestration_id,
+                pipeline_name="start",
+                execution_id="exec",
+                failure_step="launch",
+            )
+        )
+
+        self.assertEqual(len(rollback_started), 1)
+        self.assertEqual(rollback_started[0].stack_name, stack_id)
+        self.assertEqual(rollback_started[0].previous_stack, {"value": {"stackId": stack_id}})
+
+    def test_newer_request_cancels_running_pipeline(self):
+        """Test that a newer request for a stack cancels its running pipeline, which is not rolled back."""
+        pipeline_executor = MagicMock()
+        orchestrator = DeploymentOrchestrator(self.event_bus, MagicMock(), pipeline_executor=pipeline_executor)
+        rollback_started = []
+        self.event_bus.subscribe(EventType.ROLLBACK_STARTED, rollback_started.append)
+        orchestrator.handle_stack_analyzed(self._analyzed("stack_a", "1"))
+        orchestrator.handle_pipeline_completed(self._pipeline_completed(self.started[-1].orchestration_id))
+
+        orchestrator.handle_stack_analyzed(self._analyzed("stack_a", "2"))
+        orchestrator.handle_stack_analyzed(self._analyzed("stack_b", "1"))
+        running = self.started[-2]
+        pipeline_executor.cancel_stack.assert_not_called()
+
+        orchestrator.handle_stack_analyzed(self._analyzed("stack_a", "3"))
+
+        pipeline_executor.cancel_stack.assert_called_once()
+        self.assertEqual(pipeline_executor.cancel_stack.call_args.args[0], "stack_a")
+        orchestrator.handle_pipeline_failed(
+            PipelineFailedEvent(
+                event_type=EventType.PIPELINE_FAILED,
+                source_component="pipeline_executor",
+                orchestration_id=running.orchestration_id,
+                pipeline_name="start",
+                execution_id="exec",
+                failure_step="launch",
+            )
+        )
+
+        self.assertEqual(rollback_started, [])
+        self.assertNotIn(running.orchestration_id, orchestrator.active_orchestrations)
+        self.assertEqual(len(orchestrator.active_orchestrations), 2)
+
+    def test_completed_orchestration_is_timed(self):
+        """Test that a completed orchestration reports its duration and is recorded per action."""
+        self.orchestrator.handle_stack_analyzed(self._analyzed("stack_a"))
+        time.sleep(0.01)
+        self.orchestrator.handle_pipeline_completed(self._pipeline_completed(self.started[0].orchestration_id))
+
+        self.assertGreaterEqual(self.completed[0].duration, 0.01)
+        self.assertEqual(self.orchestrator.timings.to_dict()["start"]["count"], 1)
+
+    def test_unknown_orchestration_id_is_ignored(self):
+        """Test that a completion for an unknown orchestration leaves running ones untouched."""
+        self.orchestrator.handle_stack_analyzed(self._analyzed("stack_a"))
+
+        self.orchestrator.handle_pipeline_completed(self._pipeline_completed("unknown"))
+
+        self.assertEqual(self.completed, [])
+        self.assertEqual(len(self.orchestrator.active_orchestrations), 1)
+
+    def test_failed_rollback_is_not_rolled_back_again(self):
+        """Test that a failing rollback pipeline publishes RollbackFailed instead of another rollback."""
+        rollback_failed = []
+        self.event_bus.subscribe(EventType.ROLLBACK_FAILED, rollback_failed.append)
+
+        self.orchestrator.trigger_rollback("stack_a", {"metadata": {"name": "stack_a"}}, "crash")
+        rollback = self.started[-1]
+        self.assertTrue(self.orchestrator._rollback_in_progress)
+
+        self.orchestrator.handle_pipeline_failed(
+            PipelineFailedEvent(
+                event_type=EventType.PIPELINE_FAILED,
+                source_component="pipeline_executor",
+                orchestration_id=rollback.orchestration_id,
+                pipeline_name="rollback",
+                execution_id="exec",
+                failure_step="launch",
+            )
+        )
+
+        self.assertEqual(len(rollback_failed), 1)
+        self.assertEqual(rollback_failed[0].orchestration_id, rollback.orchestration_id)
+        self.assertFalse(self.orchestrator._rollback_in_progress)
+
+    def test_unchanged_manifest_is_not_redeployed(self):
+        """Test that re-sending the running manifest completes immediately without a pipeline."""
+        self.assertTrue(self._deploy("stack_a", "1"))
+        self.assertEqual(
+            self.orchestrator.state_persistence.get_running_digest("stack_a"),
+            manifest_digest(self.completed[-1].final_stack_state),
+        )
+
+        self.assertFalse(self._deploy("stack_a", "1"))
+        self.assertEqual(len(self.started), 1)
+        self.assertTrue(self.completed[-1].execution_summary["skipped"])
+        self.assertEqual(self.orchestrator.active_orchestrations, {})
+
+        # A changed manifest and a forced re-deploy both run the pipeline
+        self.assertTrue(self._deploy("stack_a", "2"))
+        self.assertTrue(self._deploy("stack_a", "2", force=True))
+        self.assertEqual(len(self.started), 3)
+
+    def test_stopped_or_failed_stack_is_redeployed(self):
+        """Test that the same manifest runs again after a kill or a failed deployment."""
+        self.assertTrue(self._deploy("stack_a", "1"))
+
+        kill = self._analyzed("stack_a", action="kill")
+        kill.metadata.pop("manifest_digest")
+        self.orchestrator.handle_stack_analyzed(kill)
+        self.orchestrator.handle_pipeline_completed(self._pipeline_completed(self.started[-1].orchestration_id))
+        self.assertIsNone(self.orchestrator.state_persistence.get_running_digest("stack_a"))
+        self.assertTrue(self._deploy("stack_a", "1"))
+
+        self.orchestrator.handle_stack_analyzed(self._analyzed("stack_a", "2"))
+        self.orchestrator.handle_pipeline_failed(
+            PipelineFailedEvent(
+                event_type=EventType.PIPELINE_FAILED,
+                source_component="pipeline_executor",
+                orchestration_id=self.started[-1].orchestration_id,
+                pipeline_name="start",
+                execution_id="exec",
+                failure_step="launch",
+            )
+        )
+        self.assertIsNone(self.orchestrator.state_persistence.get_running_digest("stack_a"))
+
+    def test_queued_orchestration_is_superseded_by_newer_request(self):
+        """Test that per-stack scheduling runs stacks concurrently and skips superseded requests."""
+        scheduler = StackScheduler(max_workers=2)
+        orchestrator = DeploymentOrchestrator(EventBus(), MagicMock(), scheduler)
+        release = threading.Event()
+        started = []
+
+        def run_pipeline(event):
+            started.append((event.stack_name, event.stack_payload["metadata"]["version"]))
+            if event.stack_name == "stack_a":
+                release.wait(2.0)
+
+        orchestrator.event_bus.subscribe(EventType.ORCHESTRATION_STARTED, run_pipeline)
+
+        orchestrator.handle_stack_analyzed(self._analyzed("stack_a", "1"))
+        deadline = time.monotonic() + 2.0
+        while not started and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        orchestrator.handle_stack_analyzed(self._analyzed("stack_a", "2"))
+        orchestrator.handle_stack_analyzed(self._analyzed("stack_a", "3"))
+        orchestrator.handle_stack_analyzed(self._analyzed("stack_b", "1"))
+
+        # stack_b is not held up by the running stack_a deployment
+        deadline = time.monotonic() + 2.0
+        while ("stack_b", "1") not in started and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIn(("stack_b", "1"), started)
+
+        release.set()
+        self.assertTrue(scheduler.wait_until_idle(5.0))
+        scheduler.shutdown()
+
+        self.assertEqual([entry for entry in started if entry[0] == "stack_a"], [("stack_a", "1"), ("stack_a", "3")])
+
+
+if __name__ == "__main__":
+    unittest.main()
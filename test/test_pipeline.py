@@ -11,13 +11,24 @@
 #   Composiv.ai - initial API and implementation
 #
 
+import os
+import tempfile
+import threading
+import time
 import unittest
+from concurrent.futures import CancelledError
 from unittest.mock import MagicMock, patch
 
 import rclpy
 from rclpy.node import Node
 
-from muto_composer.workflow.pipeline import Pipeline
+from muto_composer.plugins.in_process import InProcessPlugins
+from muto_composer.state.step_cache import StepCache
+from muto_composer.subsystems.pipeline_engine import PipelineExecutor, PipelineManager
+from muto_composer.workflow import pipeline as pipeline_module
+from muto_composer.workflow.compiler import compile_pipeline
+from muto_composer.workflow.pipeline import Pipeline, PipelineRun
+from muto_composer.workflow.service_pool import ServiceClientPool
 
 
 class TestPipeline(unittest.TestCase):
@@ -275,6 +286,475 @@ class TestPipeline(unittest.TestCase):
         if rclpy.ok():
             rclpy.shutdown()
 
+    @patch("importlib.import_module")
+    @patch("rclpy.create_node")
+    def test_execute_pipeline_with_client_pool(self, mock_create_node, mock_import_module):
+        """Test that pooled clients are prepared once and no node is created per execution."""
+        mock_plugin_class = MagicMock()
+        mock_import_module.return_value = MagicMock(
+            ComposePlugin=mock_plugin_class,
+            ProvisionPlugin=mock_plugin_class,
+            LaunchPlugin=mock_plugin_class,
+        )
+        pool = MagicMock(spec=ServiceClientPool)
+        pool.call.return_value = MagicMock(success=True, err_msg="")
+
+        pipeline = Pipeline(
+            name="test_pipeline",
+            steps=self.steps_config,
+            compensation=self.compensation_config,
+            client_pool=pool,
+        )
+        pool.prepare.assert_called_once()
+        self.assertEqual(
+            [service for _plugin, service in pool.prepare.call_args[0][0]],
+            ["muto_compose", "muto_provision", "muto_launch_stack", "muto_kill_stack"],
+        )
+
+        for _ in range(2):
+            pipeline.execute_pipeline(additional_context={"should_run_provision": False, "should_run_launch": True})
+
+        mock_create_node.assert_not_called()
+        self.assertEqual(
+            [call.args[1] for call in pool.call.call_args_list],
+            ["muto_compose", "muto_launch_stack"] * 2,
+        )
+
+    @patch("importlib.import_module")
+    def test_parallel_block_runs_independent_steps_concurrently(self, mock_import_module):
+        """Test that a parallel block overlaps independent steps and passes outputs along dependencies."""
+        mock_import_module.return_value = MagicMock(ComposePlugin=MagicMock(), ProvisionPlugin=MagicMock())
+        steps = [
+            {
+                "parallel": [
+                    {"name": "provision_a", "service": "provision_a", "plugin": "ProvisionPlugin"},
+                    {"name": "compose_b", "service": "compose_b", "plugin": "ComposePlugin"},
+                    {
+                        "name": "compose_a",
+                        "service": "compose_a",
+                        "plugin": "ComposePlugin",
+                        "depends_on": ["provision_a"],
+                    },
+                ]
+            }
+        ]
+        active, peak, inputs = [0], [0], {}
+        lock = threading.Lock()
+
+        def call(plugin, service, request, **kwargs):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                inputs[service] = request.input.current
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return MagicMock(success=True, err_msg="", output=MagicMock(current=f"{service}_output"))
+
+        pool = MagicMock(spec=ServiceClientPool)
+        pool.call.side_effect = call
+        pipeline = Pipeline(name="test_pipeline", steps=steps, compensation=[], client_pool=pool)
+        run = pipeline.execute_pipeline()
+
+        self.assertTrue(run.success)
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(inputs["compose_a"], "provision_a_output")
+        self.assertEqual(run.executed_steps.index("compose_a"), 2)
+        self.assertTrue(all(run.context[name].success for name in ("provision_a", "compose_b", "compose_a")))
+
+    @patch("importlib.import_module")
+    def test_parallel_failure_compensates_only_steps_that_ran(self, mock_import_module):
+        """Test that dependents of a failed step do not start and their compensation is skipped."""
+        mock_import_module.return_value = MagicMock(ComposePlugin=MagicMock(), LaunchPlugin=MagicMock())
+        steps = [
+            {
+                "parallel": [
+                    {"name": "compose_a", "service": "compose_a", "plugin": "ComposePlugin"},
+                    {"name": "launch_a", "service": "launch_a", "plugin": "LaunchPlugin", "depends_on": ["compose_a"]},
+                ]
+            }
+        ]
+        compensation = [
+            {"service": "undo_compose", "plugin": "ComposePlugin", "compensates": ["compose_a"]},
+            {"service": "undo_launch", "plugin": "LaunchPlugin", "compensates": ["launch_a"]},
+        ]
+        pool = MagicMock(spec=ServiceClientPool)
+        pool.call.side_effect = lambda plugin, service, request, **kwargs: MagicMock(
+            success=service != "compose_a", err_msg=""
+        )
+
+        pipeline = Pipeline(name="test_pipeline", steps=steps, compensation=compensation, client_pool=pool)
+        run = pipeline.execute_pipeline()
+
+        self.assertEqual([call.args[1] for call in pool.call.call_args_list], ["compose_a", "undo_compose"])
+        self.assertEqual(run.executed_steps, ["compose_a"])
+        self.assertEqual(run.failure_step, "compose_a")
+        self.assertTrue(run.compensation_executed)
+
+    @patch("importlib.import_module")
+    def test_invalid_dependencies_are_rejected(self, mock_import_module):
+        """Test that unknown, forward and cyclic dependencies fail when the pipeline is loaded."""
+        mock_import_module.return_value = MagicMock(ComposePlugin=MagicMock())
+
+        def step(name, *depends_on):
+            return {"name": name, "service": name, "plugin": "ComposePlugin", "depends_on": list(depends_on)}
+
+        invalid = [
+            [{"parallel": [step("a", "b"), step("b", "a")]}],
+            [{"sequence": [step("a", "b"), step("b")]}],
+            [{"parallel": [step("a", "missing")]}],
+            [{"sequence": [step("a")]}, {"parallel": [step("a")]}],
+        ]
+        for steps in invalid:
+            with self.assertRaises(ValueError):
+                Pipeline(name="test_pipeline", steps=steps, compensation=[])
+        with self.assertRaises(ValueError):
+            Pipeline(
+                name="test_pipeline",
+                steps=[{"sequence": [step("a")]}],
+                compensation=[{"service": "undo", "plugin": "ComposePlugin", "compensates": ["b"]}],
+            )
+
+    @patch("importlib.import_module")
+    def test_concurrent_runs_do_not_share_context(self, mock_import_module):
+        """Test that overlapping executions of one pipeline keep their own context and results."""
+        mock_import_module.return_value = MagicMock(ComposePlugin=MagicMock(), LaunchPlugin=MagicMock())
+        steps = [
+            {
+                "sequence": [
+                    {"name": "compose_step", "service": "muto_compose", "plugin": "ComposePlugin"},
+                    {
+                        "name": "launch_step",
+                        "service": "muto_launch",
+                        "plugin": "LaunchPlugin",
+                        "condition": "should_run_launch == True",
+                    },
+                ]
+            }
+        ]
+        barrier = threading.Barrier(2)
+
+        def call(plugin, service, request, **kwargs):
+            if service == "muto_compose":
+                barrier.wait(timeout=5)
+            return MagicMock(success=True, err_msg="")
+
+        pool = MagicMock(spec=ServiceClientPool)
+        pool.call.side_effect = call
+        pipeline = Pipeline(name="start", steps=steps, compensation=[], client_pool=pool)
+
+        runs = {}
+        threads = [
+            threading.Thread(
+                target=lambda launch=launch: runs.__setitem__(
+                    launch, pipeline.execute_pipeline(additional_context={"should_run_launch": launch})
+                )
+            )
+            for launch in (True, False)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(runs[True].step_status, {"compose_step": "passed", "launch_step": "passed"})
+        self.assertEqual(runs[False].step_status, {"compose_step": "passed", "launch_step": "skipped"})
+        self.assertNotIn("launch_step", runs[False].context)
+
+        pool.call.side_effect = None
+        pool.call.return_value = MagicMock(success=True, err_msg="")
+        next_run = pipeline.execute_pipeline()
+        self.assertNotIn("should_run_launch", next_run.context)
+        self.assertEqual(next_run.step_status["launch_step"], "skipped")
+
+    @patch("importlib.import_module")
+    def test_executor_reports_failed_run(self, mock_import_module):
+        """Test that a failed step is reported as a pipeline failure with its step name."""
+        mock_import_module.return_value = MagicMock(ComposePlugin=MagicMock(), LaunchPlugin=MagicMock())
+        pool = MagicMock(spec=ServiceClientPool)
+        pool.call.return_value = MagicMock(success=False, err_msg="compose error")
+        pipeline = Pipeline(
+            name="start",
+            steps=[{"sequence": [{"name": "compose_step", "service": "muto_compose", "plugin": "ComposePlugin"}]}],
+            compensation=self.compensation_config,
+            client_pool=pool,
+        )
+        executor = PipelineExecutor(MagicMock(), MagicMock())
+        event = MagicMock(execution_context={}, stack_manifest=None)
+
+        result = executor._execute_pipeline_real(pipeline, event)
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["failure_step"], "compose_step")
+        self.assertIn("compose error", result["error"])
+        self.assertTrue(result["compensation_executed"])
+        self.assertIn("compose_step", result["step_durations"])
+
+        executor._record_timings(pipeline.name, result)
+        timings = executor.timings.to_dict()
+        self.assertEqual(timings["start"]["failed"], 1)
+        self.assertEqual(timings["start/compose_step"]["failed"], 1)
+
+    @patch("importlib.import_module")
+    def test_step_timeout_and_deadline_bound_calls(self, mock_import_module):
+        """Test that a timed-out step fails the run at that step and runs compensation."""
+        mock_import_module.return_value = MagicMock(ComposePlugin=MagicMock(), LaunchPlugin=MagicMock())
+        steps = [
+            {
+                "sequence": [
+                    {"name": "compose_step", "service": "muto_compose", "plugin": "ComposePlugin", "timeout": 0.5},
+                    {"name": "launch_step", "service": "muto_launch", "plugin": "LaunchPlugin"},
+                ]
+            }
+        ]
+
+        def call(plugin, service, request, timeout=None, cancelled=None):
+            if service == "muto_launch":
+                raise TimeoutError(f"Service call to '{service}' timed out after {timeout}s")
+            return MagicMock(success=True, err_msg="")
+
+        pool = MagicMock(spec=ServiceClientPool)
+        pool.call.side_effect = call
+        plan = compile_pipeline("start", steps, self.compensation_config, timeout=30.0, step_timeout=5.0)
+        pipeline = Pipeline("start", steps, self.compensation_config, client_pool=pool, plan=plan)
+
+        run = pipeline.execute_pipeline()
+
+        timeouts = {call.args[1]: call.kwargs["timeout"] for call in pool.call.call_args_list}
+        self.assertEqual(timeouts["muto_compose"], 0.5)
+        self.assertAlmostEqual(timeouts["muto_launch"], 5.0, places=1)
+        self.assertEqual(timeouts["muto_kill_stack"], 5.0)
+        self.assertFalse(run.success)
+        self.assertEqual(run.failure_step, "launch_step")
+        self.assertIn("timed out", run.error)
+        self.assertTrue(run.compensation_executed)
+
+    @patch("importlib.import_module")
+    def test_cancelled_run_stops_at_running_step(self, mock_import_module):
+        """Test that cancelling a run stops the waiting step, skips later steps and compensates."""
+        mock_import_module.return_value = MagicMock(ComposePlugin=MagicMock(), LaunchPlugin=MagicMock())
+        started = threading.Event()
+
+        def call(plugin, service, request, timeout=None, cancelled=None):
+            if service == "muto_compose":
+                started.set()
+                cancelled.wait(timeout=5)
+                raise CancelledError()
+            return MagicMock(success=True, err_msg="")
+
+        pool = MagicMock(spec=ServiceClientPool)
+        pool.call.side_effect = call
+        pipeline = Pipeline("start", self.steps_config, self.compensation_config, client_pool=pool)
+        run = pipeline.create_run({"should_run_provision": True, "should_run_launch": True})
+
+        executing = threading.Thread(target=pipeline.execute_pipeline, kwargs={"run": run})
+        executing.start()
+        self.assertTrue(started.wait(timeout=5))
+        run.cancel("Superseded by a newer request")
+        executing.join(timeout=5)
+
+        self.assertEqual([call.args[1] for call in pool.call.call_args_list], ["muto_compose", "muto_kill_stack"])
+        self.assertEqual(run.failure_step, "compose_step")
+        self.assertEqual(run.error, "Superseded by a newer request")
+
+    @patch("importlib.import_module")
+    @patch("rclpy.spin_until_future_complete")
+    @patch("rclpy.create_node")
+    def test_private_node_call_times_out(self, mock_create_node, mock_spin, mock_import_module):
+        """Test that spinning a private node for a hung plugin stops at the step timeout."""
+        mock_import_module.return_value = MagicMock(ComposePlugin=MagicMock())
+        client = MagicMock()
+        client.wait_for_service.return_value = True
+        client.call_async.return_value.done.return_value = False
+        mock_create_node.return_value.create_client.return_value = client
+        steps = [{"sequence": [{"name": "compose_step", "service": "muto_compose", "plugin": "ComposePlugin"}]}]
+        pipeline = Pipeline("start", steps, [], plan=compile_pipeline("start", steps, [], step_timeout=0.2))
+
+        started = time.monotonic()
+        run = pipeline.execute_pipeline()
+
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual(run.failure_step, "compose_step")
+        client.call_async.return_value.cancel.assert_called_once()
+        self.assertIsNotNone(mock_spin.call_args.kwargs["timeout_sec"])
+        mock_create_node.return_value.destroy_node.assert_called_once()
+
+    def test_executor_cancels_running_executions_of_stack(self):
+        """Test that cancel_stack cancels only the runs of that stack."""
+        executor = PipelineExecutor(MagicMock(), MagicMock())
+        runs = {"stack_a": PipelineRun("start"), "stack_b": PipelineRun("start")}
+        for stack_name, run in runs.items():
+            executor.active_executions[stack_name] = {"event": MagicMock(stack_name=stack_name), "run": run}
+
+        self.assertEqual(executor.cancel_stack("stack_a"), 1)
+        self.assertTrue(runs["stack_a"].cancelled)
+        self.assertFalse(runs["stack_b"].cancelled)
+        self.assertFalse(executor.cancel_execution("missing"))
+
+    @patch("muto_composer.workflow.service_pool.SingleThreadedExecutor")
+    @patch("muto_composer.workflow.service_pool.rclpy")
+    def test_client_pool_call_timeout_and_cancel(self, mock_rclpy, mock_executor):
+        """Test that a pooled call stops waiting at its timeout or when cancelled."""
+        client = MagicMock()
+        client.service_is_ready.return_value = True
+        mock_rclpy.create_node.return_value.create_client.return_value = client
+        pool = ServiceClientPool()
+
+        with self.assertRaises(TimeoutError):
+            pool.call(MagicMock(), "muto_compose", MagicMock(), timeout=0.1)
+        cancelled = threading.Event()
+        cancelled.set()
+        with self.assertRaises(CancelledError):
+            pool.call(MagicMock(), "muto_compose", MagicMock(), cancelled=cancelled)
+        self.assertEqual(client.call_async.return_value.cancel.call_count, 2)
+        pool.shutdown()
+
+    @patch("importlib.import_module")
+    def test_cached_step_skips_service_call(self, mock_import_module):
+        """Test that a step marked cache is called once per input manifest."""
+
+        class FakeStackManifest:
+            def __init__(self):
+                self.name = ""
+                self.stack = ""
+
+            @classmethod
+            def get_fields_and_field_types(cls):
+                return {"name": "string", "stack": "string"}
+
+        mock_import_module.return_value = MagicMock(ComposePlugin=MagicMock(), LaunchPlugin=MagicMock())
+        steps = [
+            {
+                "sequence": [
+                    {"name": "compose_step", "service": "muto_compose", "plugin": "ComposePlugin", "cache": True},
+                    {"name": "launch_step", "service": "muto_launch", "plugin": "LaunchPlugin"},
+                ]
+            }
+        ]
+        launched = []
+
+        def call(plugin, service, request, **kwargs):
+            if service == "muto_launch":
+                launched.append(request.input.current.stack)
+            return MagicMock(success=True, err_msg="", output=MagicMock(current=request.input.current))
+
+        pool = MagicMock(spec=ServiceClientPool)
+        pool.call.side_effect = call
+        step_cache = MagicMock(spec=StepCache)
+        stored = {}
+        step_cache.key.side_effect = lambda step, plugin, service, fields: f"{step}:{fields['stack']}"
+        step_cache.get.side_effect = stored.get
+        step_cache.put.side_effect = lambda key, step, result: stored.__setitem__(key, result)
+
+        with patch.object(pipeline_module, "StackManifest", FakeStackManifest):
+            pipeline = Pipeline("start", steps, [], client_pool=pool, step_cache=step_cache)
+            runs = [pipeline.execute_pipeline(next_manifest={"name": "stack_a"}) for _ in range(2)]
+            pipeline.execute_pipeline(next_manifest={"name": "stack_b"})
+
+        services = [call.args[1] for call in pool.call.call_args_list]
+        self.assertEqual(services.count("muto_compose"), 2)
+        self.assertEqual(services.count("muto_launch"), 3)
+        self.assertEqual(launched[0], launched[1])
+        self.assertTrue(all(run.success for run in runs))
+        self.assertTrue(runs[1].context["compose_step"].success)
+
+    @patch("importlib.import_module")
+    def test_in_process_step_skips_service_call(self, mock_import_module):
+        """Test that a step marked in_process calls the hosted plugin and others use the client pool."""
+        mock_import_module.return_value = MagicMock(ComposePlugin=MagicMock(), LaunchPlugin=MagicMock())
+        steps = [
+            {
+                "sequence": [
+                    {"name": "compose_step", "service": "muto_compose", "plugin": "ComposePlugin", "in_process": True},
+                    {"name": "launch_step", "service": "muto_start_stack", "plugin": "LaunchPlugin"},
+                ]
+            }
+        ]
+        pool = MagicMock(spec=ServiceClientPool)
+        pool.call.return_value = MagicMock(success=True, err_msg="")
+        in_process = MagicMock(spec=InProcessPlugins)
+        in_process.available.return_value = True
+        in_process.call.return_value = MagicMock(success=True, err_msg="")
+
+        pipeline = Pipeline("start", steps, [], client_pool=pool, in_process_plugins=in_process)
+        run = pipeline.execute_pipeline()
+
+        self.assertTrue(run.success)
+        self.assertEqual(in_process.call.call_args.args[:2], ("ComposePlugin", "muto_compose"))
+        self.assertIn("timeout", in_process.call.call_args.kwargs)
+        self.assertIs(in_process.call.call_args.kwargs["cancelled"], run.cancel_event)
+        self.assertEqual([call.args[1] for call in pool.call.call_args_list], ["muto_start_stack"])
+
+    @patch("importlib.import_module")
+    def test_mixed_in_process_modes_are_reported(self, mock_import_module):
+        """Test that a plugin called both in-process and through its service is logged as a warning."""
+        mock_import_module.return_value = MagicMock(LaunchPlugin=MagicMock())
+        manager = PipelineManager.__new__(PipelineManager)
+        manager.logger = MagicMock()
+        manager.step_timeout = manager.pipeline_timeout = None
+        start = {"plugin": "LaunchPlugin", "service": "muto_start_stack", "in_process": True}
+        kill = {"plugin": "LaunchPlugin", "service": "muto_kill_stack"}
+
+        manager.compile_pipelines(
+            {
+                "pipelines": [
+                    {"name": "start", "pipeline": [{"sequence": [dict(start, name="launch_step")]}]},
+                    {"name": "kill", "pipeline": [{"sequence": [dict(kill, name="kill_step")]}]},
+                ]
+            }
+        )
+
+        manager.logger.warning.assert_called_once_with(
+            "Plugin LaunchPlugin is called both in-process and through its service"
+        )
+
+    @patch("importlib.import_module")
+    def test_reload_swaps_changed_pipelines(self, mock_import_module):
+        """Test that a changed configuration is swapped in while running pipelines keep their plan."""
+        mock_import_module.return_value = MagicMock(ComposePlugin=MagicMock(), LaunchPlugin=MagicMock())
+        config_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(config_dir.cleanup)
+        config_path = os.path.join(config_dir.name, "pipeline.yaml")
+
+        def write_config(launch_service, mtime):
+            with open(config_path, "w") as f:
+                f.write(
+                    "pipelines:\n"
+                    "  - name: start\n"
+                    "    pipeline:\n"
+                    "      - sequence:\n"
+                    f"          - {{name: launch_step, plugin: LaunchPlugin, service: {launch_service}}}\n"
+                    "    compensation:\n"
+                    "      - {plugin: LaunchPlugin, service: muto_kill_stack}\n"
+                    "  - name: compose\n"
+                    "    pipeline:\n"
+                    "      - sequence:\n"
+                    "          - {name: compose_step, plugin: ComposePlugin, service: muto_compose}\n"
+                    "    compensation:\n"
+                    "      - {plugin: LaunchPlugin, service: muto_kill_stack}\n"
+                )
+            os.utime(config_path, ns=(mtime, mtime))
+
+        write_config("muto_start_stack", 1_000_000_000)
+        manager = PipelineManager(config_path=config_path)
+        running = manager.get_pipeline("start")
+        compose = manager.get_pipeline("compose")
+        self.assertFalse(manager.reload_if_changed())
+
+        write_config("muto_apply_stack", 2_000_000_000)
+        self.assertTrue(manager.reload_if_changed())
+        self.assertEqual(manager.get_pipeline("start").plan.items[0].steps[0].service, "muto_apply_stack")
+        self.assertEqual(running.plan.items[0].steps[0].service, "muto_start_stack")
+        self.assertIs(manager.get_pipeline("compose"), compose)
+
+        # An invalid configuration keeps the loaded pipelines and is not retried until it changes again
+        with open(config_path, "w") as f:
+            f.write("pipelines: invalid\n")
+        os.utime(config_path, ns=(3_000_000_000, 3_000_000_000))
+        self.assertFalse(manager.reload_if_changed())
+        self.assertFalse(manager.reload_if_changed())
+        self.assertEqual(manager.get_pipeline("start").plan.items[0].steps[0].service, "muto_apply_stack")
+
 
 if __name__ == "__main__":
     unittest.main()
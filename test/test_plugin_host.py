@@ -0,0 +1,74 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import ast
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from muto_composer.plugins.in_process import BUILTIN_PLUGINS, ENTRY_POINT_GROUP, discover_plugins
+from muto_composer.plugins.plugin_host import create_plugins, main
+
+SETUP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "setup.py")
+
+
+class TestPluginHost(unittest.TestCase):
+    def test_create_plugins_from_factories(self):
+        """Test that every registered plugin is instantiated once."""
+        compose, launch = MagicMock(name="compose"), MagicMock(name="launch")
+
+        plugins = create_plugins({"ComposePlugin": lambda: compose, "LaunchPlugin": lambda: launch})
+
+        self.assertEqual(plugins, {"ComposePlugin": compose.return_value, "LaunchPlugin": launch.return_value})
+        # Each plugin serves its services from its own mutually exclusive callback group
+        compose_group = compose.call_args.kwargs["service_callback_group"]
+        launch_group = launch.call_args.kwargs["service_callback_group"]
+        self.assertIsNot(compose_group, launch_group)
+
+    def test_builtin_plugins_match_setup_entry_points(self):
+        """Test that the built-in plugin defaults are the entry points registered by setup.py."""
+        with open(SETUP_PATH) as f:
+            tree = ast.parse(f.read())
+        setup_call = next(
+            node for node in ast.walk(tree) if isinstance(node, ast.Call) and getattr(node.func, "id", "") == "setup"
+        )
+        entry_points = ast.literal_eval(next(k.value for k in setup_call.keywords if k.arg == "entry_points"))
+        registered = dict(entry.replace(" ", "").split("=", 1) for entry in entry_points[ENTRY_POINT_GROUP])
+
+        self.assertEqual(registered, BUILTIN_PLUGINS)
+
+    @patch("muto_composer.plugins.in_process.entry_points", return_value=[])
+    def test_builtin_plugins_are_discovered_without_entry_points(self, mock_entry_points):
+        """Test that the built-in plugins are used when the package has no installed entry points."""
+        self.assertEqual(sorted(discover_plugins()), sorted(BUILTIN_PLUGINS))
+
+    @patch("muto_composer.plugins.plugin_host.rclpy")
+    @patch("muto_composer.plugins.plugin_host.MultiThreadedExecutor")
+    @patch("muto_composer.plugins.plugin_host.create_plugins")
+    def test_main_spins_all_plugins_on_one_executor(self, mock_create_plugins, mock_executor, mock_rclpy):
+        """Test that the host adds every plugin to one multi-threaded executor and destroys them on exit."""
+        plugins = {"ComposePlugin": MagicMock(), "ProvisionPlugin": MagicMock(), "LaunchPlugin": MagicMock()}
+        mock_create_plugins.return_value = plugins
+        mock_executor.return_value.spin.side_effect = KeyboardInterrupt
+
+        main()
+
+        mock_executor.assert_called_once_with(num_threads=4)
+        self.assertEqual(mock_executor.return_value.add_node.call_count, 3)
+        mock_executor.return_value.shutdown.assert_called_once()
+        for plugin in plugins.values():
+            plugin.destroy_node.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
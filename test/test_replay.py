@@ -0,0 +1,121 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from muto_composer.events import EventType, StackRequestEvent
+from muto_composer.state.replay import JournalReplayer, StandInPlugins
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "pipeline.yaml")
+
+
+def _record(seq, event, wall_time=0.0):
+    return {"seq": seq, "class": type(event).__name__, "wall_time": wall_time, "event": event.to_dict()}
+
+
+def _outcome_record(seq, event_type, **fields):
+    return {"seq": seq, "class": "BaseComposeEvent", "wall_time": 0.0, "event": {"event_type": event_type, **fields}}
+
+
+class TestJournalReplay(unittest.TestCase):
+    def setUp(self):
+        self.muto_root = tempfile.mkdtemp()
+        self._previous_root = os.environ.get("MUTO_ROOT")
+
+    def tearDown(self):
+        if self._previous_root is None:
+            os.environ.pop("MUTO_ROOT", None)
+        else:
+            os.environ["MUTO_ROOT"] = self._previous_root
+        shutil.rmtree(self.muto_root, ignore_errors=True)
+
+    def _start_request(self, name="replay_stack"):
+        return StackRequestEvent(
+            event_type=EventType.STACK_REQUEST,
+            source_component="message_router",
+            stack_name=name,
+            action="start",
+            stack_payload={
+                "metadata": {"name": name, "content_type": "stack/json"},
+                "launch": {"node": [{"name": "talker", "pkg": "demo_nodes_cpp", "exec": "talker"}]},
+            },
+        )
+
+    def test_replay_runs_recorded_requests_through_pipeline(self):
+        """Test that a recorded start request reaches the stand-in plugins."""
+        records = [
+            _record(1, self._start_request()),
+            _outcome_record(2, EventType.PIPELINE_COMPLETED.value, pipeline_name="start"),
+            _outcome_record(3, EventType.ORCHESTRATION_COMPLETED.value),
+        ]
+
+        report = JournalReplayer(records, CONFIG_PATH, muto_root=self.muto_root).run(timeout=10.0)
+
+        self.assertTrue(report["completed"])
+        self.assertEqual(report["inputs_replayed"], 1)
+        self.assertEqual(report["replayed_outcomes"], [EventType.ORCHESTRATION_COMPLETED.value])
+        self.assertTrue(report["outcomes_match"])
+        self.assertGreater(report["stand_in_calls"], 0)
+
+    def test_replay_does_not_change_muto_root(self):
+        """Test that replayed state is kept under the replay root without leaking it to the caller."""
+        os.environ["MUTO_ROOT"] = os.path.join(self.muto_root, "deployment")
+        replay_root = os.path.join(self.muto_root, "replay")
+        records = [_record(1, self._start_request())]
+
+        replayer = JournalReplayer(records, CONFIG_PATH, muto_root=replay_root)
+        self.assertEqual(os.environ["MUTO_ROOT"], os.path.join(self.muto_root, "deployment"))
+        replayer.run(timeout=10.0)
+
+        self.assertEqual(os.environ["MUTO_ROOT"], os.path.join(self.muto_root, "deployment"))
+        self.assertTrue(os.path.isdir(replay_root))
+        self.assertFalse(os.path.exists(os.path.join(self.muto_root, "deployment")))
+
+    def test_recorded_pipeline_failure_is_reproduced(self):
+        """Test that a recorded pipeline failure is replayed as a failure."""
+        records = [
+            _record(1, self._start_request()),
+            _outcome_record(
+                2,
+                EventType.PIPELINE_FAILED.value,
+                pipeline_name="start",
+                failure_step="launch_step",
+                error_details={"error": "launch failed"},
+            ),
+        ]
+        stand_ins = JournalReplayer.stand_ins_from_records(records)
+
+        report = JournalReplayer(records, CONFIG_PATH, stand_ins=stand_ins, muto_root=self.muto_root).run(
+            timeout=10.0
+        )
+
+        self.assertTrue(report["completed"])
+        self.assertNotIn(EventType.ORCHESTRATION_COMPLETED.value, report["replayed_outcomes"])
+
+    def test_stand_in_stops_at_recorded_failure_step(self):
+        """Test that stand-in plugins stop at the recorded failing step."""
+        stand_ins = StandInPlugins()
+        stand_ins.record_outcome("start", False, error="boom", failure_step="provision_step")
+
+        outcome = stand_ins.run("start", ["provision_step", "launch_step"])
+
+        self.assertFalse(outcome["success"])
+        self.assertEqual(stand_ins.calls, [("start", "provision_step")])
+        self.assertTrue(stand_ins.run("start", ["launch_step"])["success"])
+
+
+if __name__ == "__main__":
+    unittest.main()
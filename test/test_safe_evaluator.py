@@ -38,6 +38,15 @@ class TestSafeEvaluator(unittest.TestCase):
         with self.assertRaises(ValueError):
             evaluator.eval_expr("import sys")
 
+    def test_compiled_condition_is_cached(self):
+        condition = SafeEvaluator.compile("step1.success == True and not skip")
+        self.assertIs(condition, SafeEvaluator.compile("step1.success == True and not skip"))
+        self.assertEqual(condition.names, frozenset({"step1", "skip"}))
+        self.assertTrue(condition({"step1": type("Response", (object,), {"success": True})}))
+        self.assertFalse(condition({"step1": type("Response", (object,), {"success": True}), "skip": True}))
+        with self.assertRaises(ValueError):
+            SafeEvaluator.compile("step1 in [1, 2]")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,80 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from muto_composer.state.step_cache import StepCache
+from muto_composer.utils.paths import ARTIFACT_STATE_FILE
+
+
+class TestStepCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        patcher = patch.dict(os.environ, {"MUTO_ROOT": self.root})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = StepCache(max_entries=2)
+        self.manifest = {"name": "stack_a", "stack": '{"metadata": {"name": "stack_a"}}'}
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_hit_after_store(self):
+        """Test that a stored result is returned for the same step and input."""
+        key = self.cache.key("compose_step", "ComposePlugin", "muto_compose", self.manifest)
+        self.assertIsNone(self.cache.get(key))
+
+        self.cache.put(key, "compose_step", {"output": self.manifest})
+
+        self.assertEqual(self.cache.get(key), {"output": self.manifest})
+        self.assertNotEqual(key, self.cache.key("provision_step", "ProvisionPlugin", "muto_provision", self.manifest))
+        snapshot = self.cache.metrics_snapshot()
+        self.assertEqual((snapshot["hits"], snapshot["misses"], snapshot["stores"]), (1, 1, 1))
+
+    def test_workspace_change_changes_key(self):
+        """Test that provisioning or removing the stack workspace makes earlier results unreachable."""
+        absent = self.cache.key("provision_step", "ProvisionPlugin", "muto_provision", self.manifest)
+        workspace = os.path.join(self.root, "workspaces", "stack_a")
+        os.makedirs(workspace)
+        with open(os.path.join(workspace, ARTIFACT_STATE_FILE), "w") as f:
+            f.write('{"checksum": "1"}')
+        provisioned = self.cache.key("provision_step", "ProvisionPlugin", "muto_provision", self.manifest)
+        with open(os.path.join(workspace, ARTIFACT_STATE_FILE), "w") as f:
+            f.write('{"checksum": "2"}')
+        reprovisioned = self.cache.key("provision_step", "ProvisionPlugin", "muto_provision", self.manifest)
+
+        self.assertEqual(len({absent, provisioned, reprovisioned}), 3)
+
+    def test_lru_pruning_and_invalidation(self):
+        """Test that the least recently used entry is pruned and invalidation removes entries by step."""
+        for name in ("a", "b"):
+            self.cache.put(name, f"{name}_step", {"output": {}})
+            time.sleep(0.01)
+        self.assertIsNotNone(self.cache.get("a"))
+        time.sleep(0.01)
+        self.cache.put("c", "c_step", {"output": {}})
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.invalidate("a_step"), 1)
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.invalidate(), 1)
+        self.assertEqual(self.cache.metrics_snapshot()["invalidations"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+#
+# Copyright (c) 2025 Composiv.ai
+#
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License 2.0 which is available at
+# http://www.eclipse.org/legal/epl-2.0.
+#
+# SPDX-License-Identifier: EPL-2.0
+#
+# Contributors:
+#   Composiv.ai - initial API and implementation
+#
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from muto_composer.state.twin_cache import TwinDefinitionCache
+
+
+class TestTwinDefinitionCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = TwinDefinitionCache(directory=self.directory, ttl=30.0)
+        self.manifest = {"metadata": {"name": "stack_a"}, "launch": {"node": ["talker"]}}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_processes_share_one_fetch(self):
+        """Test that caches over the same directory fetch a definition once."""
+        fetch = MagicMock(return_value=self.manifest)
+        other_process = TwinDefinitionCache(directory=self.directory, ttl=30.0)
+
+        self.assertEqual(self.cache.get_or_fetch("org.muto:stack_a", fetch), self.manifest)
+        self.assertEqual(other_process.get_or_fetch("org.muto:stack_a", fetch), self.manifest)
+
+        fetch.assert_called_once_with("org.muto:stack_a")
+        self.assertEqual(other_process.metrics_snapshot()["hits"], 1)
+        self.assertEqual(self.cache.metrics_snapshot()["fetches"], 1)
+
+    def test_concurrent_lookups_wait_for_one_fetch(self):
+        """Test that lookups racing on a missing entry do not each call the twin."""
+        calls = []
+
+        def slow_fetch(stack_id):
+            calls.append(stack_id)
+            time.sleep(0.1)
+            return self.manifest
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_fetch("stack_a", slow_fetch)))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(calls, ["stack_a"])
+        self.assertEqual(results, [self.manifest] * 3)
+
+    def test_expired_entry_and_failed_fetch(self):
+        """Test that expired entries are fetched again and failed fetches are not cached."""
+        cache = TwinDefinitionCache(directory=self.directory, ttl=0.05)
+        cache.put("stack_a", self.manifest)
+        time.sleep(0.1)
+
+        self.assertIsNone(cache.get("stack_a"))
+        self.assertIsNone(cache.get_or_fetch("stack_a", lambda _: None))
+        self.assertIsNone(cache.get("stack_a"))
+        self.assertEqual(cache.metrics_snapshot()["expired"], 3)
+
+    def test_revision_and_invalidation(self):
+        """Test that a different revision misses and invalidation keeps only matching revisions."""
+        revision = self.cache.put("stack_a", self.manifest)
+        self.cache.put("stack_b", self.manifest, revision="7")
+
+        self.assertEqual(self.cache.get("stack_a", revision), self.manifest)
+        self.assertIsNone(self.cache.get("stack_a", "other"))
+
+        self.assertEqual(self.cache.invalidate("stack_b", revision="7"), 0)
+        self.assertEqual(self.cache.invalidate("stack_b", revision="8"), 1)
+        self.assertIsNone(self.cache.get("stack_b"))
+        self.assertEqual(self.cache.invalidate(), 1)
+        self.assertIsNone(self.cache.get("stack_a"))
+
+
+if __name__ == "__main__":
+    unittest.main()